@@ -0,0 +1,221 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: An append-only binary archive of Janggi games; a moves file with two bytes per move plus a fixed-size
+#   offset index, read through mmap so that any game or any ply can be fetched without loading the files
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from JanggiGame import JanggiGame, SQUARES, SQUARE_INDEX
+from JanggiPerft import parse_move
+
+MOVES_SUFFIX = '.moves'
+INDEX_SUFFIX = '.index'
+# index entry: byte offset of the game's first move in the moves file, number of moves, result code (3 pad bytes)
+INDEX_ENTRY = struct.Struct('<QIB3x')
+MOVE_BYTES = 2  # a move is stored as the little-endian 16-bit number start * 90 + end (square indices)
+RESULT_CODES = {'UNFINISHED': 0, 'RED_WON': 1, 'BLUE_WON': 2}
+_CODE_RESULTS = {code: result for result, code in RESULT_CODES.items()}
+
+
+def encode_move(start, end):
+    """Given a move as (start, end) square indices or squares in algebraic notation, returns its 16-bit number"""
+    if isinstance(start, str):
+        start, end = SQUARE_INDEX[start], SQUARE_INDEX[end]
+    return start * 90 + end
+
+
+def decode_move(number):
+    """Given the 16-bit number of a move, returns the move as (start, end) square indices"""
+    return divmod(number, 90)
+
+
+class ArchiveWriter:
+    """
+    Represents the writing end of a game archive; games are only ever appended
+    Each game's moves are written to the moves file before its index entry is written to the index file, so a reader
+      (or a crash part-way through a write) never sees an index entry for moves that are not there
+    """
+
+    def __init__(self, path):
+        """
+        Opens (or creates) the archive with the given base path for appending
+        :param path: the archive's base path; the files are path + MOVES_SUFFIX and path + INDEX_SUFFIX
+        """
+        self._moves_file = open(path + MOVES_SUFFIX, 'ab')
+        self._index_file = open(path + INDEX_SUFFIX, 'ab')
+        self._offset = self._moves_file.seek(0, os.SEEK_END)
+        self._count = self._index_file.seek(0, os.SEEK_END) // INDEX_ENTRY.size
+
+    def __enter__(self):
+        """Used to close the archive at the end of a with block"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the archive"""
+        self.close()
+
+    def __len__(self):
+        """Returns the number of games in the archive"""
+        return self._count
+
+    def append(self, moves, result='UNFINISHED'):
+        """
+        Appends a game played from the start position to the archive and returns its game number
+        :param moves: a sequence of moves, each as (start, end) square indices or squares in algebraic notation
+        :param result: the game state at the end of the game; 'UNFINISHED', 'RED_WON' or 'BLUE_WON'
+        """
+        numbers = [encode_move(start, end) for start, end in moves]
+        self._moves_file.write(struct.pack('<{}H'.format(len(numbers)), *numbers))
+        self._moves_file.flush()
+        self._index_file.write(INDEX_ENTRY.pack(self._offset, len(numbers), RESULT_CODES[result]))
+        self._offset += len(numbers) * MOVE_BYTES
+        self._count += 1
+        return self._count - 1
+
+    def flush(self):
+        """Flushes the index file, so that readers opened afterward see every appended game"""
+        self._index_file.flush()
+
+    def close(self):
+        """Flushes and closes the archive files"""
+        self._moves_file.close()
+        self._index_file.close()
+
+
+class ArchiveReader:
+    """
+    Represents the reading end of a game archive; both files are memory mapped, so opening the archive and fetching a
+      game or a single move costs the same regardless of the archive's size
+    The reader sees the games that were in the archive when it was opened; reopen it to see games appended since
+    """
+
+    def __init__(self, path):
+        """
+        Opens the archive with the given base path for reading
+        :param path: the archive's base path; the files are path + MOVES_SUFFIX and path + INDEX_SUFFIX
+        """
+        self._files = [open(path + MOVES_SUFFIX, 'rb'), open(path + INDEX_SUFFIX, 'rb')]
+        self._moves, self._index = [mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                                    if os.fstat(file.fileno()).st_size else b'' for file in self._files]
+        self._count = len(self._index) // INDEX_ENTRY.size
+
+    def __enter__(self):
+        """Used to close the archive at the end of a with block"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the archive"""
+        self.close()
+
+    def __len__(self):
+        """Returns the number of games in the archive"""
+        return self._count
+
+    def close(self):
+        """Unmaps and closes the archive files"""
+        for mapped in (self._moves, self._index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for file in self._files:
+            file.close()
+
+    def _entry(self, game_id):
+        """Private helper method; given a game number, returns its (offset, number of moves, result code)"""
+        if not 0 <= game_id < self._count:
+            raise IndexError('Game number out of range: {}'.format(game_id))
+        return INDEX_ENTRY.unpack_from(self._index, game_id * INDEX_ENTRY.size)
+
+    def get_length(self, game_id):
+        """Given a game number, returns the number of moves in that game"""
+        return self._entry(game_id)[1]
+
+    def get_result(self, game_id):
+        """Given a game number, returns the game state at the end of that game"""
+        return _CODE_RESULTS[self._entry(game_id)[2]]
+
+    def get_moves(self, game_id, first=0, last=None):
+        """
+        Given a game number, returns a list of its moves as (start, end) square index pairs
+        :param first: the number of the first move (ply) to return, counting from 0
+        :param last: the number of the move after the last one to return; if None, the end of the game
+        """
+        offset, length, result = self._entry(game_id)
+        last = length if last is None else min(last, length)
+        if first >= last:
+            return []
+        numbers = struct.unpack_from('<{}H'.format(last - first), self._moves, offset + first * MOVE_BYTES)
+        return [divmod(number, 90) for number in numbers]
+
+    def get_move(self, game_id, ply):
+        """Given a game number and a ply (counting from 0), returns that move as a (start, end) square index pair"""
+        offset, length, result = self._entry(game_id)
+        if not 0 <= ply < length:
+            raise IndexError('Ply out of range: {}'.format(ply))
+        return divmod(struct.unpack_from('<H', self._moves, offset + ply * MOVE_BYTES)[0], 90)
+
+    def get_game(self, game_id, ply=None):
+        """
+        Given a game number, returns a new JanggiGame object with that game's moves replayed on it, up to (not
+          including) the given ply, or to the end of the game if ply is None
+        Raises ValueError if a stored move is not accepted by make_move()
+        """
+        game = JanggiGame()
+        for start, end in self.get_moves(game_id, 0, ply):
+            if not game.make_move(SQUARES[start], SQUARES[end]):
+                raise ValueError('Invalid move in game {}: {} {}'.format(game_id, SQUARES[start], SQUARES[end]))
+        return game
+
+    def iter_games(self, first=0):
+        """Generator function; returns a sequence of (game number, list of moves, result) for every game in order"""
+        for game_id in range(first, self._count):
+            yield game_id, self.get_moves(game_id), self.get_result(game_id)
+
+
+def import_records(records_path, path):
+    """
+    Appends every game record in a JSON lines file (as written by JanggiSelfPlay) to the archive with the given base
+      path; returns the number of games appended
+    """
+    count = 0
+    with open(records_path) as records, ArchiveWriter(path) as writer:
+        for line in records:
+            if line.strip():
+                record = json.loads(line)
+                writer.append((parse_move(move) for move in record['moves']), record['result'])
+                count += 1
+    return count
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Append-only archive of Janggi games')
+    parser.add_argument('archive', help='base path of the archive files')
+    commands = parser.add_subparsers(dest='command')
+    import_parser = commands.add_parser('import', help='append the games of a JSON lines self-play file')
+    import_parser.add_argument('records', help='JSON lines file of game records')
+    commands.add_parser('info', help='print the number of games and moves')
+    show_parser = commands.add_parser('show', help='print the moves of a game, or the board at one of its plies')
+    show_parser.add_argument('game', type=int, help='game number, counting from 0')
+    show_parser.add_argument('ply', type=int, nargs='?', default=None, help='print the board before this ply')
+    args = parser.parse_args()
+    if args.command == 'import':
+        print('{} games imported'.format(import_records(args.records, args.archive)))
+    elif args.command == 'show':
+        with ArchiveReader(args.archive) as reader:
+            if args.ply is None:
+                print(' '.join(SQUARES[start] + SQUARES[end] for start, end in reader.get_moves(args.game)))
+                print(reader.get_result(args.game))
+            else:
+                reader.get_game(args.game, args.ply).print_board()
+    else:
+        with ArchiveReader(args.archive) as reader:
+            moves = sum(reader.get_length(game_id) for game_id in range(len(reader)))
+            print('{} games, {} moves'.format(len(reader), moves))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,237 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: A bitboard backend for the Janggi board; keeps 90-bit integer occupancy masks alongside the board
+#   arrays so that chariot and cannon moves and line attacks are worked out with a few integer operations per line
+
+from JanggiGame import JanggiBoard, LINES, EMPTY, CANNON, CHARIOT, BLUE, RED, KIND_MASK
+
+
+def _build_line_masks(index):
+    """
+    Helper function; given a square index, returns a tuple of (mask, ascending) pairs, one per line in LINES[index]:
+      the mask has a bit set for every square on the line, and ascending is True if the line walks outward toward
+      higher square indices (so the nearest piece on it is the lowest set bit) and False otherwise
+    """
+    return tuple((sum(1 << square for square in line), line[0] > index) for line in LINES[index])
+
+
+LINE_MASKS = tuple(_build_line_masks(index) for index in range(90))
+# every square on any line through the square; a quick test of whether a chariot or cannon could reach it at all
+LINES_MASK = tuple(sum(1 << square for line in LINES[index] for square in line) for index in range(90))
+
+
+def bit_indices(bitboard):
+    """Given a bitboard, returns a list of the square indices of its set bits, lowest first"""
+    indices = []
+    while bitboard:
+        low = bitboard & -bitboard
+        indices.append(low.bit_length() - 1)
+        bitboard ^= low
+    return indices
+
+
+class BitboardBoard(JanggiBoard):
+    """
+    Represents a Janggi board which also keeps bitboards: 90-bit Python integers with bit n set if square index n is
+      occupied; one per piece code, one per color, and one for all pieces
+    Chariot and cannon moves (see chariot_ends() and cannon_ends()) and attacks along lines use the bitboards and the
+      precomputed line masks instead of walking the lines square by square; everything else is inherited, so this
+      board plays by exactly the same rules and can be used wherever a JanggiBoard is
+    The bitboards are updated with the rest of the board in _place(), push(), pop() and copy()
+    """
+
+    def __init__(self, board=None):
+        """
+        Initializes a BitboardBoard object; see JanggiBoard
+        :bitboards: list of 16 bitboards, indexed by piece code (the entries for empty codes stay 0)
+        :color_occupied: the bitboard of each color's pieces; key: RED / BLUE color bit, value: bitboard
+        :occupied: the bitboard of all pieces
+        """
+        self._bitboards = [0] * 16
+        self._color_occupied = {RED: 0, BLUE: 0}
+        self._occupied = 0
+        super().__init__(board)
+
+    def get_bitboard(self, code):
+        """Given a piece code, returns the bitboard of the squares holding a piece with that code"""
+        return self._bitboards[code]
+
+    def get_occupied(self, color=None):
+        """Returns the bitboard of all occupied squares, or of the squares holding the given color's pieces"""
+        return self._occupied if color is None else self._color_occupied[BLUE if color == 'blue' else RED]
+
+    def _place(self, index, piece):
+        """Private helper method; see JanggiBoard._place(); also updates the bitboards"""
+        bit = 1 << index
+        old_code = self._codes[index]
+        if old_code != EMPTY:
+            self._bitboards[old_code] &= ~bit
+            self._color_occupied[old_code & BLUE] &= ~bit
+            self._occupied &= ~bit
+        super()._place(index, piece)
+        code = self._codes[index]
+        if code != EMPTY:
+            self._bitboards[code] |= bit
+            self._color_occupied[code & BLUE] |= bit
+            self._occupied |= bit
+
+    def push(self, start, end):
+        """See JanggiBoard.push(); also updates the bitboards"""
+        if start != end:
+            self._move_bits(start, end, self._codes[start], self._codes[end])
+        return super().push(start, end)
+
+    def pop(self):
+        """See JanggiBoard.pop(); also updates the bitboards"""
+        record = super().pop()
+        start, end = record[0], record[1]
+        if start != end:
+            self._move_bits(start, end, self._codes[start], self._codes[end])
+        return record
+
+    def _move_bits(self, start, end, moved_code, captured_code):
+        """
+        Private helper method; toggles the bitboard bits for a piece moving between start and end (capturing a piece
+          with captured_code on end, if not EMPTY); toggling is its own inverse, so push() and pop() both use it
+        """
+        move_bits = 1 << start | 1 << end
+        self._bitboards[moved_code] ^= move_bits
+        self._color_occupied[moved_code & BLUE] ^= move_bits
+        if captured_code == EMPTY:
+            self._occupied ^= move_bits
+        else:
+            self._bitboards[captured_code] ^= 1 << end
+            self._color_occupied[captured_code & BLUE] ^= 1 << end
+            self._occupied ^= 1 << start
+
+    def copy(self):
+        """See JanggiBoard.copy(); also copies the bitboards"""
+        copy_board = super().copy()
+        copy_board._bitboards = self._bitboards.copy()
+        copy_board._color_occupied = self._color_occupied.copy()
+        copy_board._occupied = self._occupied
+        return copy_board
+
+    def chariot_ends(self, start, color_bit):
+        """
+        Given a start square index and the color bit of a chariot standing there, returns a list of the square
+          indices the chariot could move to (see JanggiBoard.chariot_ends()), lowest first
+        Per line: the squares up to and including the nearest piece, then the chariot's own pieces are masked out
+        """
+        occupied = self._occupied
+        ends = 0
+        for mask, ascending in LINE_MASKS[start]:
+            blockers = mask & occupied
+            if not blockers:
+                ends |= mask
+            elif ascending:
+                ends |= mask & (((blockers & -blockers) << 1) - 1)
+            else:
+                ends |= mask & -(1 << (blockers.bit_length() - 1))
+        return bit_indices(ends & ~self._color_occupied[color_bit])
+
+    def cannon_ends(self, start, color_bit):
+        """
+        Given a start square index and the color bit of a cannon standing there, returns a list of the square indices
+          the cannon could move to (see JanggiBoard.cannon_ends()), lowest first
+        Per line: the nearest piece is the screen (unless it is a cannon); beyond it, the squares up to the next
+          piece, plus that piece if it is an opposing piece other than a cannon
+        """
+        occupied = self._occupied
+        cannons = self._bitboards[CANNON] | self._bitboards[CANNON | BLUE]
+        capturable = self._color_occupied[BLUE - color_bit] & ~cannons
+        ends = 0
+        for mask, ascending in LINE_MASKS[start]:
+            blockers = mask & occupied
+            if not blockers:
+                continue
+            if ascending:
+                screen = blockers & -blockers
+                beyond = mask & -(screen << 1)
+            else:
+                screen = 1 << (blockers.bit_length() - 1)
+                beyond = mask & (screen - 1)
+            if screen & cannons:
+                continue  # can not jump over a cannon
+            blockers = beyond & occupied
+            if not blockers:
+                ends |= beyond
+                continue
+            if ascending:
+                target = blockers & -blockers
+                ends |= beyond & (target - 1) | target & capturable
+            else:
+                target = 1 << (blockers.bit_length() - 1)
+                ends |= beyond & -(target << 1) | target & capturable
+        return bit_indices(ends)
+
+    def chariot_captures(self, start, color_bit):
+        """
+        Given a start square index and the color bit of a chariot standing there, returns a list of the square
+          indices of the opposing pieces the chariot could capture (see JanggiBoard.chariot_captures()), lowest first
+        Per line: the nearest piece, kept if it is an opposing piece
+        """
+        occupied = self._occupied
+        targets = 0
+        for mask, ascending in LINE_MASKS[start]:
+            blockers = mask & occupied
+            if blockers:
+                targets |= blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+        return bit_indices(targets & self._color_occupied[BLUE - color_bit])
+
+    def cannon_captures(self, start, color_bit):
+        """
+        Given a start square index and the color bit of a cannon standing there, returns a list of the square indices
+          of the opposing pieces the cannon could capture (see JanggiBoard.cannon_captures()), lowest first
+        Per line: the nearest piece is the screen (unless it is a cannon); the next piece beyond it is kept if it is an
+          opposing piece other than a cannon
+        """
+        occupied = self._occupied
+        cannons = self._bitboards[CANNON] | self._bitboards[CANNON | BLUE]
+        targets = 0
+        for mask, ascending in LINE_MASKS[start]:
+            blockers = mask & occupied
+            if not blockers:
+                continue
+            if ascending:
+                screen = blockers & -blockers
+                blockers &= -(screen << 1)
+            else:
+                screen = 1 << (blockers.bit_length() - 1)
+                blockers &= screen - 1
+            if screen & cannons or not blockers:
+                continue
+            targets |= blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+        return bit_indices(targets & self._color_occupied[BLUE - color_bit] & ~cannons)
+
+    def _is_attacked_along_lines(self, target, color_bit):
+        """
+        Private helper method; see JanggiBoard._is_attacked_along_lines()
+        Per line: the nearest piece attacks the target if it is one of the attacker's chariots; otherwise, if it is
+          not a cannon, the next piece beyond it attacks the target if it is one of the attacker's cannons
+        """
+        bitboards = self._bitboards
+        chariots, attacking_cannons = bitboards[CHARIOT | color_bit], bitboards[CANNON | color_bit]
+        if not (chariots | attacking_cannons) & LINES_MASK[target]:
+            return False
+        occupied = self._occupied
+        cannons = bitboards[CANNON] | bitboards[CANNON | BLUE]
+        target_is_cannon = self._codes[target] & KIND_MASK == CANNON
+        for mask, ascending in LINE_MASKS[target]:
+            blockers = mask & occupied
+            if not blockers:
+                continue
+            if ascending:
+                first = blockers & -blockers
+            else:
+                first = 1 << (blockers.bit_length() - 1)
+            if first & chariots:
+                return True
+            if first & cannons or target_is_cannon:
+                continue
+            blockers &= mask & (-(first << 1) if ascending else first - 1)
+            if blockers:
+                second = blockers & -blockers if ascending else 1 << (blockers.bit_length() - 1)
+                if second & attacking_cannons:
+                    return True
+        return False
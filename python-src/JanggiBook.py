@@ -0,0 +1,180 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: An opening book of Janggi moves built from recorded games; a sorted binary file of (position Zobrist key,
+#   move, weight) entries, probed by binary search through mmap so that the book is never loaded into memory
+
+import argparse
+import mmap
+import os
+import random
+import struct
+from collections import Counter
+from JanggiGame import JanggiGame, SQUARES
+from JanggiArchive import encode_move, decode_move
+from JanggiPerft import parse_move
+from JanggiReplay import read_files, read_archive
+
+BOOK_MAGIC = b'JBK1'
+HEADER = struct.Struct('<4sI')  # magic, number of entries
+# entry: the Zobrist key of the position (see JanggiGame.get_zobrist_key()), the move (see JanggiArchive.encode_move())
+#   and its weight (the number of recorded games in which it was played from that position); sorted by key, then by
+#   weight from highest to lowest
+ENTRY = struct.Struct('<QHI')
+_KEY = struct.Struct('<Q')
+
+
+def build_book(logs, path, max_plies=20, min_count=1):
+    """
+    Builds an opening book from recorded games and writes it to the given path; returns the number of entries
+    Each game is replayed from the start position for its first max_plies moves; every move is counted against the
+      position it was played from; a game stops counting at its first move not accepted by make_move()
+    :param logs: a sequence of (game id, moves) logs, each move either text such as 'e7e6' or a (start, end) pair of
+        squares (e.g. as returned by JanggiReplay.read_files() or JanggiReplay.read_archive())
+    :param min_count: moves played fewer times than this from a position are left out of the book
+    """
+    counts = Counter()  # key: (position key, move number), value: times played
+    for game_id, moves in logs:
+        game = JanggiGame(shared_pieces=True)
+        for move in moves[:max_plies]:
+            try:
+                start, end = parse_move(move if isinstance(move, str) else ''.join(move))
+            except ValueError:
+                break
+            key = game.get_zobrist_key()
+            if not game.make_move(start, end):
+                break
+            counts[key, encode_move(start, end)] += 1
+    entries = sorted((key, -count, move) for (key, move), count in counts.items() if count >= min_count)
+    with open(path + '.tmp', 'wb') as file:
+        file.write(HEADER.pack(BOOK_MAGIC, len(entries)))
+        for key, negative_count, move in entries:
+            file.write(ENTRY.pack(key, move, -negative_count))
+    os.replace(path + '.tmp', path)  # so that readers never see a partly written book
+    return len(entries)
+
+
+class BookReader:
+    """
+    Represents an opening book file opened for probing; the file is memory mapped, so opening it and probing a
+      position cost the same regardless of the book's size (a binary search touching about log2(entries) entries)
+    """
+
+    def __init__(self, path):
+        """
+        Opens the opening book at the given path
+        Raises ValueError if the file is not an opening book
+        """
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        if size < HEADER.size or self._data[:4] != BOOK_MAGIC:
+            self.close()
+            raise ValueError('Not an opening book: {}'.format(path))
+        self._count = HEADER.unpack_from(self._data)[1]
+        if size != HEADER.size + self._count * ENTRY.size:
+            self.close()
+            raise ValueError('Truncated opening book: {}'.format(path))
+
+    def __enter__(self):
+        """Used to close the book at the end of a with block"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the book"""
+        self.close()
+
+    def __len__(self):
+        """Returns the number of entries in the book"""
+        return self._count
+
+    def close(self):
+        """Unmaps and closes the book file"""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def _first_entry(self, key):
+        """Private helper method; returns the number of the first entry whose key is not less than the given key"""
+        data, low, high = self._data, 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if _KEY.unpack_from(data, HEADER.size + middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def probe(self, key):
+        """
+        Given the Zobrist key of a position, returns a list of the book moves from that position as (start, end,
+          weight), with start and end as square indices, highest weight first; an empty list if the position is not
+          in the book
+        """
+        moves = []
+        for number in range(self._first_entry(key), self._count):
+            entry_key, move, weight = ENTRY.unpack_from(self._data, HEADER.size + number * ENTRY.size)
+            if entry_key != key:
+                break
+            moves.append(decode_move(move) + (weight,))
+        return moves
+
+    def get_moves(self, game):
+        """
+        Given a JanggiGame object, returns a list of the book moves from its current position as ((start, end), weight)
+          with the squares in algebraic notation, highest weight first; only moves which are legal in the game are
+          returned (so a Zobrist key collision can never suggest an illegal move)
+        """
+        if game.get_game_state() != 'UNFINISHED':
+            return []
+        moves = []
+        for start, end, weight in self.probe(game.get_zobrist_key()):
+            if SQUARES[end] in game.legal_moves_from(SQUARES[start]):
+                moves.append(((SQUARES[start], SQUARES[end]), weight))
+        return moves
+
+    def choose_move(self, game, rng=random):
+        """
+        Given a JanggiGame object, returns a book move (start, end) for its current position, chosen at random with
+          probability proportional to weight; None if the position is not in the book
+        :param rng: the random number generator to use (e.g. a seeded random.Random object)
+        """
+        moves = self.get_moves(game)
+        if not moves:
+            return None
+        return rng.choices([move for move, weight in moves], [weight for move, weight in moves])[0]
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Janggi opening book built from recorded games')
+    commands = parser.add_subparsers(dest='command')
+    build_parser = commands.add_parser('build', help='build a book from move logs or a game archive')
+    build_parser.add_argument('book', help='path of the book file to write')
+    build_parser.add_argument('files', nargs='*', default=['-'],
+                              help="move log files (JSON lines records or one game's moves per line); '-' for stdin")
+    build_parser.add_argument('--archive', default=None, help='build from every game of this game archive instead')
+    build_parser.add_argument('--max-plies', type=int, default=20, help='number of opening moves per game to count')
+    build_parser.add_argument('--min-count', type=int, default=1, help='leave out moves played fewer times')
+    probe_parser = commands.add_parser('probe', help='print the book moves after the given moves')
+    probe_parser.add_argument('book', help='path of the book file')
+    probe_parser.add_argument('moves', nargs='*', help="moves from the start position, e.g. 'e7e6 e4e5'")
+    args = parser.parse_args()
+    if args.command == 'build':
+        logs = read_archive(args.archive) if args.archive else read_files(args.files)
+        print('{} entries written'.format(build_book(logs, args.book, args.max_plies, args.min_count)))
+    elif args.command == 'probe':
+        game = JanggiGame()
+        for text in args.moves:
+            if not game.make_move(*parse_move(text)):
+                parser.error('invalid move: {}'.format(text))
+        with BookReader(args.book) as book:
+            for (start, end), weight in book.get_moves(game):
+                print('{}{} {}'.format(start, end, weight))
+    else:
+        parser.print_help()
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
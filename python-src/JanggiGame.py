@@ -3,11 +3,38 @@
 # Description: A program for playing the board game Janggi (Korean chess)
 
 
+import random
+from collections.abc import MutableMapping
+
+# squares are indexed row by row (a1 = 0, b1 = 1, ... i1 = 8, a2 = 9, ... i10 = 89)
+FILES = 'abcdefghi'
+SQUARES = tuple(letter + str(num) for num in range(1, 11) for letter in FILES)
+SQUARE_INDEX = {square: index for index, square in enumerate(SQUARES)}
+
+# piece codes stored in the board array; the low 3 bits are the piece kind, the BLUE bit is the color
+EMPTY = 0
+SOLDIER, CANNON, CHARIOT, ELEPHANT, HORSE, GUARD, GENERAL = range(1, 8)
+RED = 0
+BLUE = 8
+KIND_MASK = 7
+COLOR_BITS = {'red': RED, 'blue': BLUE}
+
+# Zobrist hashing: one random 64-bit key per (piece code, square index), plus one for red being the side to move
+#   a fixed seed keeps the keys (and so any stored position hashes) identical across runs and processes
+_zobrist_random = random.Random(20210222)
+ZOBRIST_KEYS = tuple(tuple(0 if code & KIND_MASK == EMPTY else _zobrist_random.getrandbits(64) for _ in range(90))
+                     for code in range(16))
+ZOBRIST_RED_TO_MOVE = _zobrist_random.getrandbits(64)
+
+
 class JanggiBoard:
     """
     Represents the board within the game Janggi (Korean chess);
     Its main purpose is containing a representation of the board (which pieces are where on the board)
     This board will contain each of the individual PieceType Objects (using composition)
+    The position is held in two flat 90-entry arrays indexed by square (see SQUARES): one holding the Piece
+      objects and one holding a small integer code (piece kind and color) for each square; the move generators
+      work on the codes, while get_board() exposes the familiar algebraic-notation mapping on top of the arrays
     This class also contains helpful additional information, such as the squares of the palace, as well as
       a helper method to print a representation of the board to the console window
     This class will be contained within a JanggiGame class object
@@ -15,9 +42,15 @@ class JanggiBoard:
     def __init__(self, board=None):
         """
         Initializes a JanggiBoard object
-        :param board: implemented as dictionary of key: algebraic notation, value: None if empty, PieceObject if piece
+        :param board: a mapping of key: algebraic notation, value: None if empty, PieceObject if piece
             if None is passed in as the argument, then the board is initialized with all empty squares
         :palace: a tuple of the various squares that are located in either blue or red palace
+        :pieces: list of 90 entries (by square index); None if empty, PieceObject if piece
+        :codes: bytearray of 90 entries (by square index); EMPTY if empty, the piece's code if piece
+        :history: the undo stack; one (start, end, moved piece, captured piece) record per move pushed on the board
+        :piece_indices: the square indices of each color's pieces; key: RED / BLUE color bit, value: set of indices
+        :generals: the square index of each color's general; key: RED / BLUE color bit, value: index or None
+        :key: the Zobrist hash of the pieces on the board (see ZOBRIST_KEYS); updated on every change to the board
         """
         self._palace = ('d1', 'e1', 'f1', 'd2', 'e2', 'f2', 'd3', 'e3', 'f3',
                         'd8', 'e8', 'f8', 'd9', 'e9', 'f9', 'd10', 'e10', 'f10')
@@ -26,10 +59,16 @@ class JanggiBoard:
         self._palace_corners = ('d1', 'f1', 'd3', 'f3', 'd8', 'f8', 'd10', 'f10')
         self._red_palace_corners = ('d1', 'f1', 'd3', 'f3')
         self._blue_palace_corners = ('d8', 'f8', 'd10', 'f10')
-        if board is None:
-            self._board = self.empty()
-        else:
-            self._board = board
+        self._pieces = [None] * 90
+        self._codes = bytearray(90)
+        self._view = BoardView(self)
+        self._history = []
+        self._piece_indices = {RED: set(), BLUE: set()}
+        self._generals = {RED: None, BLUE: None}
+        self._key = 0
+        if board is not None:
+            for square, piece in board.items():
+                self._place(SQUARE_INDEX[square], piece)
 
     @staticmethod
     def empty():
@@ -40,9 +79,179 @@ class JanggiBoard:
             empty_board[square] = None
         return empty_board
 
+    @classmethod
+    def from_codes(cls, codes, shared_pieces=False):
+        """
+        Given a sequence of 90 piece codes (by square index; e.g. the bytes returned by get_codes()), returns a new
+          JanggiBoard object with a new Piece object of the matching kind and color on each non-empty square, or the
+          shared Piece object of that kind and color if shared_pieces is True (see SHARED_PIECES)
+        Used to rebuild a position from a compact serialization (the undo stack is not carried over)
+        The new board is of the same class this is called on (e.g. a subclass with another representation)
+        """
+        janggiBoard = cls()
+        for index, code in enumerate(codes):
+            if code != EMPTY:
+                janggiBoard._place(index, SHARED_PIECES[code] if shared_pieces else
+                                   PIECE_CLASSES[code & KIND_MASK]('blue' if code & BLUE else 'red'))
+        return janggiBoard
+
     def get_board(self):
-        """Returns the board, implemented as a dictionary"""
-        return self._board
+        """
+        Returns the board, as a mapping of key: algebraic notation, value: None or PieceObject
+        The mapping is a live view on top of the board arrays; assigning to a square updates this board
+        """
+        return self._view
+
+    def get_pieces(self):
+        """Returns the list of 90 Piece objects (or None), indexed by square index"""
+        return self._pieces
+
+    def get_codes(self):
+        """Returns the bytearray of 90 piece codes (EMPTY if no piece), indexed by square index"""
+        return self._codes
+
+    def _place(self, index, piece):
+        """
+        Private helper method; puts the piece (or None) on the square with the given index, keeping the piece
+          indices and general squares up to date
+        """
+        old_code = self._codes[index]
+        if old_code != EMPTY:
+            self._key ^= ZOBRIST_KEYS[old_code][index]
+            self._piece_indices[old_code & BLUE].discard(index)
+            if old_code & KIND_MASK == GENERAL and self._generals[old_code & BLUE] == index:
+                self._generals[old_code & BLUE] = None
+        code = EMPTY if piece is None else piece.get_code()
+        self._pieces[index] = piece
+        self._codes[index] = code
+        if code != EMPTY:
+            self._key ^= ZOBRIST_KEYS[code][index]
+            self._piece_indices[code & BLUE].add(index)
+            if code & KIND_MASK == GENERAL:
+                self._generals[code & BLUE] = index
+
+    def get_piece_indices(self, color):
+        """
+        Given a color, returns the set of square indices holding that color's pieces
+        The set is updated in place as moves are made; iterate over a copy if moves are pushed during iteration
+        """
+        return self._piece_indices[COLOR_BITS[color]]
+
+    def get_general_index(self, color):
+        """Given a color, returns the square index of that color's general, or None if it is not on the board"""
+        return self._generals[COLOR_BITS[color]]
+
+    def copy(self):
+        """
+        Returns a new JanggiBoard object (of the same class) holding the same pieces on the same squares (and the same
+          undo stack)
+        """
+        copy_board = type(self)()
+        copy_board._pieces = self._pieces.copy()
+        copy_board._codes = self._codes[:]
+        copy_board._history = self._history.copy()
+        copy_board._piece_indices = {RED: self._piece_indices[RED].copy(), BLUE: self._piece_indices[BLUE].copy()}
+        copy_board._generals = self._generals.copy()
+        copy_board._key = self._key
+        return copy_board
+
+    def get_zobrist_key(self, color):
+        """
+        Given the color whose turn is next, returns the 64-bit Zobrist key of the position: the incrementally kept
+          key of the pieces on the board, with the side-to-move key folded in if red is to move
+        Equal positions (same pieces on the same squares, same side to move) always have equal keys
+        """
+        return self._key ^ ZOBRIST_RED_TO_MOVE if color == 'red' else self._key
+
+    def compute_zobrist_key(self, color):
+        """Same as get_zobrist_key(), but computed from scratch; used as a helper for debugging"""
+        key = ZOBRIST_RED_TO_MOVE if color == 'red' else 0
+        for index, code in enumerate(self._codes):
+            key ^= ZOBRIST_KEYS[code][index]
+        return key
+
+    def get_history(self):
+        """Returns the undo stack; a list of (start, end, moved piece, captured piece) records, oldest first"""
+        return self._history
+
+    def push(self, start, end):
+        """
+        Moves the piece on the start square to the end square in place, and records the move on the undo stack
+        A move where start == end is a pass; the board is left untouched but the pass is still recorded
+        DOES NOT check whether the move is valid - that is left to the callers (e.g. make_move() method)
+        :param start: the start square; as a square index
+        :param end: the end square; as a square index
+        :return: the captured piece, or None if the end square was empty
+        """
+        pieces, codes = self._pieces, self._codes
+        moved = pieces[start]
+        captured = None if start == end else pieces[end]
+        self._history.append((start, end, moved, captured))
+        if start != end:
+            moved_code, captured_code = codes[start], codes[end]
+            keys = ZOBRIST_KEYS[moved_code]
+            self._key ^= keys[start] ^ keys[end]
+            if captured_code != EMPTY:
+                self._key ^= ZOBRIST_KEYS[captured_code][end]
+                self._piece_indices[captured_code & BLUE].remove(end)
+                if captured_code & KIND_MASK == GENERAL:
+                    self._generals[captured_code & BLUE] = None
+            indices = self._piece_indices[moved_code & BLUE]
+            indices.remove(start)
+            indices.add(end)
+            if moved_code & KIND_MASK == GENERAL:
+                self._generals[moved_code & BLUE] = end
+            pieces[end], codes[end] = moved, moved_code
+            pieces[start], codes[start] = None, EMPTY
+        return captured
+
+    def pop(self):
+        """
+        Takes back the last move recorded on the undo stack, restoring the moved and captured pieces
+        :return: the (start, end, moved piece, captured piece) record of the move that was taken back
+        """
+        record = self._history.pop()
+        start, end, moved, captured = record
+        if start != end:
+            pieces, codes = self._pieces, self._codes
+            moved_code = codes[end]
+            keys = ZOBRIST_KEYS[moved_code]
+            self._key ^= keys[start] ^ keys[end]
+            indices = self._piece_indices[moved_code & BLUE]
+            indices.remove(end)
+            indices.add(start)
+            if moved_code & KIND_MASK == GENERAL:
+                self._generals[moved_code & BLUE] = start
+            pieces[start], codes[start] = moved, moved_code
+            if captured is None:
+                pieces[end], codes[end] = None, EMPTY
+            else:
+                captured_code = captured.get_code()
+                self._key ^= ZOBRIST_KEYS[captured_code][end]
+                self._piece_indices[captured_code & BLUE].add(end)
+                if captured_code & KIND_MASK == GENERAL:
+                    self._generals[captured_code & BLUE] = end
+                pieces[end], codes[end] = captured, captured_code
+        return record
+
+    def push_move(self, start, end):
+        """Same as push(), but given the start and end squares as strings in algebraic notation"""
+        return self.push(SQUARE_INDEX[start], SQUARE_INDEX[end])
+
+    def pop_move(self):
+        """Same as pop(), but returns the start and end squares of the record as strings in algebraic notation"""
+        start, end, moved, captured = self.pop()
+        return SQUARES[start], SQUARES[end], moved, captured
+
+    def leaves_in_check(self, start, end, color):
+        """
+        Given a move (as square indices) and the mover's color, returns True if making the move would put or
+          leave that color's general in check; otherwise False. The board is unchanged afterwards
+        """
+        self.push(start, end)
+        in_check = self.is_in_check(color)
+        self.pop()
+        return in_check
 
     def get_palace(self, color=None):
         """Given a color, returns a tuple of all palace squares for that color; if None returns all palace squares"""
@@ -76,12 +285,9 @@ class JanggiBoard:
 
     def get_general_square(self, color):
         """Given a color, gets the square of that color's general; return as string in algebraic notation"""
-        for square in self.get_palace(color):
-            if self._board[square] is not None and isinstance(self._board[square], General):
-                return square
-        # if General not found, raise an error
-        no_general = True
-        assert no_general, 'No general found'
+        general_index = self._generals[COLOR_BITS[color]]
+        # if General not found, returns None
+        return None if general_index is None else SQUARES[general_index]
 
     def is_in_check(self, color):
         """
@@ -89,46 +295,258 @@ class JanggiBoard:
         :param color: the color of the player to determine if they're in-check; either 'red' or 'blue'
         :return: True or False
         """
-        general_square = self.get_general_square(color)
-        opposing_color = 'red' if color == 'blue' else 'blue'
-        # iterate through the board; see if any opposing color’s pieces could validly capture the given color's general
-        for (square, piece) in self._board.items():
-            if piece is not None and piece.get_color() == opposing_color:
-                can_capture_general = general_square in piece.valid_squares(square, self)
-                if can_capture_general:
+        general_index = self._generals[COLOR_BITS[color]]
+        if general_index is None:
+            return False
+        return self.is_attacked(general_index, 'red' if color == 'blue' else 'blue')
+
+    def is_attacked(self, target, color):
+        """
+        Given a square index and a color, returns True if any of that color's pieces could validly move to (capture on)
+          that square based on the current board; otherwise False
+        Rather than generating every piece's moves, this works outward from the target square: it walks the lines
+          for chariots and cannons (counting screens), and looks up the squares a horse, elephant, soldier, guard or
+          general would have to stand on (and the legs that must be empty) in the reverse move tables
+        :param target: the square index; expected to be empty or hold a piece not of the given color
+        :param color: the color of the attacking player; either 'red' or 'blue'
+        :return: True or False
+        """
+        codes = self._codes
+        color_bit = COLOR_BITS[color]
+        if self._is_attacked_along_lines(target, color_bit):
+            return True
+        horse, elephant = HORSE | color_bit, ELEPHANT | color_bit
+        for leg, origin in HORSE_ORIGINS[target]:
+            if codes[origin] == horse and codes[leg] == EMPTY:
+                return True
+        for first_leg, second_leg, origin in ELEPHANT_ORIGINS[target]:
+            if codes[origin] == elephant and codes[first_leg] == EMPTY and codes[second_leg] == EMPTY:
+                return True
+        soldier = SOLDIER | color_bit
+        for origin in SOLDIER_ORIGINS[color_bit][target]:
+            if codes[origin] == soldier:
+                return True
+        guard, general = GUARD | color_bit, GENERAL | color_bit
+        for origin in PALACE_ORIGINS[color_bit][target]:
+            if codes[origin] == guard or codes[origin] == general:
+                return True
+        return False
+
+    def _is_attacked_along_lines(self, target, color_bit):
+        """
+        Private helper method for is_attacked(); given a square index and the color bit of the attacking player,
+          returns True if one of that player's chariots or cannons attacks the square along a line
+        Walks outward along each line: the first piece may be a chariot; a cannon needs exactly one non-cannon screen
+        """
+        codes = self._codes
+        chariot, cannon = CHARIOT | color_bit, CANNON | color_bit
+        target_is_cannon = codes[target] & KIND_MASK == CANNON
+        for line in LINES[target]:
+            screened = False
+            for square in line:
+                code = codes[square]
+                if code == EMPTY:
+                    continue
+                if screened:
+                    if code == cannon and not target_is_cannon:
+                        return True
+                    break
+                if code == chariot:
                     return True
-        # if loop had ended with no True condition, return False
+                if code & KIND_MASK == CANNON:
+                    break  # a cannon can not serve as a screen
+                screened = True
         return False
 
+    def chariot_ends(self, start, color_bit):
+        """
+        Generator function; given a start square index and the color bit of a chariot standing there, returns a
+          sequence of the square indices the chariot could move to: along each line (the orthogonal axes, then the
+          palace diagonals) up to and including the first piece, if that piece is of the opposing color
+        Called by Chariot.valid_indices(); the pass (start square) is not included
+        """
+        codes = self._codes
+        for line in LINES[start]:
+            for square in line:
+                code = codes[square]
+                if code == EMPTY:  # if square is empty, append it as an option
+                    yield square
+                else:  # if square is not empty, append only if piece is opposing color
+                    if code & BLUE != color_bit:
+                        yield square
+                    break
+
+    def cannon_ends(self, start, color_bit):
+        """
+        Generator function; given a start square index and the color bit of a cannon standing there, returns a
+          sequence of the square indices the cannon could move to: along each line, jumping exactly one piece
+          (a cannon may neither jump over nor capture another cannon)
+        Called by Cannon.valid_indices(); the pass (start square) is not included
+        """
+        codes = self._codes
+        for line in LINES[start]:
+            jumped = False
+            for square in line:
+                code = codes[square]
+                if not jumped:
+                    if code != EMPTY:
+                        if code & KIND_MASK == CANNON:
+                            break  # can not jump over a cannon
+                        jumped = True
+                elif code == EMPTY:
+                    yield square  # append if empty
+                else:
+                    if code & KIND_MASK != CANNON and code & BLUE != color_bit:
+                        yield square  # append if it contains opposing piece that is not a cannon
+                    break
+
+    def chariot_captures(self, start, color_bit):
+        """
+        Generator function; given a start square index and the color bit of a chariot standing there, returns a
+          sequence of the square indices of the opposing pieces the chariot could capture: the first piece along each
+          line, if it is of the opposing color
+        Called by Chariot.capture_indices(); the empty squares along the lines are skipped without being returned
+        """
+        codes = self._codes
+        for line in LINES[start]:
+            for square in line:
+                code = codes[square]
+                if code != EMPTY:
+                    if code & BLUE != color_bit:
+                        yield square
+                    break
+
+    def cannon_captures(self, start, color_bit):
+        """
+        Generator function; given a start square index and the color bit of a cannon standing there, returns a
+          sequence of the square indices of the opposing pieces the cannon could capture: the first piece beyond the
+          screen along each line, if it is an opposing piece other than a cannon (the screen may not be a cannon)
+        Called by Cannon.capture_indices()
+        """
+        codes = self._codes
+        for line in LINES[start]:
+            jumped = False
+            for square in line:
+                code = codes[square]
+                if code == EMPTY:
+                    continue
+                if not jumped:
+                    if code & KIND_MASK == CANNON:
+                        break  # can not jump over a cannon
+                    jumped = True
+                else:
+                    if code & KIND_MASK != CANNON and code & BLUE != color_bit:
+                        yield square
+                    break
+
     def is_in_checkmate(self, color):
         """
         Given a color, returns True if the color is in checkmate based on the current board; otherwise False
         :param color: the color of the player to determine if they're in-checkmate; either 'red' or 'blue'
         :return: True or False
         """
-        # first get the given color's general and see if the general can move to get out of check
-        general_square = self.get_general_square(color)
-        general = self._board[general_square]
-        # get a list of the color's pieces / square locations
-        options = [(square, piece) for (square, piece) in self._board.items()
-                   if piece is not None and piece.get_color() == color and piece is not general]
-        # insert the general piece (in order to check that first - for performance benefits
-        options.insert(0, (general_square, general))
-        # iterate through each of those pieces
-        for (start, piece) in options:
-            if piece is not None and piece.get_color() == color:
-                # iterate through each of that piece's valid moves
-                for end in piece.valid_squares(start, self):
-                    copyJanggiBoard = JanggiBoard(self._board.copy())
-                    copyJanggiBoard.get_board()[start] = None
-                    copyJanggiBoard.get_board()[end] = piece
-                    # if the move would NOT leave the player in-check, then no checkmate occurred
-                    if not copyJanggiBoard.is_in_check(color):
-                        return False
-                    del copyJanggiBoard
+        # look for any legal move; the generator tries the general's moves first (for performance benefits)
+        for _ in self.generate_legal_moves(color):
+            return False
         # if the loops have completed and no valid move has been found, then it is checkmate
         return True
 
+    def generate_legal_moves(self, color, start=None):
+        """
+        Generator function; given a color, returns a sequence of all fully legal moves for that color, as
+          (start, end) square index pairs; a move is legal if it follows the piece's movement rules and does not
+          put or leave the color's general in check
+        The pass move is included once, as (general square, general square), unless the color is in check
+        Check awareness is worked out once up front: unless the color is in check or the general itself moves, a move
+          which neither starts nor ends on a square where a piece could block, screen or expose an attack on the
+          general (see CHECK_SENSITIVE) can not change whether the general is attacked, so it needs no test;
+          every other move is pushed, tested with is_attacked() and popped
+        The board must be back in the same position whenever the generator is resumed
+        :param color: either 'red' or 'blue'
+        :param start: if given, only the moves of the piece on this square index (including its pass) are returned
+        :return: a sequence of (start, end) square index pairs
+        """
+        color_bit = COLOR_BITS[color]
+        opposing = 'red' if color == 'blue' else 'blue'
+        pieces = self._pieces
+        general = self._generals[color_bit]
+        in_check = general is not None and self.is_attacked(general, opposing)
+        sensitive = CHECK_SENSITIVE[general] if general is not None else ()
+        if start is not None:
+            starts = (start,) if start in self._piece_indices[color_bit] else ()
+        else:
+            starts = sorted(self._piece_indices[color_bit])
+            if general is not None:
+                starts.remove(general)
+                starts.insert(0, general)
+            if not in_check and starts:
+                yield starts[0], starts[0]
+        for index in starts:
+            if start is not None and not in_check:
+                yield index, index
+            ends = self._piece_ends(pieces[index], index)
+            for end in ends:
+                if general is None:
+                    yield index, end
+                elif index == general:
+                    self.push(index, end)
+                    attacked = self.is_attacked(end, opposing)
+                    self.pop()
+                    if not attacked:
+                        yield index, end
+                elif not in_check and index not in sensitive and end not in sensitive:
+                    yield index, end
+                else:
+                    self.push(index, end)
+                    attacked = self.is_attacked(general, opposing)
+                    self.pop()
+                    if not attacked:
+                        yield index, end
+
+    def _piece_ends(self, piece, index):
+        """
+        Private helper method for generate_legal_moves(); given a piece and its square index, returns a list of the
+          square indices it could move to (see Piece.valid_indices()), without the pass
+        Held as a method of its own so that the piece movement calls made by move generation can be counted (see
+          JanggiStats.InstrumentedBoard)
+        """
+        return [end for end in piece.valid_indices(index, self) if end != index]
+
+    def generate_legal_captures(self, color):
+        """
+        Generator function; given a color, returns a sequence of the fully legal moves for that color which capture a
+          piece, as (start, end) square index pairs; the same moves as the captures of generate_legal_moves(), but
+          only capture destinations are generated (see Piece.capture_indices()), so quiet moves cost nothing
+        Used by the quiescence search; the board must be back in the same position whenever the generator is resumed
+        :param color: either 'red' or 'blue'
+        :return: a sequence of (start, end) square index pairs
+        """
+        color_bit = COLOR_BITS[color]
+        opposing = 'red' if color == 'blue' else 'blue'
+        pieces = self._pieces
+        general = self._generals[color_bit]
+        in_check = general is not None and self.is_attacked(general, opposing)
+        sensitive = CHECK_SENSITIVE[general] if general is not None else ()
+        for index in sorted(self._piece_indices[color_bit]):
+            ends = list(pieces[index].capture_indices(index, self))
+            for end in ends:
+                if general is None:
+                    yield index, end
+                elif index == general:
+                    self.push(index, end)
+                    attacked = self.is_attacked(end, opposing)
+                    self.pop()
+                    if not attacked:
+                        yield index, end
+                elif not in_check and index not in sensitive and end not in sensitive:
+                    yield index, end
+                else:
+                    self.push(index, end)
+                    attacked = self.is_attacked(general, opposing)
+                    self.pop()
+                    if not attacked:
+                        yield index, end
+
     def print_board(self):
         """Helper method to print a representation of the board"""
         print('    '+(' '*2)+'a'+(' '*5)+'b'+(' '*5)+'c'+(' '*5)+'d'+(' '*5)+'e'+
@@ -138,7 +556,7 @@ class JanggiBoard:
             row_output = str(num).ljust(2) + ' |'
             for letter in ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i']:
                 square = letter + str(num)
-                piece = self._board[square]
+                piece = self._pieces[SQUARE_INDEX[square]]
                 if piece is not None:
                     output = str(piece)
                 elif square in self._palace:
@@ -150,35 +568,97 @@ class JanggiBoard:
             print('   ' + '-' * (6*9))
 
 
+class BoardView(MutableMapping):
+    """
+    Represents the algebraic-notation view of a JanggiBoard (key: e.g. 'e5', value: None or PieceObject)
+    This is what JanggiBoard.get_board() returns; it behaves like the dictionary the board used to be, but
+      reads and writes go straight through to the board's square arrays, so the two can never disagree
+    """
+
+    def __init__(self, janggiBoard):
+        """Initializes a view on top of the given JanggiBoard object"""
+        self._janggiBoard = janggiBoard
+
+    def __getitem__(self, square):
+        """Returns the piece (or None) on the given square; raises KeyError if the square is not on the board"""
+        return self._janggiBoard.get_pieces()[SQUARE_INDEX[square]]
+
+    def __setitem__(self, square, piece):
+        """Puts the piece (or None) on the given square; raises KeyError if the square is not on the board"""
+        self._janggiBoard._place(SQUARE_INDEX[square], piece)
+
+    def __delitem__(self, square):
+        """Squares can not be removed from the board; assign None to empty a square instead"""
+        raise TypeError('Squares can not be removed from the board')
+
+    def __contains__(self, square):
+        """Returns True if the given square is on the board"""
+        return square in SQUARE_INDEX
+
+    def __iter__(self):
+        """Iterates through the squares in square index order"""
+        return iter(SQUARES)
+
+    def __len__(self):
+        """Returns the number of squares on the board"""
+        return 90
+
+    def items(self):
+        """Returns (square, piece) pairs in square index order"""
+        return zip(SQUARES, self._janggiBoard.get_pieces())
+
+    def copy(self):
+        """Returns a plain dictionary snapshot of the board"""
+        return dict(self.items())
+
+
 class Piece:
     """
     Represents a piece on the board.
     This class is used as base class, from which the individual Piece Type classes inherit.
     The main reason for this inheritance is to share common logic (e.g. share helper methods) and avoid
       repetition of code for similar methods (e.g. each class has the same __repr__ method)
+    Pieces have __slots__ rather than a __dict__, since a game holds 32 of them (and every board copy refers to them)
     """
+    __slots__ = ('_color', '_is_captured', '_code')
+    _kind = EMPTY
 
     def __init__(self, color):
         """
         Initializes a piece with the given color
         :param color: either 'red' or 'blue'
         :is_captured: either True or False depending on if piece is captured; initialized to False
+        :code: small integer identifying the piece kind and color; see the piece codes at the top of the module
         """
         self._color = color
         self._is_captured = False
+        self._code = self._kind | COLOR_BITS[color]
 
     def get_color(self):
         """Returns the color of the piece, either 'red' or 'blue'"""
         return self._color
 
+    def get_code(self):
+        """Returns the piece's code as stored in the JanggiBoard arrays (piece kind plus color bit)"""
+        return self._code
+
     def get_is_captured(self):
         """Returns whether the piece is captured (out of play), either True or False"""
         return self._is_captured
 
     def set_is_captured(self, is_captured):
-        """Given either True or False, sets whether this piece is captured"""
+        """
+        Given either True or False, sets whether this piece is captured
+        Raises TypeError if this is a shared piece (see SHARED_PIECES), whose capture status is not its own
+        """
+        if self.is_shared():
+            raise TypeError('Can not set the capture status of a shared piece')
         self._is_captured = is_captured
 
+    def is_shared(self):
+        """Returns True if this is the shared piece of its kind and color (see SHARED_PIECES); otherwise False"""
+        return SHARED_PIECES[self._code] is self
+
     @staticmethod
     def mirror(square):
         """
@@ -219,7 +699,8 @@ class Piece:
         end_square = end_let + str(end_num)
         return end_square
 
-    def shift_dir(self, square, direction):
+    @staticmethod
+    def shift_dir(square, direction):
         """
         Helper method; given a square and direction, returns the square shifted by the one in the specified
           direction; e.g. shift_dir('e5', 'right') returns 'f5'
@@ -230,13 +711,13 @@ class Piece:
         :return: the shifted square (as a string in algebraic notation) or False
         """
         if direction == 'right':
-            return self.shift(square, 0, 1)
+            return Piece.shift(square, 0, 1)
         if direction == 'left':
-            return self.shift(square, 0, -1)
+            return Piece.shift(square, 0, -1)
         if direction == 'up':
-            return self.shift(square, 1, 0)
+            return Piece.shift(square, 1, 0)
         if direction == 'down':
-            return self.shift(square, -1, 0)
+            return Piece.shift(square, -1, 0)
 
     def __repr__(self):
         """
@@ -247,80 +728,90 @@ class Piece:
         class_name = self.__class__.__name__
         return class_name[0:3] + color + ' '
 
-    def _valid_squares_guard_general(self, start, janggiBoard):
+    def valid_squares(self, start, janggiBoard):
         """
-        Since both the guard and general share the same movement logic, this method is held at the base Piece class
-          in order to be shared across both sub-classes
         Generator function; given a start position and JanggiBoard object, returns a sequence of all valid end
           positions to which this piece could move
         DOES NOT check whether the move would leave this color's general in check - that is left to make_move() method
+        The movement logic itself is held in each piece type's valid_indices() method, which works on square indices
         :param start: the start square; as a string in algebraic notation
         :param janggiBoard: a JanggiBoard object
         :return: a sequence of valid end positions
         """
-        # initialize helper variables
-        board = janggiBoard.get_board()
+        for end in self.valid_indices(SQUARE_INDEX[start], janggiBoard):
+            yield SQUARES[end]
+
+    def _valid_indices_guard_general(self, start, janggiBoard):
+        """
+        Since both the guard and general share the same movement logic, this method is held at the base Piece class
+          in order to be shared across both sub-classes
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of all valid end
+          square indices to which this piece could move (1 spot along the palace lines, staying inside its palace)
+        DOES NOT check whether the move would leave this color's general in check - that is left to make_move() method
+        :param start: the start square; as a square index
+        :param janggiBoard: a JanggiBoard object
+        :return: a sequence of valid end square indices
+        """
+        codes = janggiBoard.get_codes()
+        color_bit = self._code & BLUE
         yield start
-        palace = janggiBoard.get_palace(self.get_color())
-        corners = janggiBoard.get_palace_corners(self.get_color())
-        center = janggiBoard.get_palace_centers(self.get_color())
-        # start the listing the squares - 1 spot up/down/left/right IFF that spot is inside palace
-        for direction in ('up', 'right', 'down', 'left'):
-            square = self.shift_dir(start, direction)
-            if square in palace and (board[square] is None or board[square].get_color() != self.get_color()):
-                yield square
-        # if start in palace corners, add the center
-        if start in corners:
-            if board[center] is None or board[center].get_color() != self.get_color():
-                yield center
-        # if start is center, add the corners
-        if start == center:
-            for corner in corners:
-                if board[corner] is None or board[corner].get_color() != self.get_color():
-                    yield corner
+        for end in PALACE_MOVES[color_bit][start]:
+            code = codes[end]
+            if code == EMPTY or code & BLUE != color_bit:
+                yield end
+
+    def _capture_indices_guard_general(self, start, janggiBoard):
+        """
+        Shared by the guard and general, as _valid_indices_guard_general() is
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of the square
+          indices of the opposing pieces this piece could capture (1 spot along the palace lines)
+        """
+        codes = janggiBoard.get_codes()
+        color_bit = self._code & BLUE
+        for end in PALACE_MOVES[color_bit][start]:
+            code = codes[end]
+            if code != EMPTY and code & BLUE != color_bit:
+                yield end
 
 
 class Soldier(Piece):
     """Represents a Solider. Inherits from the Piece class."""
+    __slots__ = ()
+    _kind = SOLDIER
 
     def __init__(self, color):
         """Initializes a Solider piece with the given color; color is either 'red' or 'blue'"""
         super().__init__(color)
 
-    def valid_squares(self, start, janggiBoard):
+    def valid_indices(self, start, janggiBoard):
         """
-        Generator function; given a start position and JanggiBoard object, returns a sequence of all valid end
-          positions to which this piece could move
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of all valid end
+          square indices to which this piece could move (sideways, forwards, and forwards along the palace diagonals)
         DOES NOT check whether the move would leave this color's general in check - that is left to make_move() method
-        :param start: the start square; as a string in algebraic notation
+        :param start: the start square; as a square index
         :param janggiBoard: a JanggiBoard object
-        :return: a sequence of valid end positions
+        :return: a sequence of valid end square indices
         """
-        # establish helper variables
-        board = janggiBoard.get_board()
+        codes = janggiBoard.get_codes()
+        color_bit = self._code & BLUE
         yield start
-        # add left and right squares
-        for direction in ('right', 'left'):
-            square = self.shift_dir(start, direction)
-            if square and (board[square] is None or board[square].get_color() != self.get_color()):
-                yield square
-        # if blue add up, if red add down
-        square = self.shift_dir(start, 'up') if self.get_color() == 'blue' else self.shift_dir(start, 'down')
-        if square and (board[square] is None or board[square].get_color() != self.get_color()):
-            yield square
-        # add palace-specific moves
-        if start in ('d3', 'f3') and (board['e2'] is None or board['e2'].get_color() != self.get_color()):
-            yield 'e2'
-        if start in ('d8', 'f8') and (board['e9'] is None or board['e9'].get_color() != self.get_color()):
-            yield 'e9'
-        if start == 'e2':
-            for square in ('d1', 'f1'):
-                if board[square] is None or board[square].get_color() != self.get_color():
-                    yield square
-        if start == 'e9':
-            for square in ('d10', 'f10'):
-                if board[square] is None or board[square].get_color() != self.get_color():
-                    yield square
+        for end in SOLDIER_MOVES[color_bit][start]:
+            code = codes[end]
+            if code == EMPTY or code & BLUE != color_bit:
+                yield end
+
+    def capture_indices(self, start, janggiBoard):
+        """
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of the square
+          indices of the opposing pieces this piece could capture (the end squares of valid_indices() holding one)
+        DOES NOT check whether the move would leave this color's general in check
+        """
+        codes = janggiBoard.get_codes()
+        color_bit = self._code & BLUE
+        for end in SOLDIER_MOVES[color_bit][start]:
+            code = codes[end]
+            if code != EMPTY and code & BLUE != color_bit:
+                yield end
 
     def _is_valid_movement(self, start, end, janggiBoard):
         """Private helper method used for debugging purposes; given start square, end square, and JanggiBoard object,
@@ -330,48 +821,37 @@ class Soldier(Piece):
 
 class Cannon(Piece):
     """Represents a Cannon. Inherits from the Piece class."""
+    __slots__ = ()
+    _kind = CANNON
 
     def __init__(self, color):
         """Initializes a Cannon piece with the given color; color is either 'red' or 'blue'"""
         super().__init__(color)
 
-    def valid_squares(self, start, janggiBoard):
+    def valid_indices(self, start, janggiBoard):
         """
-        Generator function; given a start position and JanggiBoard object, returns a sequence of all valid end
-          positions to which this piece could move
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of all valid end
+          square indices to which this piece could move (along each line, jumping exactly one piece; a cannon may
+          neither jump over nor capture another cannon)
         DOES NOT check whether the move would leave this color's general in check - that is left to make_move() method
-        :param start: the start square; as a string in algebraic notation
+        :param start: the start square; as a square index
         :param janggiBoard: a JanggiBoard object
-        :return: a sequence of valid end positions
+        :return: a sequence of valid end square indices
         """
-        # initialize helper variables
-        board = janggiBoard.get_board()
         # start square is a valid end position (a pass)
         yield start
-        # add the right, left, up, down axes
-        for direction in ('up', 'right', 'down', 'left'):
-            piece_count = 0
-            contains_cannon = False
-            square = self.shift_dir(start, direction)  # shift the square by 1 in the given direction
-            while square and piece_count < 2 and not contains_cannon:
-                piece = board[square]
-                if piece_count == 1 and piece is None:
-                    yield square  # append if empty
-                elif piece_count == 1 and piece.get_color() != self.get_color() and not isinstance(piece, Cannon):
-                    yield square  # append if it contains opposing piece that is not a cannon
-                if piece is not None:
-                    piece_count += 1
-                    contains_cannon = True if isinstance(piece, Cannon) else False
-                square = self.shift_dir(square, direction)  # do another shift
-        # if in the palace corners, check on adding the 'mirror' across diagonal
-        if start in janggiBoard.get_palace_corners():
-            square_color = 'red' if start in janggiBoard.get_palace_corners('red') else 'blue'
-            center = janggiBoard.get_palace_centers(square_color)
-            mirror = self.mirror(start)
-            contains_cannon = True if isinstance(board[center], Cannon) or isinstance(board[mirror], Cannon) else False
-            if not contains_cannon:
-                if board[center] is not None and (board[mirror] is None or board[mirror].get_color() != self._color):
-                    yield mirror
+        # the line walk itself is held at the board, so that a board with another representation can replace it
+        yield from janggiBoard.cannon_ends(start, self._code & BLUE)
+
+    def capture_indices(self, start, janggiBoard):
+        """
+        Given a start square index and JanggiBoard object, returns a sequence of the square
+          indices of the opposing pieces this piece could capture (jumping exactly one piece other than a cannon, and
+          never capturing a cannon)
+        DOES NOT check whether the move would leave this color's general in check
+        The line walk itself is held at the board, so that a board with another representation can replace it
+        """
+        return janggiBoard.cannon_captures(start, self._code & BLUE)
 
     def _is_valid_movement(self, start, end, janggiBoard):
         """Private helper method used for debugging purposes; given start square, end square, and JanggiBoard object,
@@ -381,51 +861,35 @@ class Cannon(Piece):
 
 class Chariot(Piece):
     """Represents a Chariot. Inherits from the Piece class."""
+    __slots__ = ()
+    _kind = CHARIOT
 
     def __init__(self, color):
         """Initializes a Chariot piece with the given color; color is either 'red' or 'blue'"""
         super().__init__(color)
 
-    def valid_squares(self, start, janggiBoard):
+    def valid_indices(self, start, janggiBoard):
         """
-        Generator function; given a start position and JanggiBoard object, returns a sequence of all valid end
-          positions to which this piece could move
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of all valid end
+          square indices to which this piece could move (along each line up to and including the first piece)
         DOES NOT check whether the move would leave this color's general in check - that is left to make_move() method
-        :param start: the start square; as a string in algebraic notation
+        :param start: the start square; as a square index
         :param janggiBoard: a JanggiBoard object
-        :return: a sequence of valid end positions
+        :return: a sequence of valid end square indices
         """
-        board = janggiBoard.get_board()
         # start square is a valid end position (a pass)
         yield start
-        # append the vertical and horizontal axes
-        for direction in ('up', 'right', 'down', 'left'):
-            piece_count = 0
-            square = self.shift_dir(start, direction)  # shift the square by 1 in the given direction
-            while square and piece_count == 0:  # square will be False if it is off the range of the board
-                if board[square] is None:  # if square is empty, append it as an option
-                    yield square
-                if board[square] is not None:  # if square is not empty, append only if piece is opposing color
-                    piece_count += 1
-                    if board[square].get_color() != self.get_color():
-                        yield square
-                square = self.shift_dir(square, direction)  # do another shift
-        # if in the palace corners, check on adding the middle and the 'mirror' across diagonal
-        if start in janggiBoard.get_palace_corners():
-            square_color = 'red' if start in janggiBoard.get_palace_corners('red') else 'blue'
-            center = janggiBoard.get_palace_centers(square_color)
-            mirror = self.mirror(start)
-            if board[center] is None or board[center].get_color() != self.get_color():
-                yield center  # if center is empty or contains opposing color, append it
-            if board[center] is None and (board[mirror] is None or board[mirror].get_color() != self.get_color()):
-                yield mirror  # if mirror is empty or contains opposing color, append it
-        # if in the palace center, check on adding the diagonals
-        if start in janggiBoard.get_palace_centers():
-            square_color = 'red' if start == janggiBoard.get_palace_centers('red') else 'blue'
-            corners = janggiBoard.get_palace_corners(square_color)
-            for square in corners:
-                if board[square] is None or board[square].get_color() != self.get_color():
-                    yield square
+        # the line walk itself is held at the board, so that a board with another representation can replace it
+        yield from janggiBoard.chariot_ends(start, self._code & BLUE)
+
+    def capture_indices(self, start, janggiBoard):
+        """
+        Given a start square index and JanggiBoard object, returns a sequence of the square
+          indices of the opposing pieces this piece could capture (the first piece along each line)
+        DOES NOT check whether the move would leave this color's general in check
+        The line walk itself is held at the board, so that a board with another representation can replace it
+        """
+        return janggiBoard.chariot_captures(start, self._code & BLUE)
 
     def _is_valid_movement(self, start, end, janggiBoard):
         """Private helper method used for debugging purposes; given start square, end square, and JanggiBoard object,
@@ -435,40 +899,43 @@ class Chariot(Piece):
 
 class Elephant(Piece):
     """Represents a Elephant. Inherits from the Piece class."""
+    __slots__ = ()
+    _kind = ELEPHANT
 
     def __init__(self, color):
         """Initializes a Elephant piece with the given color; color is either 'red' or 'blue'"""
         super().__init__(color)
 
-    def valid_squares(self, start, janggiBoard):
+    def valid_indices(self, start, janggiBoard):
         """
-        Generator function; given a start position and JanggiBoard object, returns a sequence of all valid end
-          positions to which this piece could move
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of all valid end
+          square indices to which this piece could move (both legs of the jump must be empty)
         DOES NOT check whether the move would leave this color's general in check - that is left to make_move() method
-        :param start: the start square; as a string in algebraic notation
+        :param start: the start square; as a square index
         :param janggiBoard: a JanggiBoard object
-        :return: a sequence of valid end positions
+        :return: a sequence of valid end square indices
         """
-        # establish helper variables
-        board = janggiBoard.get_board()
+        codes = janggiBoard.get_codes()
+        color_bit = self._code & BLUE
         yield start  # start square would be considered a pass
-        # loop through the squares 1 up, 1 down, 1 left, 1 right
-        for vert, horz in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
-            square = self.shift(start, vert, horz)
-            # if square at 1 step up/down/left/right is empty, continue
-            if square and board[square] is None:
-                # from 1 up/down/left/right, do a positive and negative jump
-                pos_jump, neg_jump = (vert * 2 + horz, horz * 2 + vert), (vert * 2 - horz, horz * 2 - vert)
-                for vert, horz in (pos_jump, neg_jump):
-                    # if square at pos/neg jump is empty, continue
-                    square = self.shift(start, vert, horz)
-                    if square and board[square] is None:
-                        # do another jump of the same type (e.g. +1 more right, +1 more up)
-                        final_ver = vert + (1 if vert > 0 else -1)
-                        final_horz = horz + (1 if horz > 0 else -1)
-                        square = self.shift(start, final_ver, final_horz)
-                        if square and (board[square] is None or board[square].get_color() != self.get_color()):
-                            yield square
+        for first_leg, second_leg, end in ELEPHANT_MOVES[start]:
+            if codes[first_leg] == EMPTY and codes[second_leg] == EMPTY:
+                code = codes[end]
+                if code == EMPTY or code & BLUE != color_bit:
+                    yield end
+
+    def capture_indices(self, start, janggiBoard):
+        """
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of the square
+          indices of the opposing pieces this piece could capture (both legs of the jump must be empty)
+        DOES NOT check whether the move would leave this color's general in check
+        """
+        codes = janggiBoard.get_codes()
+        color_bit = self._code & BLUE
+        for first_leg, second_leg, end in ELEPHANT_MOVES[start]:
+            code = codes[end]
+            if code != EMPTY and code & BLUE != color_bit and codes[first_leg] == EMPTY and codes[second_leg] == EMPTY:
+                yield end
 
     def _is_valid_movement(self, start, end, janggiBoard):
         """Private helper method used for debugging purposes; given start square, end square, and JanggiBoard object,
@@ -478,35 +945,43 @@ class Elephant(Piece):
 
 class Horse(Piece):
     """Represents a Horse. Inherits from the Piece class."""
+    __slots__ = ()
+    _kind = HORSE
 
     def __init__(self, color):
         """Initializes a Horse piece with the given color; color is either 'red' or 'blue'"""
         super().__init__(color)
 
-    def valid_squares(self, start, janggiBoard):
+    def valid_indices(self, start, janggiBoard):
         """
-        Generator function; given a start position and JanggiBoard object, returns a sequence of all valid end
-          positions to which this piece could move
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of all valid end
+          square indices to which this piece could move (the leg of the jump must be empty)
         DOES NOT check whether the move would leave this color's general in check - that is left to make_move() method
-        :param start: the start square; as a string in algebraic notation
+        :param start: the start square; as a square index
         :param janggiBoard: a JanggiBoard object
-        :return: a sequence of valid end positions
+        :return: a sequence of valid end square indices
         """
-        # establish helper variables
-        board = janggiBoard.get_board()
+        codes = janggiBoard.get_codes()
+        color_bit = self._code & BLUE
         yield start  # start square would be considered a pass
-        # loop through the squares 1 up, 1 down, 1 left, 1 right
-        for vert, horz in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
-            square = self.shift(start, vert, horz)
-            # if square at 1 step up/down/left/right is empty, continue
-            if square and board[square] is None:
-                # from 1 up/down/left/right, do a positive and negative jump
-                pos_jump, neg_jump = (vert * 2 + horz, horz * 2 + vert), (vert * 2 - horz, horz * 2 - vert)
-                for vert, horz in (pos_jump, neg_jump):
-                    # if square at pos/neg jump is empty or contains opposing color, add to valid moves
-                    square = self.shift(start, vert, horz)
-                    if square and (board[square] is None or board[square].get_color() != self.get_color()):
-                        yield square
+        for leg, end in HORSE_MOVES[start]:
+            if codes[leg] == EMPTY:
+                code = codes[end]
+                if code == EMPTY or code & BLUE != color_bit:
+                    yield end
+
+    def capture_indices(self, start, janggiBoard):
+        """
+        Generator function; given a start square index and JanggiBoard object, returns a sequence of the square
+          indices of the opposing pieces this piece could capture (the leg of the jump must be empty)
+        DOES NOT check whether the move would leave this color's general in check
+        """
+        codes = janggiBoard.get_codes()
+        color_bit = self._code & BLUE
+        for leg, end in HORSE_MOVES[start]:
+            code = codes[end]
+            if code != EMPTY and code & BLUE != color_bit and codes[leg] == EMPTY:
+                yield end
 
     def _is_valid_movement(self, start, end, janggiBoard):
         """Private helper method used for debugging purposes; given start square, end square, and JanggiBoard object,
@@ -516,14 +991,20 @@ class Horse(Piece):
 
 class Guard(Piece):
     """Represents a Guard. Inherits from the Piece class."""
+    __slots__ = ()
+    _kind = GUARD
 
     def __init__(self, color):
         """Initializes a Guard piece with the given color; color is either 'red' or 'blue'"""
         super().__init__(color)
 
-    def valid_squares(self, start, janggiBoard):
+    def valid_indices(self, start, janggiBoard):
+        """This piece's logic is held within the base Piece class in order to share between Guard & General"""
+        return super()._valid_indices_guard_general(start, janggiBoard)
+
+    def capture_indices(self, start, janggiBoard):
         """This piece's logic is held within the base Piece class in order to share between Guard & General"""
-        return super()._valid_squares_guard_general(start, janggiBoard)
+        return super()._capture_indices_guard_general(start, janggiBoard)
 
     def _is_valid_movement(self, start, end, janggiBoard):
         """Private helper method used for debugging purposes; given start square, end square, and JanggiBoard object,
@@ -533,14 +1014,20 @@ class Guard(Piece):
 
 class General(Piece):
     """Represents a General. Inherits from the Piece class."""
+    __slots__ = ()
+    _kind = GENERAL
 
     def __init__(self, color):
         """Initializes a General piece with the given color; color is either 'red' or 'blue'"""
         super().__init__(color)
 
-    def valid_squares(self, start, janggiBoard):
+    def valid_indices(self, start, janggiBoard):
+        """This piece's logic is held within the base Piece class in order to share between Guard & General"""
+        return super()._valid_indices_guard_general(start, janggiBoard)
+
+    def capture_indices(self, start, janggiBoard):
         """This piece's logic is held within the base Piece class in order to share between Guard & General"""
-        return super()._valid_squares_guard_general(start, janggiBoard)
+        return super()._capture_indices_guard_general(start, janggiBoard)
 
     def _is_valid_movement(self, start, end, janggiBoard):
         """Private helper method used for debugging purposes; given start square, end square, and JanggiBoard object,
@@ -548,6 +1035,153 @@ class General(Piece):
         return end in self.valid_squares(start, janggiBoard)
 
 
+# key: piece kind, value: the Piece class of that kind; used to rebuild Piece objects from piece codes
+PIECE_CLASSES = {SOLDIER: Soldier, CANNON: Cannon, CHARIOT: Chariot, ELEPHANT: Elephant, HORSE: Horse, GUARD: Guard,
+                 GENERAL: General}
+# key: piece code, value: a single Piece object of that kind and color, shared by every board built with
+#   shared_pieces=True (flyweights); such boards allocate no pieces of their own, and their captured pieces are
+#   tracked by the game's undo stack (see JanggiGame.get_lost_pieces()) rather than by the pieces themselves
+SHARED_PIECES = tuple(PIECE_CLASSES[code & KIND_MASK]('blue' if code & BLUE else 'red') if code & KIND_MASK else None
+                      for code in range(16))
+
+
+# Precomputed move tables, indexed by square index; built once at import time with the Piece.shift helpers so that
+#   the move generators above only walk tables and never convert between squares and strings
+_PALACE_CORNERS = {'red': ('d1', 'f1', 'd3', 'f3'), 'blue': ('d8', 'f8', 'd10', 'f10')}
+_PALACE_CENTERS = {'red': 'e2', 'blue': 'e9'}
+_PALACES = {'red': ('d1', 'e1', 'f1', 'd2', 'e2', 'f2', 'd3', 'e3', 'f3'),
+            'blue': ('d8', 'e8', 'f8', 'd9', 'e9', 'f9', 'd10', 'e10', 'f10')}
+
+
+def _build_lines(square):
+    """
+    Helper function; given a square, returns the tuple of lines a Chariot or Cannon walks from that square
+    Each line is a tuple of square indices ordered outward: first the up/right/down/left axes, then the palace
+      diagonals (from a corner: center then mirror; from a center: each corner on its own)
+    """
+    lines = []
+    for direction in ('up', 'right', 'down', 'left'):
+        line = []
+        next_square = Piece.shift_dir(square, direction)
+        while next_square:
+            line.append(SQUARE_INDEX[next_square])
+            next_square = Piece.shift_dir(next_square, direction)
+        lines.append(tuple(line))
+    for color in ('red', 'blue'):
+        center = _PALACE_CENTERS[color]
+        if square in _PALACE_CORNERS[color]:
+            lines.append((SQUARE_INDEX[center], SQUARE_INDEX[Piece.mirror(square)]))
+        if square == center:
+            lines.extend((SQUARE_INDEX[corner],) for corner in _PALACE_CORNERS[color])
+    return tuple(line for line in lines if line)
+
+
+def _build_horse_moves(square):
+    """Helper function; given a square, returns a tuple of (leg, end) square indices for each Horse jump"""
+    moves = []
+    for vert, horz in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+        leg = Piece.shift(square, vert, horz)
+        for jump in ((vert * 2 + horz, horz * 2 + vert), (vert * 2 - horz, horz * 2 - vert)):
+            end = Piece.shift(square, *jump)
+            if leg and end:
+                moves.append((SQUARE_INDEX[leg], SQUARE_INDEX[end]))
+    return tuple(moves)
+
+
+def _build_elephant_moves(square):
+    """Helper function; given a square, returns a tuple of (first leg, second leg, end) square indices for each
+    Elephant jump"""
+    moves = []
+    for vert, horz in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
+        first_leg = Piece.shift(square, vert, horz)
+        for jump_vert, jump_horz in ((vert * 2 + horz, horz * 2 + vert), (vert * 2 - horz, horz * 2 - vert)):
+            second_leg = Piece.shift(square, jump_vert, jump_horz)
+            # do another jump of the same type (e.g. +1 more right, +1 more up)
+            final_vert = jump_vert + (1 if jump_vert > 0 else -1)
+            final_horz = jump_horz + (1 if jump_horz > 0 else -1)
+            end = Piece.shift(square, final_vert, final_horz)
+            if first_leg and second_leg and end:
+                moves.append((SQUARE_INDEX[first_leg], SQUARE_INDEX[second_leg], SQUARE_INDEX[end]))
+    return tuple(moves)
+
+
+def _build_soldier_moves(square, color):
+    """Helper function; given a square and color, returns a tuple of end square indices for a Soldier: sideways,
+    forwards, then the palace diagonal steps"""
+    ends = [Piece.shift_dir(square, direction) for direction in ('right', 'left')]
+    ends.append(Piece.shift_dir(square, 'up' if color == 'blue' else 'down'))
+    if square in ('d3', 'f3'):
+        ends.append('e2')
+    if square in ('d8', 'f8'):
+        ends.append('e9')
+    if square == 'e2':
+        ends.extend(('d1', 'f1'))
+    if square == 'e9':
+        ends.extend(('d10', 'f10'))
+    return tuple(SQUARE_INDEX[end] for end in ends if end)
+
+
+def _build_palace_moves(square, color):
+    """Helper function; given a square and color, returns a tuple of end square indices for a Guard or General:
+    1 spot up/right/down/left inside its palace, plus the center from a corner or the corners from the center"""
+    ends = [Piece.shift_dir(square, direction) for direction in ('up', 'right', 'down', 'left')]
+    ends = [end for end in ends if end in _PALACES[color]]
+    if square in _PALACE_CORNERS[color]:
+        ends.append(_PALACE_CENTERS[color])
+    if square == _PALACE_CENTERS[color]:
+        ends.extend(_PALACE_CORNERS[color])
+    return tuple(SQUARE_INDEX[end] for end in ends)
+
+
+LINES = tuple(_build_lines(square) for square in SQUARES)
+HORSE_MOVES = tuple(_build_horse_moves(square) for square in SQUARES)
+ELEPHANT_MOVES = tuple(_build_elephant_moves(square) for square in SQUARES)
+SOLDIER_MOVES = {COLOR_BITS[color]: tuple(_build_soldier_moves(square, color) for square in SQUARES)
+                 for color in ('red', 'blue')}
+PALACE_MOVES = {COLOR_BITS[color]: tuple(_build_palace_moves(square, color) for square in SQUARES)
+                for color in ('red', 'blue')}
+
+
+def _build_origins(moves, end_of):
+    """
+    Helper function; given a forward move table (per start square index) and a function picking the end square out
+      of a table entry, returns the reverse table: for each end square index, the tuple of entries leading to it,
+      each rewritten with the start square index in place of the end square index
+    """
+    origins = [[] for _ in SQUARES]
+    for start, entries in enumerate(moves):
+        for entry in entries:
+            end = end_of(entry)
+            origins[end].append(start if isinstance(entry, int) else entry[:-1] + (start,))
+    return tuple(tuple(entries) for entries in origins)
+
+
+# Reverse move tables used by JanggiBoard.is_attacked(): for each target square index, where an attacker must stand
+HORSE_ORIGINS = _build_origins(HORSE_MOVES, lambda entry: entry[-1])
+ELEPHANT_ORIGINS = _build_origins(ELEPHANT_MOVES, lambda entry: entry[-1])
+SOLDIER_ORIGINS = {color_bit: _build_origins(SOLDIER_MOVES[color_bit], lambda entry: entry)
+                   for color_bit in (RED, BLUE)}
+PALACE_ORIGINS = {color_bit: _build_origins(PALACE_MOVES[color_bit], lambda entry: entry)
+                  for color_bit in (RED, BLUE)}
+
+
+def _build_check_sensitive(index):
+    """
+    Helper function; given a general's square index, returns the frozenset of square indices whose occupancy could
+      decide whether that square is attacked: every square on its lines (blockers and cannon screens) plus the legs
+      of the horse and elephant jumps leading to it
+    """
+    sensitive = {square for line in LINES[index] for square in line}
+    sensitive.update(leg for leg, origin in HORSE_ORIGINS[index])
+    sensitive.update(leg for entry in ELEPHANT_ORIGINS[index] for leg in entry[:2])
+    return frozenset(sensitive)
+
+
+# For each square a general may stand on, the squares used by JanggiBoard.generate_legal_moves() to decide whether a
+#   move needs to be tested for check at all
+CHECK_SENSITIVE = tuple(_build_check_sensitive(index) for index in range(90))
+
+
 class JanggiGame:
     """
     Represents the game Janggi (Korean chess)
@@ -557,38 +1191,63 @@ class JanggiGame:
     This class is also the public interface through which moves on the board will be made
     """
 
-    def __init__(self):
+    def __init__(self, board_class=None, shared_pieces=False, janggiBoard=None):
         """
         Initializes a JanggiGame object
+        :param board_class: the class of the board to play on; JanggiBoard if None, or a subclass of it with another
+          internal representation (e.g. JanggiBitboard.BitboardBoard); every board class plays by the same rules
+        :param shared_pieces: if True, the board holds the shared Piece objects (see SHARED_PIECES) instead of 32
+          new ones; the pieces then do not record whether they are captured, but get_lost_pieces() still works
+        :param janggiBoard: a JanggiBoard object to play on instead of a new start board (see from_position()); no
+          start board is built then, and board_class and shared_pieces are ignored
         :current_color: either 'blue' or 'red' depending on which player's turn is next; initialized as blue
         :game_state: either 'UNFINISHED' 'RED_WON' or 'BLUE_WON'; initialized as 'UNFINISHED'
         :board: a JanggiBoard object; initialized with the correct starting positions; Elephant is
           transposed with the Horse on the right side
-        :lost_pieces: keeps track of which pieces have been captured; key: 'blue' / 'red', value: list of pieces
         """
+        self._current_color = 'blue'
+        self._game_state = 'UNFINISHED'
+        if janggiBoard is not None:
+            self._janggiBoard = janggiBoard
+            return
+
+        def new_piece(piece_class, color):
+            return SHARED_PIECES[piece_class._kind | COLOR_BITS[color]] if shared_pieces else piece_class(color)
         start_board = {}
         for num in range(1, 11):
             for letter in ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i']:
                 square = letter + str(num)
                 start_board[square] = None
                 if square in ['a1', 'i1', 'a10', 'i10']:
-                    start_board[square] = Chariot('red') if num == 1 else Chariot('blue')
+                    start_board[square] = new_piece(Chariot, 'red') if num == 1 else new_piece(Chariot, 'blue')
                 if square in ['b1', 'g1', 'b10', 'g10']:
-                    start_board[square] = Elephant('red') if num == 1 else Elephant('blue')
+                    start_board[square] = new_piece(Elephant, 'red') if num == 1 else new_piece(Elephant, 'blue')
                 if square in ['c1', 'h1', 'c10', 'h10']:
-                    start_board[square] = Horse('red') if num == 1 else Horse('blue')
+                    start_board[square] = new_piece(Horse, 'red') if num == 1 else new_piece(Horse, 'blue')
                 if square in ['d1', 'f1', 'd10', 'f10']:
-                    start_board[square] = Guard('red') if num == 1 else Guard('blue')
+                    start_board[square] = new_piece(Guard, 'red') if num == 1 else new_piece(Guard, 'blue')
                 if square in ['e2', 'e9']:
-                    start_board[square] = General('red') if num == 2 else General('blue')
+                    start_board[square] = new_piece(General, 'red') if num == 2 else new_piece(General, 'blue')
                 if square in ['b3', 'h3', 'b8', 'h8']:
-                    start_board[square] = Cannon('red') if num == 3 else Cannon('blue')
+                    start_board[square] = new_piece(Cannon, 'red') if num == 3 else new_piece(Cannon, 'blue')
                 if square in ['a4', 'c4', 'e4', 'g4', 'i4', 'a7', 'c7', 'e7', 'g7', 'i7']:
-                    start_board[square] = Soldier('red') if num == 4 else Soldier('blue')
-        self._janggiBoard = JanggiBoard(start_board)
-        self._current_color = 'blue'
-        self._game_state = 'UNFINISHED'
-        self._lost_pieces = {'red': [], 'blue': []}
+                    start_board[square] = new_piece(Soldier, 'red') if num == 4 else new_piece(Soldier, 'blue')
+        self._janggiBoard = (board_class or JanggiBoard)(start_board)
+
+    @classmethod
+    def from_position(cls, janggiBoard, current_color='blue', game_state='UNFINISHED'):
+        """
+        Returns a new JanggiGame object playing on the given JanggiBoard object (e.g. a position read back from a
+          serialization), with the given player's turn next and the given game state
+        """
+        if current_color not in ('red', 'blue'):
+            raise ValueError('Invalid color: {}'.format(current_color))
+        if game_state not in ('UNFINISHED', 'RED_WON', 'BLUE_WON'):
+            raise ValueError('Invalid game state: {}'.format(game_state))
+        game = cls(janggiBoard=janggiBoard)
+        game._current_color = current_color
+        game._game_state = game_state
+        return game
 
     def _get_janggiBoard(self):
         """Returns the JanggiBoard object contained within this game"""
@@ -606,6 +1265,43 @@ class JanggiGame:
         """Returns the turn of the next player; either 'red' or 'blue'"""
         return self._current_color
 
+    def get_zobrist_key(self):
+        """Returns the 64-bit Zobrist key of the current position (pieces on the board and whose turn is next)"""
+        return self._janggiBoard.get_zobrist_key(self._current_color)
+
+    def get_lost_pieces(self, color):
+        """
+        Given a color, returns a list of that color's pieces which have been captured, in the order they were captured
+        This is derived from the board's undo stack (every accepted move stays on it), so no separate bookkeeping
+          is needed
+        """
+        return [captured for (start, end, moved, captured) in self._janggiBoard.get_history()
+                if captured is not None and captured.get_color() == color]
+
+    def legal_moves(self):
+        """
+        Returns a list of all legal moves for the player whose turn is next, as (start, end) tuples of squares in
+          algebraic notation; every move in the list would be accepted by make_move()
+        The pass move is listed once, as (general square, general square), unless the player is in check
+        Returns an empty list if the game is already won
+        """
+        if self._game_state != 'UNFINISHED':
+            return []
+        return [(SQUARES[start], SQUARES[end])
+                for start, end in self._janggiBoard.generate_legal_moves(self._current_color)]
+
+    def legal_moves_from(self, square):
+        """
+        Given a square in algebraic notation, returns a list of all squares (in algebraic notation) to which the piece
+          on that square could legally move; the square itself is included if passing is legal
+        Returns an empty list if the game is already won, or if the square is not on the board, is empty, or holds
+          a piece of the player whose turn is not next
+        """
+        if self._game_state != 'UNFINISHED' or square not in SQUARE_INDEX:
+            return []
+        moves = self._janggiBoard.generate_legal_moves(self._current_color, SQUARE_INDEX[square])
+        return [SQUARES[end] for start, end in moves]
+
     def is_in_check(self, color):
         """
         Given a color, returns True if the color is in check based on the current board state; otherwise False
@@ -645,30 +1341,49 @@ class JanggiGame:
         if piece is None or piece.get_color() != self._current_color:
             return False
         # (4) / (5) move is invalid if it doesn't pass that piece type’s movement rules (see docstring)
-        if end not in piece.valid_squares(start, self._janggiBoard):
+        if not self._follows_movement_rules(piece, start, end):
             return False
         # (6) move is invalid if it would leave this player in check
-        copyJanggiBoard = JanggiBoard(board.copy())
-        copyJanggiBoard.get_board()[start] = None
-        copyJanggiBoard.get_board()[end] = piece
-        if copyJanggiBoard.is_in_check(self._current_color):
+        if not self._push_unless_in_check(start, end):
             return False
-        del copyJanggiBoard
-        # if move is valid, update the board
-        board[start] = None
-        if board[end] is not None:
-            captured_piece = board[end]
+        # if move is valid, the board is already updated; mark the captured piece (unless it is shared)
+        captured_piece = self._janggiBoard.get_history()[-1][3]
+        if captured_piece is not None and not captured_piece.is_shared():
             captured_piece.set_is_captured(True)
-            self._lost_pieces[captured_piece.get_color()].append(captured_piece)
-        board[end] = piece
         # if move is valid, update the turn
         self._current_color = 'red' if self._current_color == 'blue' else 'blue'
-        # if current player is in check, determine if checkmate occurred, update game state if so
+        self._update_game_state()
+        return True
+
+    # The phases of make_move() are separate methods so that they can be overridden (e.g. timed by JanggiStats)
+
+    def _follows_movement_rules(self, piece, start, end):
+        """
+        Private helper method; given a piece, its start square and an end square (in algebraic notation), returns True
+          if the move follows the piece type's movement rules (#4 and #5 of make_move()); otherwise False
+        """
+        return end in piece.valid_squares(start, self._janggiBoard)
+
+    def _push_unless_in_check(self, start, end):
+        """
+        Private helper method; makes the move in place, and takes it back if it would put or leave the current
+          player's general in check (#6 of make_move()); returns True if the move was kept, otherwise False
+        """
+        self._janggiBoard.push_move(start, end)
+        if self._janggiBoard.is_in_check(self._current_color):
+            self._janggiBoard.pop()
+            return False
+        return True
+
+    def _update_game_state(self):
+        """
+        Private helper method; if the player whose turn is next is in check, determines if checkmate occurred and
+          updates the game state if so
+        """
         if self._janggiBoard.is_in_check(self._current_color):
             is_checkmate = self._janggiBoard.is_in_checkmate(self._current_color)
             if is_checkmate:
                 self._game_state = 'RED_WON' if self._current_color == 'blue' else 'BLUE_WON'
-        return True
 
 
 if __name__ == '__main__':
@@ -0,0 +1,145 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: Serialization of Janggi positions; a FEN-style text notation and a fixed-size packed binary format,
+#   both holding the board, the player whose turn is next and the game state
+
+from JanggiGame import JanggiGame, JanggiBoard, EMPTY, SOLDIER, CANNON, CHARIOT, ELEPHANT, HORSE, GUARD, GENERAL, BLUE
+
+# FEN-style piece letters; upper case for red's pieces, lower case for blue's
+PIECE_LETTERS = {SOLDIER: 'P', CANNON: 'C', CHARIOT: 'R', ELEPHANT: 'B', HORSE: 'N', GUARD: 'A', GENERAL: 'K'}
+_CODE_LETTERS = {kind | color_bit: letter if color_bit == 0 else letter.lower()
+                 for kind, letter in PIECE_LETTERS.items() for color_bit in (0, BLUE)}
+_LETTER_CODES = {letter: code for code, letter in _CODE_LETTERS.items()}
+_COLOR_TOKENS = {'blue': 'b', 'red': 'r'}
+_STATE_TOKENS = {'UNFINISHED': '-', 'RED_WON': 'r', 'BLUE_WON': 'b'}
+_TOKEN_COLORS = {token: color for color, token in _COLOR_TOKENS.items()}
+_TOKEN_STATES = {token: state for state, token in _STATE_TOKENS.items()}
+
+START_FEN = 'rbna1abnr/4k4/1c5c1/p1p1p1p1p/9/9/P1P1P1P1P/1C5C1/4K4/RBNA1ABNR b -'
+
+# packed binary format: one 4-bit piece code per square (two squares per byte, lower square index in the high
+#   nibble), then one flags byte: bit 0 set if red is to move, bits 1-2 the game state (see _STATE_BITS)
+PACKED_BYTES = 46
+_STATE_BITS = {'UNFINISHED': 0, 'RED_WON': 1, 'BLUE_WON': 2}
+_BITS_STATES = {bits: state for state, bits in _STATE_BITS.items()}
+_PAIR_BYTES = tuple(bytes((byte >> 4, byte & 15)) for byte in range(256))  # packed byte -> the two codes it holds
+
+
+def to_fen(janggiBoard, color='blue', game_state='UNFINISHED'):
+    """
+    Given a JanggiBoard object, the player whose turn is next and the game state, returns the position in FEN-style
+      notation: three space separated fields
+        the board, row 10 first and row 1 last separated by '/', each row from file a to i; a piece letter per piece
+          (see PIECE_LETTERS; upper case red, lower case blue) and a digit per run of empty squares
+        the color to move, 'b' (blue) or 'r' (red)
+        the game state, '-' (unfinished), 'r' (red won) or 'b' (blue won)
+    """
+    codes = janggiBoard.get_codes()
+    rows = []
+    for row in range(9, -1, -1):
+        text, empty = '', 0
+        for code in codes[row * 9:row * 9 + 9]:
+            if code == EMPTY:
+                empty += 1
+                continue
+            if empty:
+                text, empty = text + str(empty), 0
+            text += _CODE_LETTERS[code]
+        rows.append(text + str(empty) if empty else text)
+    return '{} {} {}'.format('/'.join(rows), _COLOR_TOKENS[color], _STATE_TOKENS[game_state])
+
+
+def codes_from_fen(text):
+    """
+    Given a position in FEN-style notation, returns (bytearray of 90 piece codes by square index, color to move,
+      game state); the color and state fields are optional and default to 'blue' and 'UNFINISHED'
+    Raises ValueError if the text is not valid notation
+    """
+    fields = text.split()
+    if not 1 <= len(fields) <= 3:
+        raise ValueError('Invalid FEN: {}'.format(text))
+    rows = fields[0].split('/')
+    if len(rows) != 10:
+        raise ValueError('Invalid FEN, expected 10 rows: {}'.format(text))
+    codes = bytearray(90)
+    for row, row_text in zip(range(9, -1, -1), rows):
+        file = 0
+        for char in row_text:
+            if char.isdigit():
+                file += int(char)
+            elif char in _LETTER_CODES and file < 9:
+                codes[row * 9 + file] = _LETTER_CODES[char]
+                file += 1
+            else:
+                raise ValueError('Invalid FEN, unexpected {!r} in row {}: {}'.format(char, row + 1, text))
+        if file != 9:
+            raise ValueError('Invalid FEN, row {} does not have 9 squares: {}'.format(row + 1, text))
+    color = _TOKEN_COLORS.get(fields[1]) if len(fields) > 1 else 'blue'
+    game_state = _TOKEN_STATES.get(fields[2]) if len(fields) > 2 else 'UNFINISHED'
+    if color is None or game_state is None:
+        raise ValueError('Invalid FEN, bad color or state field: {}'.format(text))
+    return codes, color, game_state
+
+
+def from_fen(text, board_class=JanggiBoard, shared_pieces=False):
+    """
+    Given a position in FEN-style notation, returns (a new JanggiBoard object, color to move, game state)
+    :param shared_pieces: if True, the board holds the shared Piece objects (see JanggiGame.SHARED_PIECES)
+    """
+    codes, color, game_state = codes_from_fen(text)
+    return board_class.from_codes(codes, shared_pieces), color, game_state
+
+
+def pack(janggiBoard, color='blue', game_state='UNFINISHED'):
+    """
+    Given a JanggiBoard object, the player whose turn is next and the game state, returns the position as
+      PACKED_BYTES bytes (see the packed binary format above)
+    """
+    codes = janggiBoard.get_codes()
+    flags = (1 if color == 'red' else 0) | _STATE_BITS[game_state] << 1
+    return bytes([codes[index] << 4 | codes[index + 1] for index in range(0, 90, 2)] + [flags])
+
+
+def unpack_codes(data):
+    """
+    Given bytes returned by pack(), returns (bytearray of 90 piece codes by square index, color to move, game state)
+    Raises ValueError if the data is not a packed position
+    """
+    if len(data) != PACKED_BYTES:
+        raise ValueError('Invalid packed position: expected {} bytes, got {}'.format(PACKED_BYTES, len(data)))
+    flags = data[45]
+    if flags >> 1 not in _BITS_STATES:
+        raise ValueError('Invalid packed position: bad flags byte {}'.format(flags))
+    codes = bytearray(b''.join(_PAIR_BYTES[byte] for byte in data[:45]))
+    if BLUE in codes:
+        raise ValueError('Invalid packed position: bad piece code {}'.format(BLUE))
+    return codes, 'red' if flags & 1 else 'blue', _BITS_STATES[flags >> 1]
+
+
+def unpack(data, board_class=JanggiBoard, shared_pieces=False):
+    """
+    Given bytes returned by pack(), returns (a new JanggiBoard object, color to move, game state)
+    :param shared_pieces: if True, the board holds the shared Piece objects (see JanggiGame.SHARED_PIECES)
+    """
+    codes, color, game_state = unpack_codes(data)
+    return board_class.from_codes(codes, shared_pieces), color, game_state
+
+
+def game_to_fen(game):
+    """Given a JanggiGame object, returns its current position in FEN-style notation"""
+    return to_fen(game._get_janggiBoard(), game.get_current_color(), game.get_game_state())
+
+
+def game_from_fen(text, board_class=JanggiBoard, shared_pieces=False):
+    """Given a position in FEN-style notation, returns a new JanggiGame object in that position"""
+    return JanggiGame.from_position(*from_fen(text, board_class, shared_pieces))
+
+
+def pack_game(game):
+    """Given a JanggiGame object, returns its current position packed into PACKED_BYTES bytes"""
+    return pack(game._get_janggiBoard(), game.get_current_color(), game.get_game_state())
+
+
+def unpack_game(data, board_class=JanggiBoard, shared_pieces=False):
+    """Given bytes returned by pack() or pack_game(), returns a new JanggiGame object in that position"""
+    return JanggiGame.from_position(*unpack(data, board_class, shared_pieces))
@@ -0,0 +1,153 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: Parallel search for Janggi; splits the root moves of a position across a pool of worker processes,
+#   each of which rebuilds the position from a compact serialization and searches its share of the moves
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from JanggiGame import SQUARES
+from JanggiNotation import pack, unpack, PACKED_BYTES
+from JanggiPerft import POSITIONS, game_from_moves, parse_move
+from JanggiSearch import Searcher, SearchResult, opposing, MATE_SCORE, MATE_BOUND, INFINITY
+
+POSITION_BYTES = PACKED_BYTES  # positions are sent to workers in the packed binary format (see JanggiNotation)
+
+
+def encode_position(janggiBoard, color):
+    """Given a JanggiBoard object and the color to move, returns the position as POSITION_BYTES bytes"""
+    return pack(janggiBoard, color)
+
+
+def decode_position(data):
+    """Given bytes returned by encode_position(), returns (a new JanggiBoard object, the color to move)"""
+    janggiBoard, color, game_state = unpack(data)
+    return janggiBoard, color
+
+
+def search_root_move(position, move, depth, table_mb=4):
+    """
+    Searches one root move; the unit of work sent to a worker process
+    :param position: the root position, as bytes returned by encode_position()
+    :param move: the root move, as a (start, end) square index pair
+    :param depth: the search depth of the root; the position after the move is searched to depth - 1
+    :param table_mb: the size of the transposition table; a new table is used for every move, so that the result
+        does not depend on which other moves the worker searched before (and so on how the work was split)
+    :return: (move, score from the root mover's point of view, principal variation after the move, nodes searched)
+    """
+    janggiBoard, color = decode_position(position)
+    janggiBoard.push(*move)
+    next_color = opposing(color)
+    searcher = Searcher(table_mb=table_mb)
+    if depth <= 1:
+        result = searcher.quiesce_board(janggiBoard, next_color)  # the same leaf score as Searcher's
+    else:
+        result = searcher.search_board(janggiBoard, next_color, depth - 1)
+    score = -result.score
+    if score > MATE_BOUND:
+        score -= 1  # a mate found below this move is one ply further away from the root
+    elif score < -MATE_BOUND:
+        score += 1
+    return move, score, result.pv, result.nodes + 1
+
+
+class ParallelSearcher:
+    """
+    Represents a parallel search engine using root splitting: every legal move of the root position is searched
+      independently (to the same fixed depth, with a full window) in a pool of worker processes, and the results are
+      merged in root move order, so the best move, score and principal variation are the same for any number of
+      processes; with one process the moves are searched in this process without a pool
+    Each worker is shared-nothing: it receives the position as bytes and the move to search, and returns numbers
+    """
+
+    def __init__(self, processes=None, table_mb=4):
+        """
+        Initializes a ParallelSearcher
+        :param processes: the number of worker processes; if None, the number of CPUs
+        :param table_mb: the size of the transposition table used for each root move
+        """
+        self._processes = processes or os.cpu_count() or 1
+        self._table_mb = table_mb
+        self._executor = None
+
+    def get_processes(self):
+        """Returns the number of worker processes"""
+        return self._processes
+
+    def __enter__(self):
+        """Starts the worker pool (if more than one process is used), so that it is reused between searches"""
+        if self._processes > 1 and self._executor is None:
+            self._executor = ProcessPoolExecutor(self._processes)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Shuts down the worker pool"""
+        self.close()
+
+    def close(self):
+        """Shuts down the worker pool, if it was started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def search(self, game, depth=4):
+        """
+        Searches the current position of a JanggiGame to a fixed depth for the best move of the player whose turn is
+          next; returns a SearchResult object (see JanggiSearch)
+        """
+        if game.get_game_state() != 'UNFINISHED':
+            return SearchResult(None, 0, [], 0, 0, 0.0)
+        return self.search_board(game._get_janggiBoard(), game.get_current_color(), depth)
+
+    def search_board(self, janggiBoard, color, depth=4):
+        """Same as search(), but given a JanggiBoard object and the color to move instead of a JanggiGame"""
+        start_time = time.perf_counter()
+        moves = list(janggiBoard.generate_legal_moves(color))
+        if not moves:
+            return SearchResult(None, -MATE_SCORE, [], 1, depth, time.perf_counter() - start_time)
+        position = encode_position(janggiBoard, color)
+        count = len(moves)
+        args = ([position] * count, moves, [depth] * count, [self._table_mb] * count)
+        if self._processes > 1:
+            if self._executor is None:
+                with self:
+                    results = list(self._executor.map(search_root_move, *args))
+            else:
+                results = list(self._executor.map(search_root_move, *args))
+        else:
+            results = list(map(search_root_move, *args))
+        best_move, best_score, best_pv, nodes = results[0][0], -INFINITY, [], 1
+        for move, score, pv, move_nodes in results:  # in root move order; the first of equal scores is kept
+            nodes += move_nodes
+            if score > best_score:
+                best_move, best_score, best_pv = move, score, pv
+        pv = [(SQUARES[best_move[0]], SQUARES[best_move[1]])] + best_pv
+        return SearchResult(pv[0], best_score, pv, nodes, depth, time.perf_counter() - start_time)
+
+
+def main():
+    """Command line entry point; searches a position with 1 to N processes and prints the throughput of each"""
+    parser = argparse.ArgumentParser(description='Parallel fixed-depth search benchmark for the Janggi engine')
+    parser.add_argument('--depth', type=int, default=3, help='depth to search to (default 3)')
+    parser.add_argument('--position', choices=sorted(POSITIONS), default='start', help='stored position to use')
+    parser.add_argument('--moves', nargs='*', default=None, metavar='MOVE',
+                        help='moves from the start position instead, e.g. e7e6 e4e5')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='maximum number of processes')
+    args = parser.parse_args()
+    if args.moves is not None:
+        game = game_from_moves(parse_move(move) for move in args.moves)
+    else:
+        game = game_from_moves(POSITIONS[args.position][0])
+    print('procs        nodes     time      nodes/s  best move  score')
+    for processes in sorted({2 ** power for power in range(args.processes.bit_length())} | {args.processes}):
+        with ParallelSearcher(processes) as searcher:
+            result = searcher.search(game, args.depth)
+        print('{:5} {:12} {:8.3f} {:12.0f}  {:>9}  {}'.format(
+            processes, result.nodes, result.elapsed, result.nodes / result.elapsed if result.elapsed else 0,
+            ''.join(result.best_move), result.score))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: Perft (performance test) tool for the Janggi rules engine; counts the leaf nodes of the legal move tree
+#   to a given depth, with per-depth breakdowns and timing, and checks the counts against a corpus of known positions
+
+import argparse
+import re
+import time
+from JanggiGame import JanggiGame, SQUARES
+from JanggiTransposition import TranspositionTable, BOUND_EXACT, MAX_SCORE
+
+# Corpus of stored positions; key: name, value: (moves from the start position, known node counts for depth 1, 2, 3)
+# Every count was cross-checked against the original copy-the-board implementation of the rules
+POSITIONS = {
+    'start': ((), (32, 1024, 33506)),
+    'check': ((('e7', 'e6'), ('e4', 'e5'), ('e6', 'e5'), ('g1', 'e4'), ('e5', 'e4'), ('e2', 'f3'), ('e4', 'e3')),
+              (3, 92, 2788)),
+    'middlegame': ((('e7', 'e6'), ('c4', 'c5'), ('c10', 'd8'), ('b1', 'd4'), ('b8', 'e8'), ('c5', 'd5'),
+                    ('c7', 'c6'), ('e4', 'e5'), ('a7', 'a6'), ('d5', 'd6'), ('c6', 'c5'), ('d6', 'e6'),
+                    ('e8', 'a8'), ('e6', 'e7')),
+                   (42, 1679, 64958)),
+    'open': ((('f10', 'e10'), ('f1', 'f2'), ('i10', 'i9'), ('c4', 'd4'), ('i7', 'h7'), ('a1', 'a3'), ('e9', 'd9'),
+              ('f2', 'f3'), ('c10', 'd8'), ('e2', 'f1'), ('d8', 'b9'), ('h1', 'i3'), ('i9', 'i8'), ('h3', 'e3'),
+              ('c7', 'd7'), ('i4', 'h4'), ('g10', 'd8'), ('a3', 'a2'), ('h7', 'h6'), ('c1', 'd3'), ('d7', 'c7'),
+              ('h4', 'h5'), ('e10', 'e9'), ('a2', 'a3'), ('a7', 'b7'), ('h5', 'i5'), ('a10', 'a5'), ('d4', 'd5'),
+              ('a5', 'a9'), ('d3', 'e1'), ('a9', 'a4'), ('d5', 'e5'), ('i8', 'i7'), ('e5', 'e6'), ('c7', 'c6'),
+              ('f3', 'e2'), ('e7', 'd7'), ('g4', 'f4'), ('g7', 'h7'), ('e6', 'd6')),
+             (48, 1549, 71675)),
+}
+
+
+class PerftCounts:
+    """
+    Represents the counts gathered at one depth of a perft run
+    :nodes: the number of positions reached at this depth (one per legal move made at this depth)
+    :captures: the number of those moves which captured a piece
+    :checks: the number of those moves which put the opponent in check
+    :mates: the number of those moves which put the opponent in checkmate
+    :passes: the number of those moves which were passes
+    """
+
+    def __init__(self):
+        """Initializes all counts to 0"""
+        self.nodes = 0
+        self.captures = 0
+        self.checks = 0
+        self.mates = 0
+        self.passes = 0
+
+    def __repr__(self):
+        """Used so that the counts are printed in a friendly manner"""
+        return 'PerftCounts(nodes={}, captures={}, checks={}, mates={}, passes={})'.format(
+            self.nodes, self.captures, self.checks, self.mates, self.passes)
+
+
+def opposing(color):
+    """Given a color, returns the opposing color"""
+    return 'red' if color == 'blue' else 'blue'
+
+
+def parse_move(text):
+    """Given a move written as two squares in algebraic notation (e.g. 'e7e6' or 'e10e9'), returns (start, end)"""
+    match = re.fullmatch(r'([a-i](?:10|[1-9]))([a-i](?:10|[1-9]))', text)
+    if match is None:
+        raise ValueError('Invalid move notation: {}'.format(text))
+    return match.group(1), match.group(2)
+
+
+def game_from_moves(moves):
+    """Given a sequence of (start, end) moves in algebraic notation, returns a JanggiGame with those moves played"""
+    game = JanggiGame()
+    for start, end in moves:
+        if not game.make_move(start, end):
+            raise ValueError('Invalid move in position: {} {}'.format(start, end))
+    return game
+
+
+def perft(janggiBoard, color, depth, table=None):
+    """
+    Given a JanggiBoard object, the color to move and a depth, returns the number of leaf nodes of the legal move
+      tree of that depth; a pass counts as one move, and a checkmated side has no moves
+    If a TranspositionTable is given, subtree counts are cached in it by Zobrist key and depth, so positions reached
+      through different move orders are only counted once; counts too large for an entry's score (above MAX_SCORE)
+      are not cached
+    The board is left unchanged
+    """
+    if depth == 0:
+        return 1
+    if table is not None and depth > 1:
+        key = janggiBoard.get_zobrist_key(color)
+        entry = table.probe(key)
+        if entry is not None and entry[0] == depth:
+            return entry[1]
+    moves = list(janggiBoard.generate_legal_moves(color))
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    next_color = opposing(color)
+    for start, end in moves:
+        janggiBoard.push(start, end)
+        nodes += perft(janggiBoard, next_color, depth - 1, table)
+        janggiBoard.pop()
+    if table is not None and nodes <= MAX_SCORE:
+        table.store(key, depth, nodes, BOUND_EXACT)
+    return nodes
+
+
+def divide(janggiBoard, color, depth):
+    """
+    Given a JanggiBoard object, the color to move and a depth of at least 1, returns a dictionary of key: each legal
+      move as a (start, end) tuple in algebraic notation, value: the perft count of depth - 1 below that move
+    Useful for tracking down which move a node count disagreement comes from
+    """
+    counts = {}
+    for start, end in list(janggiBoard.generate_legal_moves(color)):
+        janggiBoard.push(start, end)
+        counts[(SQUARES[start], SQUARES[end])] = perft(janggiBoard, opposing(color), depth - 1)
+        janggiBoard.pop()
+    return counts
+
+
+def perft_breakdown(janggiBoard, color, depth):
+    """
+    Given a JanggiBoard object, the color to move and a depth, walks the legal move tree to that depth and returns a
+      list of PerftCounts objects, one per depth (index 0 holds the counts for depth 1)
+    Slower than perft(), as every move is made on the board and checked for check and checkmate
+    """
+    counts = [PerftCounts() for _ in range(depth)]
+    _breakdown(janggiBoard, color, counts, 0)
+    return counts
+
+
+def _breakdown(janggiBoard, color, counts, ply):
+    """Private helper function; recursively adds the moves from this position to the counts at index ply onward"""
+    level = counts[ply]
+    next_color = opposing(color)
+    for start, end in list(janggiBoard.generate_legal_moves(color)):
+        level.nodes += 1
+        if start == end:
+            level.passes += 1
+        if janggiBoard.push(start, end) is not None:
+            level.captures += 1
+        if janggiBoard.is_in_check(next_color):
+            level.checks += 1
+            if janggiBoard.is_in_checkmate(next_color):
+                level.mates += 1
+        if ply + 1 < len(counts):
+            _breakdown(janggiBoard, next_color, counts, ply + 1)
+        janggiBoard.pop()
+
+
+def check_corpus(depth=3, names=None):
+    """
+    Runs perft on the stored positions and compares against their known node counts (up to the given depth)
+    :return: a list of (name, depth, expected, actual) tuples for every count that did not match; empty if all match
+    """
+    mismatches = []
+    for name in names or POSITIONS:
+        moves, expected_counts = POSITIONS[name]
+        game = game_from_moves(moves)
+        for current_depth, expected in enumerate(expected_counts[:depth], 1):
+            actual = perft(game._get_janggiBoard(), game.get_current_color(), current_depth)
+            if actual != expected:
+                mismatches.append((name, current_depth, expected, actual))
+    return mismatches
+
+
+def report(game, depth, breakdown=False, show_divide=False, table=None):
+    """
+    Runs perft on the game's current position to each depth up to the given one and prints counts and timing
+    If a TranspositionTable is given, it is used to cache subtree counts and its statistics are printed at the end
+    """
+    janggiBoard, color = game._get_janggiBoard(), game.get_current_color()
+    if show_divide:
+        for (start, end), nodes in sorted(divide(janggiBoard, color, depth).items()):
+            print('{}{} {}'.format(start, end, nodes))
+    if breakdown:
+        start_time = time.perf_counter()
+        counts = perft_breakdown(janggiBoard, color, depth)
+        elapsed = time.perf_counter() - start_time
+        print('depth        nodes   captures     checks    mates   passes')
+        for current_depth, level in enumerate(counts, 1):
+            print('{:5} {:12} {:10} {:10} {:8} {:8}'.format(current_depth, level.nodes, level.captures, level.checks,
+                                                            level.mates, level.passes))
+        total = sum(level.nodes for level in counts)
+        print('{} nodes in {:.3f}s ({:.0f} nodes/s)'.format(total, elapsed, total / elapsed if elapsed else 0))
+        return
+    print('depth        nodes     time      nodes/s')
+    for current_depth in range(1, depth + 1):
+        start_time = time.perf_counter()
+        nodes = perft(janggiBoard, color, current_depth, table)
+        elapsed = time.perf_counter() - start_time
+        print('{:5} {:12} {:8.3f} {:12.0f}'.format(current_depth, nodes, elapsed, nodes / elapsed if elapsed else 0))
+    if table is not None:
+        stats = table.get_stats()
+        print('hash: {} probes, {:.1%} hit rate, {:.1%} occupancy'.format(stats['probes'], stats['hit_rate'],
+                                                                         stats['occupancy']))
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Perft benchmark and correctness check for the Janggi rules engine')
+    parser.add_argument('--depth', type=int, default=3, help='depth to search to (default 3)')
+    parser.add_argument('--position', choices=sorted(POSITIONS), default='start', help='stored position to use')
+    parser.add_argument('--moves', nargs='*', default=None, metavar='MOVE',
+                        help='moves from the start position instead, e.g. e7e6 e4e5')
+    parser.add_argument('--breakdown', action='store_true', help='count captures, checks, mates and passes per depth')
+    parser.add_argument('--divide', action='store_true', help='print the node count below each root move')
+    parser.add_argument('--check', action='store_true', help='check all stored positions against known counts')
+    parser.add_argument('--hash', type=int, default=0, metavar='MB',
+                        help='cache subtree counts in a transposition table of this many megabytes')
+    args = parser.parse_args()
+    if args.check:
+        mismatches = check_corpus(args.depth)
+        for name, depth, expected, actual in mismatches:
+            print('MISMATCH {} depth {}: expected {}, got {}'.format(name, depth, expected, actual))
+        print('corpus {}'.format('FAILED' if mismatches else 'OK'))
+        return 1 if mismatches else 0
+    if args.moves is not None:
+        game = game_from_moves(parse_move(move) for move in args.moves)
+    else:
+        game = game_from_moves(POSITIONS[args.position][0])
+    table = TranspositionTable(args.hash) if args.hash else None
+    report(game, args.depth, args.breakdown, args.divide, table)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,195 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: A streaming pipeline for replaying and validating recorded Janggi move logs; logs are read lazily from
+#   files, stdin or a game archive, replayed through JanggiGame, and a result is yielded per game
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from JanggiGame import JanggiGame, SQUARES
+from JanggiArchive import ArchiveReader
+from JanggiPerft import parse_move
+
+
+class ReplayResult:
+    """
+    Represents the outcome of replaying one game's move log
+    :game_id: the game's identifier (from the log record, or the source and line number)
+    :plies: the number of moves accepted by make_move()
+    :state: the game state after the accepted moves; 'UNFINISHED', 'RED_WON' or 'BLUE_WON'
+    :illegal: None if every move was accepted; otherwise (ply, move text) of the first move that was not, after which
+        the rest of the log is not replayed (a move after the game is won counts as illegal)
+    :checks: list of the plies (counting from 0) of the moves which put the opponent in check
+    :mate: the ply of the move which gave checkmate, or None
+    """
+
+    def __init__(self, game_id):
+        """Initializes the result of an empty log"""
+        self.game_id = game_id
+        self.plies = 0
+        self.state = 'UNFINISHED'
+        self.illegal = None
+        self.checks = []
+        self.mate = None
+
+    def is_valid(self):
+        """Returns True if every move of the log was accepted; otherwise False"""
+        return self.illegal is None
+
+    def as_dict(self):
+        """Returns the result as a dictionary (e.g. for writing as JSON)"""
+        return {'id': self.game_id, 'plies': self.plies, 'state': self.state,
+                'illegal': None if self.illegal is None else list(self.illegal), 'checks': self.checks,
+                'mate': self.mate}
+
+    def __repr__(self):
+        """Used so that the result is printed in a friendly manner"""
+        return 'ReplayResult(game_id={!r}, plies={}, state={}, illegal={})'.format(
+            self.game_id, self.plies, self.state, self.illegal)
+
+
+def replay(game_id, moves):
+    """
+    Replays a move log from the start position and returns a ReplayResult object
+    :param game_id: the game's identifier, recorded in the result
+    :param moves: a sequence of moves, each either text such as 'e7e6' or a (start, end) pair of squares
+    """
+    result = ReplayResult(game_id)
+    game = JanggiGame()
+    for ply, move in enumerate(moves):
+        text = move if isinstance(move, str) else ''.join(move)
+        try:
+            start, end = parse_move(text)
+        except ValueError:
+            start, end = None, None
+        if start is None or not game.make_move(start, end):
+            result.illegal = (ply, text)
+            break
+        result.plies += 1
+        if game.is_in_check(game.get_current_color()):
+            result.checks.append(ply)
+            if game.get_game_state() != 'UNFINISHED':
+                result.mate = ply
+    result.state = game.get_game_state()
+    return result
+
+
+def replay_batch(logs):
+    """Replays a list of (game id, moves) logs and returns the list of their ReplayResult objects; sent to workers"""
+    return [replay(game_id, moves) for game_id, moves in logs]
+
+
+def read_logs(lines, source='-'):
+    """
+    Generator function; given an iterable of text lines (e.g. an open file), returns a sequence of (game id, moves)
+      logs, one per line, reading only one line at a time
+    A line is either a JSON record with a 'moves' list (as written by JanggiSelfPlay; its 'id' is used if present) or
+      the moves separated by spaces; blank lines and lines starting with '#' are skipped
+    A record that can not be read (malformed JSON, or no list of moves) does not stop the stream: it is returned as
+      a log whose only move is the whole line, so that its replay reports it as illegal at ply 0
+    :param source: the name of the input, used with the line number as the id of games without one
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('{'):
+            try:
+                record = json.loads(line)
+                game_id, moves = record.get('id', '{}:{}'.format(source, number)), record['moves']
+                if not isinstance(moves, list) or not all(_is_move(move) for move in moves):
+                    raise TypeError('moves is not a list of moves')
+            except (ValueError, KeyError, TypeError, AttributeError):
+                yield '{}:{}'.format(source, number), [line]
+                continue
+            yield game_id, moves
+        else:
+            yield '{}:{}'.format(source, number), line.split()
+
+
+def _is_move(move):
+    """Private helper function; returns True if a move read from a record is text or a pair of texts"""
+    if isinstance(move, str):
+        return True
+    return isinstance(move, list) and len(move) == 2 and all(isinstance(square, str) for square in move)
+
+
+def read_files(paths):
+    """Generator function; given a list of file paths ('-' for stdin), returns the logs of each file in turn"""
+    for path in paths:
+        if path == '-':
+            yield from read_logs(sys.stdin, '-')
+        else:
+            with open(path) as lines:
+                yield from read_logs(lines, path)
+
+
+def read_archive(path):
+    """Generator function; given the base path of a game archive (see JanggiArchive), returns the log of each game"""
+    with ArchiveReader(path) as reader:
+        for game_id in range(len(reader)):
+            yield game_id, [(SQUARES[start], SQUARES[end]) for start, end in reader.get_moves(game_id)]
+
+
+def _batches(logs, size):
+    """Private helper function; generator which groups a sequence of logs into lists of the given size"""
+    batch = []
+    for log in logs:
+        batch.append(log)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def replay_stream(logs, processes=1, batch_size=64):
+    """
+    Generator function; given a sequence of (game id, moves) logs, replays each and returns the sequence of their
+      ReplayResult objects, in the same order as the logs
+    The logs are consumed lazily, and with a process pool at most a few batches per process are in flight at once,
+      so memory use does not depend on the size of the input
+    :param processes: the number of worker processes; with 1, the logs are replayed in this process without a pool
+    :param batch_size: the number of logs sent to a worker at a time
+    """
+    if processes <= 1:
+        for game_id, moves in logs:
+            yield replay(game_id, moves)
+        return
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque()
+        for batch in _batches(logs, batch_size):
+            pending.append(executor.submit(replay_batch, batch))
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main():
+    """Command line entry point; writes one JSON result per game to stdout and a summary to stderr"""
+    parser = argparse.ArgumentParser(description='Replay and validate recorded Janggi move logs')
+    parser.add_argument('files', nargs='*', default=['-'],
+                        help="move log files (JSON lines records or one game's moves per line); '-' for stdin")
+    parser.add_argument('--archive', default=None, help='replay every game of this game archive instead')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    parser.add_argument('--invalid-only', action='store_true', help='only write the results of invalid logs')
+    args = parser.parse_args()
+    logs = read_archive(args.archive) if args.archive else read_files(args.files)
+    games = invalid = mates = 0
+    for result in replay_stream(logs, args.processes):
+        games += 1
+        invalid += not result.is_valid()
+        mates += result.mate is not None
+        if result.is_valid() and args.invalid_only:
+            continue
+        sys.stdout.write(json.dumps(result.as_dict(), separators=(',', ':')) + '\n')
+    sys.stderr.write('{} games replayed: {} invalid, {} ended in checkmate\n'.format(games, invalid, mates))
+    return 1 if invalid else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
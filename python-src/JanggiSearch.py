@@ -0,0 +1,402 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: A computer opponent for Janggi; negamax alpha-beta search with iterative deepening, a
+#   transposition table, move ordering and a quiescence search, built directly on the JanggiBoard move generation (so
+#   it plays by exactly the same rules)
+
+import time
+from JanggiGame import SQUARES, EMPTY, KIND_MASK, SOLDIER, CANNON, CHARIOT, ELEPHANT, HORSE, GUARD, GENERAL, RED, BLUE
+from JanggiTransposition import TranspositionTable, BOUND_EXACT, BOUND_LOWER, BOUND_UPPER
+
+# material values by piece kind (the usual Janggi point values, times 100)
+PIECE_VALUES = {SOLDIER: 200, CANNON: 700, CHARIOT: 1300, ELEPHANT: 300, HORSE: 500, GUARD: 300, GENERAL: 0}
+
+MATE_SCORE = 100000  # score for delivering mate at the root; mate in n plies scores MATE_SCORE - n
+MATE_BOUND = MATE_SCORE - 1000  # any score beyond this is a mate score
+INFINITY = MATE_SCORE + 1
+
+# MVV-LVA (most valuable victim, least valuable attacker) order of captures; by victim kind, then attacker kind; the
+#   general is the most valuable attacker, since a capture with it is the likeliest to be refuted
+_ATTACKER_RANKS = {SOLDIER: 0, ELEPHANT: 1, GUARD: 2, HORSE: 3, CANNON: 4, CHARIOT: 5, GENERAL: 6}
+MVV_LVA = tuple(tuple(PIECE_VALUES.get(victim, 0) * 8 - _ATTACKER_RANKS.get(attacker, 0) for attacker in range(8))
+                for victim in range(8))
+KILLER_SLOTS = 2  # the number of killer moves kept per ply
+DELTA_MARGIN = PIECE_VALUES[SOLDIER]  # quiescence skips captures which can not raise the score to alpha by this much
+
+
+def _build_piece_square(kind, color_bit):
+    """
+    Helper function; given a piece kind and color bit, returns a tuple of 90 bonuses (by square index) added to the
+      piece's material value: soldiers gain for every rank advanced, horses and cannons for staying near the center
+    """
+    bonuses = []
+    for index in range(90):
+        rank, file = index // 9, index % 9  # rank 0 is row 1 (red's back rank), rank 9 is row 10 (blue's)
+        advanced = rank - 3 if color_bit == RED else 6 - rank
+        central = 4 - abs(file - 4)
+        if kind == SOLDIER:
+            bonuses.append(max(advanced, 0) * 10 + (central * 4 if advanced > 0 else 0))
+        elif kind in (HORSE, CANNON):
+            bonuses.append(central * 5)
+        else:
+            bonuses.append(0)
+    return tuple(bonuses)
+
+
+# combined material plus piece-square value, by piece code and square index (red's pieces count positive)
+PIECE_SQUARE_VALUES = tuple(
+    tuple(0 for _ in range(90)) if code & KIND_MASK == 0 else
+    tuple(PIECE_VALUES[code & KIND_MASK] + bonus for bonus in _build_piece_square(code & KIND_MASK, code & BLUE))
+    for code in range(16))
+
+
+def evaluate(janggiBoard, color):
+    """
+    Given a JanggiBoard object and the color to move, returns a static score of the position (in centipawn-like
+      units) from that color's point of view: material plus piece-square bonuses
+    """
+    codes = janggiBoard.get_codes()
+    score = 0
+    for index in janggiBoard.get_piece_indices('red'):
+        score += PIECE_SQUARE_VALUES[codes[index]][index]
+    for index in janggiBoard.get_piece_indices('blue'):
+        score -= PIECE_SQUARE_VALUES[codes[index]][index]
+    return score if color == 'red' else -score
+
+
+def opposing(color):
+    """Given a color, returns the opposing color"""
+    return 'red' if color == 'blue' else 'blue'
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time limit runs out; caught by Searcher.search()"""
+    pass
+
+
+class SearchResult:
+    """
+    Represents the outcome of a search
+    :best_move: the best move found, as a (start, end) tuple in algebraic notation; None if there is no legal move
+    :score: the score of the best move from the mover's point of view (mate scores are beyond MATE_BOUND)
+    :pv: the principal variation (expected line of play), as a list of (start, end) tuples in algebraic notation
+    :nodes: the number of positions searched
+    :depth: the deepest iteration that was completed
+    :elapsed: the time taken, in seconds
+    """
+
+    def __init__(self, best_move, score, pv, nodes, depth, elapsed):
+        """Initializes a search result with the given values"""
+        self.best_move = best_move
+        self.score = score
+        self.pv = pv
+        self.nodes = nodes
+        self.depth = depth
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        """Used so that the result is printed in a friendly manner"""
+        return 'SearchResult(best_move={}, score={}, pv={}, nodes={}, depth={})'.format(
+            self.best_move, self.score, self.pv, self.nodes, self.depth)
+
+
+class Searcher:
+    """
+    Represents a search engine: negamax alpha-beta with iterative deepening, using a TranspositionTable to store
+      scores, bounds and best moves between iterations (the stored best move is always tried first)
+    Moves are tried in stages (see _ordered_moves()): the stored best move, then captures by MVV-LVA, then the killer
+      moves of the ply, then the other quiet moves by their history score; each stage is only generated and sorted
+      once the earlier ones have failed to cause a cutoff
+    At depth 0, a quiescence search (see _quiesce()) plays out the captures, so that a position is never scored in
+      the middle of an exchange
+    Searches work on a game's JanggiBoard in place with push() / pop(), and leave it unchanged
+    Passes are legal moves here just as in JanggiGame.make_move(), so a side is only ever out of moves when mated
+    """
+
+    def __init__(self, table=None, table_mb=16, tablebases=None, move_ordering=True, quiescence=True):
+        """
+        Initializes a Searcher
+        :param table: the TranspositionTable to use; if None, a new one of table_mb megabytes is created
+        :param tablebases: if given, a JanggiTablebase.TablebaseSet object; positions below the root whose material
+            has a tablebase are scored from it instead of being searched
+        :param move_ordering: if False, moves are tried in generation order (after the stored best move); used to
+            measure the ordering heuristics
+        :param quiescence: if False, positions at depth 0 are scored with evaluate() directly
+        """
+        self._table = table if table is not None else TranspositionTable(table_mb)
+        self._tablebases = tablebases
+        self._move_ordering = move_ordering
+        self._quiescence = quiescence
+        self._killers = []  # by ply: a list of up to KILLER_SLOTS quiet moves which caused a cutoff, latest first
+        self._history = [0] * (2 * 90 * 90)  # by color, start and end square: the depth squared of cutoffs
+        self._janggiBoard = None
+        self._nodes = 0
+        self._deadline = None
+        self._pv = []
+
+    def get_table(self):
+        """Returns the TranspositionTable used by this Searcher"""
+        return self._table
+
+    def search(self, game, depth=4, time_limit=None):
+        """
+        Searches the current position of a JanggiGame for the best move of the player whose turn is next
+        :param game: a JanggiGame object
+        :param depth: the maximum depth (in plies) for iterative deepening
+        :param time_limit: if given, the number of seconds after which the search stops; the result of the deepest
+            completed iteration is returned (at least depth 1 is always completed)
+        :return: a SearchResult object
+        """
+        if game.get_game_state() != 'UNFINISHED':
+            return SearchResult(None, 0, [], 0, 0, 0.0)
+        return self.search_board(game._get_janggiBoard(), game.get_current_color(), depth, time_limit)
+
+    def search_board(self, janggiBoard, color, depth=4, time_limit=None):
+        """Same as search(), but given a JanggiBoard object and the color to move instead of a JanggiGame"""
+        start_time = time.perf_counter()
+        self._janggiBoard = janggiBoard
+        self._nodes = 0
+        self._deadline = None
+        self._table.new_search()
+        self._killers = [[] for _ in range(depth + 1)]
+        self._history = [score >> 1 for score in self._history]  # older searches count for less
+        history_length = len(janggiBoard.get_history())
+        result = SearchResult(None, 0, [], 0, 0, 0.0)
+        for current_depth in range(1, depth + 1):
+            self._pv = [[] for _ in range(current_depth + 1)]
+            try:
+                score = self._negamax(current_depth, 0, -INFINITY, INFINITY, color)
+            except SearchTimeout:
+                break
+            finally:
+                # whatever stopped the search (the time limit or any error), the caller's board is put back as it was
+                while len(janggiBoard.get_history()) > history_length:
+                    janggiBoard.pop()
+            pv = [(SQUARES[start], SQUARES[end]) for start, end in self._pv[0]]
+            result = SearchResult(pv[0] if pv else None, score, pv, self._nodes, current_depth,
+                                  time.perf_counter() - start_time)
+            if not pv or abs(score) > MATE_BOUND:
+                break  # no legal move, or a forced mate has been found
+            if time_limit is not None:
+                if time.perf_counter() - start_time >= time_limit:
+                    break
+                self._deadline = start_time + time_limit
+        result.nodes = self._nodes
+        result.elapsed = time.perf_counter() - start_time
+        self._janggiBoard = None
+        return result
+
+    def quiesce_board(self, janggiBoard, color):
+        """
+        Given a JanggiBoard object and the color to move, returns a SearchResult (of depth 0, with no best move) whose
+          score is that of the quiescence search which Searcher runs at the leaves of search_board() (see _quiesce());
+          used to score a leaf outside of a search (e.g. by JanggiParallel)
+        """
+        start_time = time.perf_counter()
+        self._janggiBoard = janggiBoard
+        self._nodes = 0
+        self._deadline = None
+        history_length = len(janggiBoard.get_history())
+        try:
+            score = self._quiesce(0, 0, -INFINITY, INFINITY, color)
+        finally:
+            while len(janggiBoard.get_history()) > history_length:
+                janggiBoard.pop()
+            self._janggiBoard = None
+        return SearchResult(None, score, [], self._nodes, 0, time.perf_counter() - start_time)
+
+    def _negamax(self, depth, ply, alpha, beta, color):
+        """
+        Private helper method; returns the score of the position for the color to move, searched to the given
+          remaining depth within the (alpha, beta) window, and records the principal variation from this ply
+        """
+        self._nodes += 1
+        if self._deadline is not None and self._nodes & 1023 == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        janggiBoard = self._janggiBoard
+        self._pv[ply] = []
+        key = janggiBoard.get_zobrist_key(color)
+        entry = self._table.probe(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, entry_score, bound, table_move = entry
+            if ply > 0 and entry_depth >= depth:
+                score = self._score_from_table(entry_score, ply)
+                if bound == BOUND_EXACT or (bound == BOUND_LOWER and score >= beta) or \
+                        (bound == BOUND_UPPER and score <= alpha):
+                    return score
+        if ply > 0 and self._tablebases is not None:
+            probed = self._tablebases.probe(janggiBoard, color)
+            if probed is not None:
+                return self._score_from_tablebase(probed, ply)
+        if depth == 0:
+            return self._quiesce(ply, 0, alpha, beta, color) if self._quiescence else evaluate(janggiBoard, color)
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, None
+        next_color = opposing(color)
+        for move in self._ordered_moves(color, ply, table_move):
+            captured = janggiBoard.push(*move)
+            score = -self._negamax(depth - 1, ply + 1, -beta, -alpha, next_color)
+            janggiBoard.pop()
+            if score > best_score:
+                best_score, best_move = score, move
+                if ply + 1 < len(self._pv):
+                    self._pv[ply] = [move] + self._pv[ply + 1]
+                else:
+                    self._pv[ply] = [move]
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if captured is None:
+                            self._record_cutoff(color, ply, depth, move)
+                        break
+        if best_move is None:
+            return -MATE_SCORE + ply  # no legal move (not even a pass) means this color is in checkmate
+        if best_score <= original_alpha:
+            bound = BOUND_UPPER
+        elif best_score >= beta:
+            bound = BOUND_LOWER
+        else:
+            bound = BOUND_EXACT
+        self._table.store(key, depth, self._score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _ordered_moves(self, color, ply, table_move):
+        """
+        Private helper method; generator function returning the legal moves of the color to move in the order they
+          should be searched: the table move (if legal), then captures by MVV-LVA, then killer moves, then the other
+          quiet moves by history score
+        The table move is checked on its own, so when it causes a cutoff no other move is ever generated; the quiet
+          moves are only sorted once every capture has been searched
+        """
+        janggiBoard = self._janggiBoard
+        if table_move is not None:
+            if self._is_legal(color, table_move):
+                yield table_move
+            else:
+                table_move = None
+        if not self._move_ordering:
+            for move in janggiBoard.generate_legal_moves(color):
+                if move != table_move:
+                    yield move
+            return
+        codes = janggiBoard.get_codes()
+        for move in self._ordered_captures(color):
+            if move != table_move:
+                yield move
+        quiets = [move for move in janggiBoard.generate_legal_moves(color)
+                  if move != table_move and (move[0] == move[1] or codes[move[1]] == EMPTY)]
+        if ply < len(self._killers):
+            for killer in self._killers[ply]:
+                if killer in quiets:
+                    quiets.remove(killer)
+                    yield killer
+        history, offset = self._history, 0 if color == 'red' else 90 * 90
+        quiets.sort(key=lambda quiet: history[offset + quiet[0] * 90 + quiet[1]], reverse=True)
+        for move in quiets:
+            yield move
+
+    def _ordered_captures(self, color):
+        """Private helper method; returns a list of the legal captures of the color to move, sorted by MVV-LVA"""
+        codes = self._janggiBoard.get_codes()
+        captures = list(self._janggiBoard.generate_legal_captures(color))
+        captures.sort(key=lambda capture: MVV_LVA[codes[capture[1]] & KIND_MASK][codes[capture[0]] & KIND_MASK],
+                      reverse=True)
+        return captures
+
+    def _quiesce(self, ply, quiescence_ply, alpha, beta, color):
+        """
+        Private helper method; returns the score of the position for the color to move once the captures have been
+          played out, within the (alpha, beta) window
+        The color to move may stand pat (take the static score) rather than capture, unless it is in check at the
+          first quiescence ply (quiescence_ply 0), when every legal move is searched instead; deeper in, only captures
+          are ever searched, so the recursion ends once the captures run out (evasions answering checks could
+          otherwise go on indefinitely)
+        A capture is skipped (delta pruning) when even winning the captured piece and DELTA_MARGIN more would leave
+          the score at or below alpha
+        """
+        self._nodes += 1
+        if self._deadline is not None and self._nodes & 1023 == 0 and time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        janggiBoard = self._janggiBoard
+        next_color = opposing(color)
+        if quiescence_ply == 0 and janggiBoard.is_in_check(color):
+            moves = list(janggiBoard.generate_legal_moves(color))
+            if not moves:
+                return -MATE_SCORE + ply
+            best_score = -INFINITY
+        else:
+            best_score = evaluate(janggiBoard, color)
+            if best_score >= beta:
+                return best_score
+            alpha = max(alpha, best_score)
+            codes = janggiBoard.get_codes()
+            moves = [capture for capture in self._ordered_captures(color)
+                     if best_score + PIECE_VALUES[codes[capture[1]] & KIND_MASK] + DELTA_MARGIN > alpha]
+        for move in moves:
+            janggiBoard.push(*move)
+            score = -self._quiesce(ply + 1, quiescence_ply + 1, -beta, -alpha, next_color)
+            janggiBoard.pop()
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def _is_legal(self, color, move):
+        """
+        Private helper method; returns True if the (start, end) move is legal for the color to move; used to check a
+          table move (which may come from another position with the same key) before searching it
+        """
+        start, end = move
+        if start == end and start != self._janggiBoard.get_general_index(color):
+            return False  # the pass is only ever recorded as the general's
+        return move in self._janggiBoard.generate_legal_moves(color, start)
+
+    def _record_cutoff(self, color, ply, depth, move):
+        """
+        Private helper method; given a quiet move which caused a beta cutoff, makes it a killer move of the ply and
+          raises its history score
+        """
+        if ply < len(self._killers):
+            killers = self._killers[ply]
+            if move in killers:
+                killers.remove(move)
+            killers.insert(0, move)
+            del killers[KILLER_SLOTS:]
+        self._history[(0 if color == 'red' else 90 * 90) + move[0] * 90 + move[1]] += depth * depth
+
+    @staticmethod
+    def _score_from_tablebase(probed, ply):
+        """Private helper method; given (result, plies) from a tablebase probe, returns the score at this ply"""
+        result, plies = probed
+        if result == 'WIN':
+            return MATE_SCORE - (ply + plies)
+        if result == 'LOSS':
+            return -MATE_SCORE + (ply + plies)
+        return 0
+
+    @staticmethod
+    def _score_to_table(score, ply):
+        """Private helper method; mate scores are stored relative to the position rather than to the root"""
+        if score > MATE_BOUND:
+            return score + ply
+        if score < -MATE_BOUND:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _score_from_table(score, ply):
+        """Private helper method; the reverse of _score_to_table()"""
+        if score > MATE_BOUND:
+            return score - ply
+        if score < -MATE_BOUND:
+            return score + ply
+        return score
+
+
+def best_move(game, depth=4, time_limit=None):
+    """Convenience function; searches the JanggiGame's current position and returns the best move as (start, end)"""
+    return Searcher().search(game, depth, time_limit).best_move
@@ -0,0 +1,172 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: Batch self-play for Janggi; plays many games between move policies across worker processes and streams
+#   each finished game record to a JSON lines file as it completes
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from JanggiGame import JanggiGame
+from JanggiSearch import Searcher
+
+
+class RandomPolicy:
+    """Represents a move policy which plays a uniformly random legal move (passes included)"""
+
+    def __init__(self):
+        """Initializes a RandomPolicy; it has no settings"""
+        pass
+
+    def choose_move(self, game, rng):
+        """Given a JanggiGame object and a random.Random object, returns the move to play as (start, end)"""
+        return rng.choice(game.legal_moves())
+
+
+class SearchPolicy:
+    """
+    Represents a move policy which plays the best move of a shallow alpha-beta search (see JanggiSearch)
+    The search is deterministic, so the policy plays its first few moves at random to make games differ
+    """
+
+    def __init__(self, depth=1, random_moves=2, table_mb=1):
+        """
+        Initializes a SearchPolicy
+        :param depth: the search depth, in plies
+        :param random_moves: the number of random moves played before searching
+        :param table_mb: the size of the transposition table, which is kept for the whole game
+        """
+        self._depth = depth
+        self._random_moves = random_moves
+        self._searcher = Searcher(table_mb=table_mb)
+
+    def choose_move(self, game, rng):
+        """Given a JanggiGame object and a random.Random object, returns the move to play as (start, end)"""
+        if self._random_moves > 0:
+            self._random_moves -= 1
+            return rng.choice(game.legal_moves())
+        return self._searcher.search(game, self._depth).best_move
+
+
+# key: policy name, value: the policy class; policies are named in specs such as 'random' or 'search:2' (the number
+#   after the colon, if any, is passed to the class as its first argument)
+POLICIES = {'random': RandomPolicy, 'search': SearchPolicy}
+
+
+def make_policy(spec):
+    """Given a policy spec such as 'random' or 'search:2', returns a new policy object"""
+    name, _, argument = spec.partition(':')
+    if name not in POLICIES:
+        raise ValueError('Unknown policy: {}'.format(spec))
+    return POLICIES[name](int(argument)) if argument else POLICIES[name]()
+
+
+def play_game(game_id, seed, blue_spec, red_spec, max_plies=200):
+    """
+    Plays one game of self-play; the unit of work sent to a worker process
+    :param game_id: the number of the game, recorded with it
+    :param seed: the seed of the game's random number generator; the same seed and policies give the same game
+    :param blue_spec: the policy spec of the blue player (who moves first)
+    :param red_spec: the policy spec of the red player
+    :param max_plies: the game is stopped, unfinished, after this many moves
+    :return: the game record, as a dictionary of id, seed, blue, red, result ('BLUE_WON', 'RED_WON' or 'UNFINISHED'),
+        plies and moves (a list of moves such as 'e7e6'; a pass is written as the general's square twice)
+    """
+    rng = random.Random(seed)
+    policies = {'blue': make_policy(blue_spec), 'red': make_policy(red_spec)}
+    game = JanggiGame()
+    moves = []
+    while game.get_game_state() == 'UNFINISHED' and len(moves) < max_plies:
+        start, end = policies[game.get_current_color()].choose_move(game, rng)
+        if not game.make_move(start, end):
+            raise RuntimeError('Policy chose an invalid move: {} {}'.format(start, end))
+        moves.append(start + end)
+    return {'id': game_id, 'seed': seed, 'blue': blue_spec, 'red': red_spec, 'result': game.get_game_state(),
+            'plies': len(moves), 'moves': moves}
+
+
+def run_self_play(games, output=None, blue_spec='random', red_spec='random', max_plies=200, seed=0, processes=None,
+                  progress=None):
+    """
+    Plays a batch of self-play games across a pool of worker processes, writing each record as one JSON line to the
+      output file object as soon as its game finishes (so records are in order of completion, not of id)
+    At most a few games per process are queued at any time, so memory use does not grow with the number of games
+    :param games: the number of games to play
+    :param output: a text file object to write records to, or None to not keep the records
+    :param seed: game number n is played with seed + n
+    :param processes: the number of worker processes; if None, the number of CPUs; with 1, games are played in this
+        process without a pool
+    :param progress: if given, a function called with the summary so far after every finished game
+    :return: a summary dictionary of games, blue_won, red_won, unfinished, plies, elapsed and games_per_second
+    """
+    processes = processes or os.cpu_count() or 1
+    summary = {'games': 0, 'blue_won': 0, 'red_won': 0, 'unfinished': 0, 'plies': 0, 'elapsed': 0.0,
+               'games_per_second': 0.0}
+    start_time = time.perf_counter()
+
+    def record_finished(record):
+        """Writes a finished game record and adds it to the summary"""
+        if output is not None:
+            output.write(json.dumps(record, separators=(',', ':')) + '\n')
+        summary['games'] += 1
+        summary[{'BLUE_WON': 'blue_won', 'RED_WON': 'red_won'}.get(record['result'], 'unfinished')] += 1
+        summary['plies'] += record['plies']
+        summary['elapsed'] = time.perf_counter() - start_time
+        summary['games_per_second'] = summary['games'] / summary['elapsed'] if summary['elapsed'] else 0.0
+        if progress is not None:
+            progress(summary)
+
+    if processes == 1:
+        for game_id in range(games):
+            record_finished(play_game(game_id, seed + game_id, blue_spec, red_spec, max_plies))
+        return summary
+    with ProcessPoolExecutor(processes) as executor:
+        pending = set()
+        game_id = 0
+        while game_id < games or pending:
+            while game_id < games and len(pending) < processes * 4:
+                pending.add(executor.submit(play_game, game_id, seed + game_id, blue_spec, red_spec, max_plies))
+                game_id += 1
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record_finished(future.result())
+    return summary
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Batch self-play between Janggi move policies')
+    parser.add_argument('--games', type=int, default=100, help='number of games to play (default 100)')
+    parser.add_argument('--output', default=None, help='JSON lines file to append game records to')
+    parser.add_argument('--blue', default='random', help="blue's policy: 'random' or 'search:DEPTH'")
+    parser.add_argument('--red', default='random', help="red's policy: 'random' or 'search:DEPTH'")
+    parser.add_argument('--max-plies', type=int, default=200, help='stop games unfinished after this many moves')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    args = parser.parse_args()
+    for spec in (args.blue, args.red):
+        make_policy(spec)  # fail early on a bad spec rather than in every worker
+
+    def progress(summary):
+        """Prints a running count of games and throughput"""
+        if summary['games'] % 10 == 0 or summary['games'] == args.games:
+            sys.stderr.write('\r{games} games, {games_per_second:.1f} games/s'.format(**summary))
+
+    output = open(args.output, 'a') if args.output else None
+    try:
+        summary = run_self_play(args.games, output, args.blue, args.red, args.max_plies, args.seed, args.processes,
+                                progress)
+    finally:
+        if output is not None:
+            output.close()
+    sys.stderr.write('\n')
+    print('{games} games in {elapsed:.1f}s ({games_per_second:.1f} games/s): blue won {blue_won}, red won {red_won}, '
+          'unfinished {unfinished}, {plies} moves'.format(**summary))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,225 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: An asyncio server hosting many concurrent Janggi games over a JSON lines protocol (TCP or Unix socket);
+#   move validation and checkmate detection run in a pool of worker processes so they never stall the event loop
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from JanggiGame import JanggiGame
+from JanggiNotation import pack_game, unpack_game, game_to_fen, START_FEN
+
+MAX_LINE = 1 << 16  # longest request line accepted, in bytes
+
+
+def apply_move(position, start, end):
+    """
+    Makes a move on a packed position (see JanggiNotation); the unit of work sent to a worker process
+    :return: (True if the move was accepted, the packed position after the move, the FEN of that position,
+        True if the player to move is now in check)
+    """
+    game = unpack_game(position, shared_pieces=True)
+    accepted = game.make_move(start, end)
+    return accepted, pack_game(game), game_to_fen(game), game.is_in_check(game.get_current_color())
+
+
+def list_legal_moves(position, square=None):
+    """
+    Given a packed position, returns its legal moves as a list of 'e7e6' style strings; only those of the piece on
+      the given square if one is given; the unit of work sent to a worker process
+    """
+    game = unpack_game(position, shared_pieces=True)
+    if square is not None:
+        return [square + end for end in game.legal_moves_from(square)]
+    return [start + end for start, end in game.legal_moves()]
+
+
+class Session:
+    """
+    Represents one hosted game: its packed position, FEN, moves and a lock that keeps its requests in order
+    Only the 46-byte packed position is kept between moves, not a JanggiGame object
+    """
+
+    def __init__(self):
+        """Initializes a session at the start position"""
+        self.position = pack_game(JanggiGame())
+        self.fen = START_FEN
+        self.moves = []
+        self.check = False
+        self.lock = asyncio.Lock()
+
+    def describe(self):
+        """Returns the session's state as a dictionary for responses"""
+        fields = self.fen.split()
+        return {'fen': self.fen, 'turn': 'red' if fields[1] == 'r' else 'blue',
+                'state': {'-': 'UNFINISHED', 'r': 'RED_WON', 'b': 'BLUE_WON'}[fields[2]], 'check': self.check,
+                'plies': len(self.moves)}
+
+
+class JanggiServer:
+    """
+    Represents the game server
+    Protocol: the client sends one JSON object per line and receives one JSON object per line in reply, in order;
+      every request has an 'op', and may have an 'id' which is echoed back in the reply
+        {"op": "new"}                                     -> {"ok": true, "game": "1", "fen": ..., "turn": ..., ...}
+        {"op": "move", "game": "1", "start": "e7", "end": "e6"}   -> {"ok": true, ...state after the move}
+        {"op": "state", "game": "1"}                      -> {"ok": true, ..., "moves": ["e7e6", ...]}
+        {"op": "legal", "game": "1", "square": "e7"}      -> {"ok": true, "moves": ["e7e6", "e7d7", ...]}
+        {"op": "close", "game": "1"}                      -> {"ok": true}
+      an invalid move or request is answered with {"ok": false, "error": "..."}
+    Games are independent of connections: any connection may play any game by its id
+    """
+
+    def __init__(self, processes=None):
+        """
+        Initializes a server with no games
+        :param processes: the number of worker processes; if None, the number of CPUs; with 0, moves are validated
+            in the event loop's own thread (only sensible for testing)
+        """
+        self._processes = (os.cpu_count() or 1) if processes is None else processes
+        self._executor = None
+        self._sessions = {}
+        self._ids = itertools.count(1)
+
+    def get_session_count(self):
+        """Returns the number of games being hosted"""
+        return len(self._sessions)
+
+    async def _run(self, function, *args):
+        """Private helper method; runs the function in the worker pool (or directly, with no pool)"""
+        if self._processes == 0:
+            return function(*args)
+        if self._executor is None:
+            # spawned rather than forked workers, so they do not inherit (and hold open) the server's sockets
+            self._executor = ProcessPoolExecutor(self._processes, mp_context=multiprocessing.get_context('spawn'))
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def handle_request(self, request):
+        """Given a request dictionary, carries it out and returns the reply dictionary"""
+        reply = {'id': request['id']} if 'id' in request else {}
+        try:
+            reply.update(await self._dispatch(request))
+            reply['ok'] = True
+        except (TypeError, ValueError) as error:
+            reply.update({'ok': False, 'error': str(error)})
+        return reply
+
+    @staticmethod
+    def _field(request, name):
+        """Private helper method; returns the named field of the request, raising ValueError if it is missing"""
+        if name not in request:
+            raise ValueError('missing field: {}'.format(name))
+        return request[name]
+
+    def _session(self, request):
+        """Private helper method; returns the session named in the request, raising ValueError if there is none"""
+        game_id = str(self._field(request, 'game'))
+        if game_id not in self._sessions:
+            raise ValueError('unknown game: {}'.format(game_id))
+        return self._sessions[game_id]
+
+    async def _dispatch(self, request):
+        """Private helper method; carries out a request and returns the reply fields"""
+        op = request.get('op')
+        if op == 'new':
+            game_id = str(next(self._ids))
+            session = self._sessions[game_id] = Session()
+            return dict(session.describe(), game=game_id)
+        if op not in ('move', 'state', 'legal', 'close'):
+            raise ValueError('unknown op: {}'.format(op))
+        session = self._session(request)
+        if op == 'move':
+            start, end = self._field(request, 'start'), self._field(request, 'end')
+            if not isinstance(start, str) or not isinstance(end, str):
+                raise ValueError('start and end must be squares such as "e7"')
+            async with session.lock:
+                accepted, position, fen, check = await self._run(apply_move, session.position, start, end)
+                if not accepted:
+                    raise ValueError('invalid move: {} {}'.format(start, end))
+                session.position, session.fen, session.check = position, fen, check
+                session.moves.append(start + end)
+            return session.describe()
+        if op == 'state':
+            return dict(session.describe(), moves=session.moves)
+        if op == 'legal':
+            async with session.lock:
+                return {'moves': await self._run(list_legal_moves, session.position, request.get('square'))}
+        del self._sessions[str(request['game'])]  # op is 'close'
+        return {}
+
+    async def handle_connection(self, reader, writer):
+        """Serves one client connection until it closes; requests are answered in the order they arrive"""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    break  # the line was longer than MAX_LINE
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('request must be a JSON object')
+                except ValueError as error:
+                    reply = {'ok': False, 'error': 'invalid JSON: {}'.format(error)}
+                else:
+                    reply = await self.handle_request(request)
+                writer.write(json.dumps(reply, separators=(',', ':')).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        Starts listening on a TCP host and port (0 picks a free port), or on a Unix socket path if one is given
+        :return: the asyncio Server object
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_LINE)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+
+    def close(self):
+        """Shuts down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+async def serve(host, port, path, processes):
+    """Runs a server until cancelled"""
+    server = JanggiServer(processes)
+    listener = await server.start(host, port, path)
+    print('serving Janggi on {}'.format(path or '{}:{}'.format(*listener.sockets[0].getsockname()[:2])))
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='JSON lines server hosting many concurrent Janggi games')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='TCP port to listen on (default 8765)')
+    parser.add_argument('--unix', default=None, metavar='PATH', help='listen on a Unix socket instead')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.processes))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
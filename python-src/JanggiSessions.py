@@ -0,0 +1,251 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: A store of many long-running Janggi games; the most recently used games stay in memory as JanggiGame
+#   objects and idle ones are evicted to compact snapshots on disk, to be restored on their next move
+
+import os
+import re
+import struct
+import sys
+from collections import OrderedDict
+from JanggiGame import JanggiGame, JanggiBoard
+from JanggiNotation import pack, unpack_codes, PACKED_BYTES
+from JanggiArchive import encode_move, decode_move, MOVE_BYTES
+
+SNAPSHOT_SUFFIX = '.snap'
+_GAME_ID = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def snapshot(game):
+    """
+    Given a JanggiGame object, returns it as compact bytes: the position before its first recorded move packed into
+      PACKED_BYTES bytes (see JanggiNotation), with the flags byte holding the current turn and game state, followed
+      by MOVE_BYTES per recorded move (see JanggiArchive.encode_move())
+    Keeping the moves rather than only the current position means the restored game has the same undo stack, and so
+      the same lost pieces
+    """
+    janggiBoard = game._get_janggiBoard()
+    history = janggiBoard.get_history()
+    base = janggiBoard.copy()
+    for _ in range(len(history)):
+        base.pop()
+    numbers = [encode_move(start, end) for start, end, moved, captured in history]
+    return (pack(base, game.get_current_color(), game.get_game_state())
+            + struct.pack('<{}H'.format(len(numbers)), *numbers))
+
+
+def restore(data, board_class=JanggiBoard, shared_pieces=False):
+    """
+    Given bytes returned by snapshot(), returns a new JanggiGame object equal to the one that was snapshotted
+    :param shared_pieces: if True, the board holds the shared Piece objects (see JanggiGame.SHARED_PIECES)
+    Raises ValueError if the data is not a snapshot
+    """
+    if len(data) < PACKED_BYTES or (len(data) - PACKED_BYTES) % MOVE_BYTES:
+        raise ValueError('Invalid snapshot: {} bytes'.format(len(data)))
+    codes, color, game_state = unpack_codes(data[:PACKED_BYTES])
+    janggiBoard = board_class.from_codes(codes, shared_pieces)
+    count = (len(data) - PACKED_BYTES) // MOVE_BYTES
+    for number in struct.unpack_from('<{}H'.format(count), data, PACKED_BYTES):
+        start, end = decode_move(number)
+        if start >= 90 or janggiBoard.get_pieces()[start] is None:
+            raise ValueError('Invalid snapshot: bad move {}'.format(number))
+        captured = janggiBoard.push(start, end)
+        if captured is not None and not shared_pieces:
+            captured.set_is_captured(True)
+    return JanggiGame.from_position(janggiBoard, color, game_state)
+
+
+def estimate_size(game):
+    """
+    Given a JanggiGame object, returns an estimate of the memory it takes up, in bytes: the board's arrays, pieces,
+      sets and undo stack (shared tables such as the palace tuples, and shared pieces, are not counted)
+    """
+    janggiBoard = game._get_janggiBoard()
+    size = sys.getsizeof(game) + sys.getsizeof(game.__dict__) + sys.getsizeof(janggiBoard.__dict__)
+    pieces = [piece for piece in janggiBoard.get_pieces() if piece is not None]
+    history = janggiBoard.get_history()
+    pieces += [captured for start, end, moved, captured in history if captured is not None]
+    size += sum(sys.getsizeof(piece) for piece in set(pieces) if not piece.is_shared())
+    containers = [value for value in janggiBoard.__dict__.values() if isinstance(value, (list, bytearray, dict))]
+    containers += janggiBoard._piece_indices.values()
+    size += sum(sys.getsizeof(container) for container in containers)
+    size += sum(sys.getsizeof(record) for record in history)
+    return size
+
+
+def _growing_bytes(game):
+    """
+    Private helper function; returns the size in bytes of the containers of a game which change size as moves are
+      made: the undo stack list and the sets of piece indices (a set may be resized even when a piece only moves)
+    """
+    janggiBoard = game._get_janggiBoard()
+    return sys.getsizeof(janggiBoard.get_history()) + sum(sys.getsizeof(indices)
+                                                          for indices in janggiBoard._piece_indices.values())
+
+
+def estimate_move_size(game, growing_bytes):
+    """
+    Given a JanggiGame object which has just made a move, and _growing_bytes() of the game from when its size was
+      last estimated (before the move), returns how much estimate_size() grew since then: the new undo record, and
+      any change in size of the containers; the game is not walked, so this takes the same time however long the
+      game is (a captured piece was already counted while it was on the board)
+    """
+    return sys.getsizeof(game._get_janggiBoard().get_history()[-1]) + _growing_bytes(game) - growing_bytes
+
+
+class SessionStore:
+    """
+    Represents a store of games by game id, kept within a budget: at most capacity games (and, if max_bytes is given,
+      at most about that many bytes of games, see estimate_size()) are kept in memory; when a game is added or used and
+      the budget is exceeded, the least recently used games are evicted, by writing their snapshot (see snapshot()) to
+      the store's directory and dropping the JanggiGame object
+    Evicted games are restored transparently by get_game() and make_move(); a store opened on a directory holding
+      snapshots (e.g. after a restart) starts with those games evicted
+    """
+
+    def __init__(self, directory, capacity=1024, max_bytes=None, board_class=JanggiBoard, shared_pieces=False):
+        """
+        Initializes a store keeping its snapshots in the given directory (created if needed)
+        :param capacity: the most games to keep in memory
+        :param max_bytes: the most memory (estimated) to spend on games kept in memory; no limit if None
+        :param board_class: the class of the board new and restored games play on
+        :param shared_pieces: if True, new and restored games hold the shared Piece objects (see JanggiGame.__init__())
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._capacity = capacity
+        self._max_bytes = max_bytes
+        self._board_class = board_class
+        self._shared_pieces = shared_pieces
+        # key: game id, value: (JanggiGame object, estimated size, _growing_bytes() when it was estimated); least
+        #   recently used first
+        self._games = OrderedDict()
+        self._bytes = 0
+        self._evicted = {name[:-len(SNAPSHOT_SUFFIX)] for name in os.listdir(directory)
+                         if name.endswith(SNAPSHOT_SUFFIX)}
+        self._next_id = 1 + max((int(game_id) for game_id in self._evicted if game_id.isdigit()), default=0)
+        self._evictions = 0
+        self._restores = 0
+
+    def __len__(self):
+        """Returns the number of games in the store, in memory or evicted"""
+        return len(self._games) + len(self._evicted)
+
+    def __contains__(self, game_id):
+        """Returns True if the store has a game with the given id; otherwise False"""
+        return game_id in self._games or game_id in self._evicted
+
+    def get_resident_count(self):
+        """Returns the number of games kept in memory"""
+        return len(self._games)
+
+    def get_resident_bytes(self):
+        """Returns the estimated memory taken up by the games kept in memory, in bytes"""
+        return self._bytes
+
+    def get_stats(self):
+        """Returns a dictionary of the store's counts: games, resident, evictions and restores"""
+        return {'games': len(self), 'resident': len(self._games), 'evictions': self._evictions,
+                'restores': self._restores}
+
+    def _path(self, game_id):
+        """Private helper method; returns the path of the snapshot file of the given game id"""
+        return os.path.join(self._directory, game_id + SNAPSHOT_SUFFIX)
+
+    def add(self, game=None, game_id=None):
+        """
+        Adds a game to the store and returns its game id
+        :param game: a JanggiGame object; a new game if None
+        :param game_id: a string of letters, digits, '_' and '-'; the next unused number if None
+        Raises ValueError if the game id is invalid or already in the store
+        """
+        if game_id is None:
+            while str(self._next_id) in self:
+                self._next_id += 1
+            game_id = str(self._next_id)
+            self._next_id += 1
+        elif not isinstance(game_id, str) or not _GAME_ID.fullmatch(game_id):
+            raise ValueError('Invalid game id: {!r}'.format(game_id))
+        elif game_id in self:
+            raise ValueError('Game id already in use: {}'.format(game_id))
+        self._keep(game_id, JanggiGame(self._board_class, self._shared_pieces) if game is None else game)
+        return game_id
+
+    def _keep(self, game_id, game):
+        """Private helper method; keeps the game in memory as the most recently used one, then enforces the budget"""
+        size = estimate_size(game)
+        self._games[game_id] = (game, size, _growing_bytes(game))
+        self._bytes += size
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        """Private helper method; evicts the least recently used games until the store is within its budget"""
+        while len(self._games) > self._capacity or (self._max_bytes is not None and self._bytes > self._max_bytes
+                                                    and len(self._games) > 1):
+            self.evict(next(iter(self._games)))
+
+    def evict(self, game_id):
+        """Writes the snapshot of the game with the given id to disk and drops it from memory (if it is in memory)"""
+        if game_id not in self._games:
+            return
+        game, size, growing_bytes = self._games.pop(game_id)
+        path = self._path(game_id)
+        with open(path + '.tmp', 'wb') as file:
+            file.write(snapshot(game))
+        os.replace(path + '.tmp', path)  # so that a crash part-way through never leaves a partial snapshot
+        self._bytes -= size
+        self._evicted.add(game_id)
+        self._evictions += 1
+
+    def evict_all(self):
+        """Evicts every game kept in memory (e.g. before shutting down)"""
+        for game_id in list(self._games):
+            self.evict(game_id)
+
+    def get_game(self, game_id):
+        """
+        Returns the JanggiGame object of the game with the given id, restoring it from its snapshot if it was evicted;
+          it becomes the most recently used game
+        The object may be evicted (and so stop being the store's copy) by later calls; use make_move() to play
+        Raises KeyError if there is no game with that id
+        """
+        if game_id in self._games:
+            self._games.move_to_end(game_id)
+            return self._games[game_id][0]
+        if game_id not in self._evicted:
+            raise KeyError(game_id)
+        with open(self._path(game_id), 'rb') as file:
+            game = restore(file.read(), self._board_class, self._shared_pieces)
+        self._evicted.remove(game_id)
+        os.remove(self._path(game_id))
+        self._restores += 1
+        self._keep(game_id, game)
+        return game
+
+    def make_move(self, game_id, start, end):
+        """
+        Makes a move in the game with the given id (see JanggiGame.make_move()), restoring the game first if it was
+          evicted; returns True if the move was valid, False otherwise
+        Raises KeyError if there is no game with that id
+        """
+        game = self.get_game(game_id)
+        if not game.make_move(start, end):
+            return False
+        game, size, growing_bytes = self._games[game_id]
+        added = estimate_move_size(game, growing_bytes)  # a running total, rather than walking the game per move
+        self._bytes += added
+        self._games[game_id] = (game, size + added, _growing_bytes(game))
+        self._enforce_budget()
+        return True
+
+    def remove(self, game_id):
+        """Removes the game with the given id from the store; raises KeyError if there is none"""
+        if game_id in self._games:
+            self._bytes -= self._games.pop(game_id)[1]
+        elif game_id in self._evicted:
+            self._evicted.remove(game_id)
+            os.remove(self._path(game_id))
+        else:
+            raise KeyError(game_id)
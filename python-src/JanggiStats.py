@@ -0,0 +1,212 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: Opt-in instrumentation of JanggiGame and JanggiBoard; counts the calls made on the hot paths and times
+#   each phase of make_move(), so that a slow move can be explained
+
+import time
+from JanggiGame import JanggiGame, JanggiBoard, PIECE_CLASSES
+
+PHASES = ('make_move', 'movement', 'check', 'checkmate')
+
+
+class MoveStats:
+    """
+    Represents the counters and timers of one or more instrumented games (see instrument())
+    :make_moves: the number of make_move() calls
+    :moves_made: the number of those calls which made a move (returned True)
+    :valid_squares: the number of movement rule checks (valid_squares() calls) made by make_move(); key: piece class
+        name, value: count
+    :valid_indices: the number of piece movement calls (valid_indices() calls) made by the board's move generation
+        (generate_legal_moves(), and so is_in_checkmate() and search); key: piece class name, value: count
+    :in_check: the number of is_in_check() calls on the board
+    :in_checkmate: the number of is_in_checkmate() calls on the board
+    :copies: the number of board copies
+    :times: the wall time spent in each phase of make_move(), in seconds; key: phase, value: seconds
+        'make_move' is the whole call; 'movement' the movement rule check (#4 and #5 of make_move()), 'check' making
+        the move and testing whether it leaves the player in check (#6), 'checkmate' testing whether the opponent is
+        now in check or checkmate
+    :slowest: (seconds, start square, end square) of the slowest make_move() call, or None
+    """
+
+    def __init__(self):
+        """Initializes a MoveStats object with every counter and timer at 0"""
+        self.reset()
+
+    def reset(self):
+        """Sets every counter and timer back to 0"""
+        self.make_moves = 0
+        self.moves_made = 0
+        self.valid_squares = {piece_class.__name__: 0 for piece_class in PIECE_CLASSES.values()}
+        self.valid_indices = {piece_class.__name__: 0 for piece_class in PIECE_CLASSES.values()}
+        self.in_check = 0
+        self.in_checkmate = 0
+        self.copies = 0
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.slowest = None
+
+    def as_dict(self):
+        """Returns the counters and timers as a dictionary (e.g. for writing as JSON)"""
+        return {'make_moves': self.make_moves, 'moves_made': self.moves_made,
+                'valid_squares': dict(self.valid_squares), 'valid_indices': dict(self.valid_indices),
+                'in_check': self.in_check, 'in_checkmate': self.in_checkmate, 'copies': self.copies,
+                'times': dict(self.times), 'slowest': None if self.slowest is None else list(self.slowest)}
+
+    def report(self):
+        """Returns a multi-line text summary of the counters and timers"""
+        lines = ['make_move: {} calls, {} moves made'.format(self.make_moves, self.moves_made)]
+        for phase in PHASES:
+            per_call = self.times[phase] / self.make_moves if self.make_moves else 0.0
+            lines.append('  {:<10} {:10.3f} ms total {:10.1f} us per call'.format(
+                phase, self.times[phase] * 1e3, per_call * 1e6))
+        if self.slowest is not None:
+            lines.append('  slowest    {:10.3f} ms ({} {})'.format(self.slowest[0] * 1e3, *self.slowest[1:]))
+        lines.append('valid_squares: ' + ', '.join('{} {}'.format(name, count)
+                                                   for name, count in self.valid_squares.items()))
+        lines.append('valid_indices: ' + ', '.join('{} {}'.format(name, count)
+                                                   for name, count in self.valid_indices.items()))
+        lines.append('is_in_check: {}, is_in_checkmate: {}, board copies: {}'.format(
+            self.in_check, self.in_checkmate, self.copies))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        """Used so that the stats are printed in a friendly manner"""
+        return 'MoveStats(make_moves={}, moves_made={}, in_check={}, in_checkmate={}, copies={})'.format(
+            self.make_moves, self.moves_made, self.in_check, self.in_checkmate, self.copies)
+
+
+class InstrumentedBoard:
+    """
+    Mixin counting the calls made on a board; combined with a board class by instrument() (see _instrumented())
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Used when a board is built directly of an instrumented class (e.g. by from_codes() or copy()): it starts with
+          its own MoveStats object, replaced by instrument() or copy() when the stats are to be shared
+        """
+        self._stats = MoveStats()
+        super().__init__(*args, **kwargs)
+
+    def _piece_ends(self, piece, index):
+        """See JanggiBoard._piece_ends(); also counted by piece type"""
+        self._stats.valid_indices[type(piece).__name__] += 1
+        return super()._piece_ends(piece, index)
+
+    def is_in_check(self, color):
+        """See JanggiBoard.is_in_check(); also counted"""
+        self._stats.in_check += 1
+        return super().is_in_check(color)
+
+    def is_in_checkmate(self, color):
+        """See JanggiBoard.is_in_checkmate(); also counted"""
+        self._stats.in_checkmate += 1
+        return super().is_in_checkmate(color)
+
+    def copy(self):
+        """See JanggiBoard.copy(); also counted, and the copy shares this board's stats"""
+        self._stats.copies += 1
+        copy_board = super().copy()
+        copy_board._stats = self._stats
+        return copy_board
+
+
+class InstrumentedGame:
+    """
+    Mixin timing the phases of make_move() (see JanggiGame.make_move()); combined with a game class by instrument()
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Used when a game is built directly of an instrumented class (e.g. by from_position()): it starts with its own
+          MoveStats object, replaced by instrument() when the stats are to be shared
+        """
+        self._stats = MoveStats()
+        super().__init__(*args, **kwargs)
+
+    def make_move(self, start, end):
+        """See JanggiGame.make_move(); also counted and timed"""
+        stats = self._stats
+        began = time.perf_counter()
+        made = super().make_move(start, end)
+        elapsed = time.perf_counter() - began
+        stats.make_moves += 1
+        stats.moves_made += made
+        stats.times['make_move'] += elapsed
+        if stats.slowest is None or elapsed > stats.slowest[0]:
+            stats.slowest = (elapsed, start, end)
+        return made
+
+    def _follows_movement_rules(self, piece, start, end):
+        """See JanggiGame._follows_movement_rules(); also counted by piece type and timed"""
+        self._stats.valid_squares[type(piece).__name__] += 1
+        began = time.perf_counter()
+        follows = super()._follows_movement_rules(piece, start, end)
+        self._stats.times['movement'] += time.perf_counter() - began
+        return follows
+
+    def _push_unless_in_check(self, start, end):
+        """See JanggiGame._push_unless_in_check(); also timed"""
+        began = time.perf_counter()
+        kept = super()._push_unless_in_check(start, end)
+        self._stats.times['check'] += time.perf_counter() - began
+        return kept
+
+    def _update_game_state(self):
+        """See JanggiGame._update_game_state(); also timed"""
+        began = time.perf_counter()
+        super()._update_game_state()
+        self._stats.times['checkmate'] += time.perf_counter() - began
+
+
+_INSTRUMENTED_CLASSES = {}  # key: a game or board class, value: its instrumented subclass
+
+
+def _instrumented(cls, mixin):
+    """Private helper function; returns the subclass of cls with the mixin's methods overriding its own (cached)"""
+    if cls not in _INSTRUMENTED_CLASSES:
+        subclass = type('Instrumented' + cls.__name__, (mixin, cls), {'_base_class': cls})
+        _INSTRUMENTED_CLASSES[cls] = subclass
+        _INSTRUMENTED_CLASSES[subclass] = subclass
+    return _INSTRUMENTED_CLASSES[cls]
+
+
+def instrument(game, stats=None):
+    """
+    Turns on instrumentation for a JanggiGame object (of any board class) and returns its MoveStats object
+    The game and its board are switched to instrumented subclasses of their classes, so games that are not instrumented
+      run exactly the same code as before, with no checks for whether instrumentation is on
+    :param stats: a MoveStats object to add to (e.g. one shared by several games); a new one if None; if the game is
+        already instrumented, its stats are replaced
+    """
+    stats = MoveStats() if stats is None else stats
+    janggiBoard = game._get_janggiBoard()
+    game.__class__ = _instrumented(type(game), InstrumentedGame)
+    janggiBoard.__class__ = _instrumented(type(janggiBoard), InstrumentedBoard)
+    game._stats = janggiBoard._stats = stats
+    return stats
+
+
+def uninstrument(game):
+    """Turns off instrumentation for a JanggiGame object turned on by instrument(); the game plays on as before"""
+    janggiBoard = game._get_janggiBoard()
+    for obj in (game, janggiBoard):
+        if isinstance(obj, (InstrumentedGame, InstrumentedBoard)):
+            obj.__class__ = obj._base_class
+            del obj._stats
+
+
+def get_stats(game):
+    """Returns the MoveStats object of an instrumented JanggiGame object, or None if it is not instrumented"""
+    return game._stats if isinstance(game, InstrumentedGame) else None
+
+
+def profile_moves(moves, board_class=JanggiBoard):
+    """
+    Helper function; plays a sequence of (start, end) moves in algebraic notation on a new instrumented game and
+      returns its MoveStats object
+    """
+    game = JanggiGame(board_class)
+    stats = instrument(game)
+    for start, end in moves:
+        game.make_move(start, end)
+    return stats
@@ -0,0 +1,529 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: Endgame tablebases for Janggi; every position of a small material set (e.g. general and chariot against
+#   general and guard) is enumerated, solved by retrograde analysis with move generation split across processes, and
+#   written as a compact win / loss / draw with distance to mate file that can be probed from search
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from JanggiGame import JanggiBoard, EMPTY, SOLDIER, GUARD, GENERAL, RED, BLUE, KIND_MASK
+from JanggiGame import PALACE_MOVES
+from JanggiNotation import PIECE_LETTERS
+
+TABLEBASE_SUFFIX = '.jtb'
+TABLEBASE_MAGIC = b'JTB1'
+HEADER = struct.Struct('<4s16sBI')  # magic, material (padded), bytes per value, number of positions
+_LETTER_CODES = {letter if color_bit == RED else letter.lower(): kind | color_bit
+                 for kind, letter in PIECE_LETTERS.items() for color_bit in (RED, BLUE)}
+_CODE_LETTERS = {code: letter for letter, code in _LETTER_CODES.items()}
+# flags of a position found by move generation
+_NORMAL, _INVALID, _MATED = 0, 1, 2
+
+
+def _build_domain(code):
+    """
+    Helper function; given a piece code, returns a tuple of the square indices a piece with that code can stand on:
+      its own palace for a general or guard, the rows at or beyond its starting row for a soldier (soldiers never
+      move backward), and the whole board otherwise
+    """
+    kind, color_bit = code & KIND_MASK, code & BLUE
+    if kind in (GENERAL, GUARD):
+        return tuple(sorted({end for ends in PALACE_MOVES[color_bit] for end in ends}))  # every palace square
+    if kind == SOLDIER:
+        return tuple(range(27, 90)) if color_bit == RED else tuple(range(0, 63))
+    return tuple(range(90))
+
+
+def _canonical_order(code):
+    """Private helper function; the sort key of a piece code in a material set: red first, generals first"""
+    return code & BLUE, code & KIND_MASK != GENERAL, code
+
+
+class Material:
+    """
+    Represents a material set: the pieces on the board, e.g. 'KRka' for red's general and chariot against blue's
+      general and guard (the letters of JanggiNotation.PIECE_LETTERS; upper case red, lower case blue); each side
+      has exactly one general
+    Every position of the set has an index: the squares of the pieces (each within its domain, see _build_domain())
+      and the color to move are the digits of a mixed-radix number; indices of positions where two pieces share a
+      square, or where the side that just moved is in check, are never reached in play and are marked invalid
+    Pieces are held in a canonical order (red's then blue's, each general first and then by piece code) and name()
+      returns the material in that order, so 'kaRK' and 'KRka' are the same material
+    """
+
+    def __init__(self, name):
+        """
+        Initializes the material set with the given name
+        Raises ValueError if the name is not a valid material set
+        """
+        if any(letter not in _LETTER_CODES for letter in name):
+            raise ValueError('Invalid material: {}'.format(name))
+        self._codes = tuple(sorted((_LETTER_CODES[letter] for letter in name), key=_canonical_order))
+        if self._codes.count(GENERAL | RED) != 1 or self._codes.count(GENERAL | BLUE) != 1:
+            raise ValueError('Invalid material, each side needs one general: {}'.format(name))
+        if len(self._codes) > 16:
+            raise ValueError('Invalid material, too many pieces: {}'.format(name))
+        self._domains = tuple(_build_domain(code) for code in self._codes)
+        self._positions = tuple({index: position for position, index in enumerate(domain)}
+                                for domain in self._domains)
+        # the index of a position is color_bit + 2 * sum(domain position of piece slot * multipliers[slot])
+        self._multipliers = []
+        size = 2
+        for domain in self._domains:
+            self._multipliers.append(size)
+            size *= len(domain)
+        self._size = size
+
+    def name(self):
+        """Returns the canonical name of the material set"""
+        return ''.join(_CODE_LETTERS[code] for code in self._codes)
+
+    def get_codes(self):
+        """Returns a tuple of the piece codes of the set, in canonical order"""
+        return self._codes
+
+    def __len__(self):
+        """Returns the number of position indices of the set"""
+        return self._size
+
+    def __repr__(self):
+        """Used so that the material set is printed in a friendly manner"""
+        return 'Material({!r})'.format(self.name())
+
+    def decode(self, index):
+        """
+        Given a position index, returns (a list of the square index of each piece slot, True if red is to move)
+        """
+        red_to_move = index & 1 == 0
+        index >>= 1
+        squares = []
+        for domain in self._domains:
+            index, position = divmod(index, len(domain))
+            squares.append(domain[position])
+        return squares, red_to_move
+
+    def encode(self, squares, red_to_move):
+        """Given the square index of each piece slot and True if red is to move, returns the position index"""
+        index = 0 if red_to_move else 1
+        for positions, multiplier, square in zip(self._positions, self._multipliers, squares):
+            index += positions[square] * multiplier
+        return index
+
+    def index_of(self, codes, red_to_move):
+        """
+        Given a sequence of 90 piece codes (e.g. JanggiBoard.get_codes()) holding exactly this set's pieces, and True
+          if red is to move, returns the position index; None if a piece stands outside the domain of its slot (e.g. a
+          soldier behind its starting row, set up rather than reached in play), since no index covers that position
+        """
+        slots = {}
+        for index, code in enumerate(codes):
+            if code != EMPTY:
+                slots.setdefault(code, []).append(index)
+        squares = [slots[code].pop() for code in self._codes]
+        if any(square not in positions for positions, square in zip(self._positions, squares)):
+            return None
+        return self.encode(squares, red_to_move)
+
+    def get_multiplier(self, slot):
+        """Returns the amount a position index changes by when the given piece slot moves one domain position"""
+        return self._multipliers[slot]
+
+    def get_domain_position(self, slot, square):
+        """Returns the position of the square within the domain of the given piece slot"""
+        return self._positions[slot][square]
+
+    def without(self, slot):
+        """Returns the Material object of this set with the piece in the given slot removed (captured)"""
+        return Material(self.name()[:slot] + self.name()[slot + 1:])
+
+
+def material_of(janggiBoard):
+    """Given a JanggiBoard object, returns the canonical name of the material set on it"""
+    codes = janggiBoard.get_codes()
+    pieces = sorted((codes[index] for color in ('red', 'blue') for index in janggiBoard.get_piece_indices(color)),
+                    key=_canonical_order)
+    return ''.join(_CODE_LETTERS[code] for code in pieces)
+
+
+def decode_value(value):
+    """
+    Given a stored value, returns (result, plies) for the side to move: result is 'WIN', 'LOSS' or 'DRAW', and plies
+      the number of plies until mate with best play (None for a draw)
+    Values are stored as plies to mate + 1 (0 for a draw, or an invalid position); the winner is given by the parity,
+      since the side to move can only deliver mate on an odd ply and can only be mated on an even one
+    """
+    if value == 0:
+        return 'DRAW', None
+    plies = value - 1
+    return ('WIN' if plies % 2 else 'LOSS'), plies
+
+
+_worker_tables = {}  # in each worker process: key: material name, value: Tablebase object of the captured-into sets
+
+
+def _set_worker_tables(tables):
+    """Private helper function; the initializer of the worker processes; tables is a dict of name: Tablebase"""
+    _worker_tables.clear()
+    _worker_tables.update(tables)
+
+
+def generate_chunk(name, first, last, tables=None):
+    """
+    Generates the moves of the positions first to last - 1 of the material set; the unit of work sent to a worker
+    :param tables: the Tablebase objects of every set a capture leads to, by name; if None, those set up in this
+        worker process (see _set_worker_tables())
+    :return: a tuple of arrays, each with one entry per position except successors:
+        flags: _NORMAL, _INVALID or _MATED
+        counts: the number of moves which stay in this set (no capture)
+        successors: the position indices those moves lead to, all positions' in turn
+        capture_wins: the fewest plies to mate through a capture leading to a lost position for the opponent, 0 if none
+        capture_losses: the most plies to mate through a capture leading to a won position for the opponent, 0 if none
+        capture_draws: 1 if some capture leads to a drawn position, otherwise 0
+    """
+    tables = _worker_tables if tables is None else tables
+    material = Material(name)
+    codes_of_slots = material.get_codes()
+    sub_materials = {}
+    flags, counts = bytearray(last - first), array('H', bytes(2 * (last - first)))
+    successors = array('I')
+    capture_wins, capture_losses = array('H', bytes(2 * (last - first))), array('H', bytes(2 * (last - first)))
+    capture_draws = bytearray(last - first)
+    codes = bytearray(90)
+    for offset, index in enumerate(range(first, last)):
+        squares, red_to_move = material.decode(index)
+        if len(set(squares)) != len(squares):
+            flags[offset] = _INVALID
+            continue
+        for slot, square in enumerate(squares):
+            codes[square] = codes_of_slots[slot]
+        janggiBoard = JanggiBoard.from_codes(codes, shared_pieces=True)
+        for square in squares:
+            codes[square] = EMPTY
+        color, opponent = ('red', 'blue') if red_to_move else ('blue', 'red')
+        if janggiBoard.is_in_check(opponent):
+            flags[offset] = _INVALID
+            continue
+        slot_of = {square: slot for slot, square in enumerate(squares)}
+        base = index ^ 1  # the same squares with the other color to move
+        count = 0
+        best_win = worst_loss = 0
+        for start, end in janggiBoard.generate_legal_moves(color):
+            slot = slot_of[start]
+            if start == end or end not in slot_of:
+                successors.append(base + (material.get_domain_position(slot, end)
+                                          - material.get_domain_position(slot, start))
+                                  * material.get_multiplier(slot))
+                count += 1
+                continue
+            captured = slot_of[end]
+            if captured not in sub_materials:
+                sub_material = material.without(captured)
+                sub_materials[captured] = (sub_material, tables[sub_material.name()])
+            sub_material, table = sub_materials[captured]
+            after = [end if other == slot else square for other, square in enumerate(squares) if other != captured]
+            result, plies = decode_value(table.get_value(sub_material.encode(after, not red_to_move)))
+            if result == 'LOSS':
+                best_win = plies + 1 if not best_win else min(best_win, plies + 1)
+            elif result == 'WIN':
+                worst_loss = max(worst_loss, plies + 1)
+            else:
+                capture_draws[offset] = 1
+        if count == 0 and not best_win and not worst_loss and not capture_draws[offset]:
+            flags[offset] = _MATED  # no legal move at all (not even a pass) means checkmate
+        counts[offset], capture_wins[offset], capture_losses[offset] = count, best_win, worst_loss
+    return flags, counts, successors, capture_wins, capture_losses, capture_draws
+
+
+def solve(name, tables, processes=1, chunk_size=8192):
+    """
+    Solves every position of a material set by retrograde analysis and returns its Tablebase object
+    Move generation (the expensive part) is split into chunks of positions spread over a pool of worker processes;
+      then, from the mated positions and the captures into already solved sets, distances to mate are propagated
+      backward through the predecessors of each position, in order of increasing distance (so the first distance
+      found for a won position is the shortest, and a lost position is only settled once all its moves are known
+      to lose, at the longest of their distances); positions never settled are draws
+    :param tables: the Tablebase objects of every set a capture leads to (see required_materials()), by name
+    :param processes: the number of worker processes; with 1, everything runs in this process
+    """
+    material = Material(name)
+    size = len(material)
+    chunks = [(first, min(first + chunk_size, size)) for first in range(0, size, chunk_size)]
+    if processes <= 1:
+        results = [generate_chunk(material.name(), first, last, tables) for first, last in chunks]
+    else:
+        with ProcessPoolExecutor(processes, initializer=_set_worker_tables, initargs=(tables,)) as executor:
+            results = list(executor.map(generate_chunk, [material.name()] * len(chunks),
+                                        [first for first, last in chunks], [last for first, last in chunks]))
+    flags, counts, capture_wins, capture_losses, capture_draws = bytearray(), array('H'), array('H'), array('H'), \
+        bytearray()
+    successors = []
+    for chunk_flags, chunk_counts, chunk_successors, chunk_wins, chunk_losses, chunk_draws in results:
+        flags += chunk_flags
+        counts += chunk_counts
+        capture_wins += chunk_wins
+        capture_losses += chunk_losses
+        capture_draws += chunk_draws
+        successors.append(chunk_successors)
+    # predecessors as compressed rows: the predecessors of position p are predecessors[starts[p]:starts[p + 1]]
+    starts = array('I', bytes(4 * (size + 1)))
+    for chunk_successors in successors:
+        for successor in chunk_successors:
+            starts[successor + 1] += 1
+    for index in range(size):
+        starts[index + 1] += starts[index]
+    predecessors = array('I', bytes(4 * starts[size]))
+    fill = array('I', starts)
+    for chunk_successors, (first, last) in zip(successors, chunks):
+        offset = 0
+        for index in range(first, last):
+            for successor in chunk_successors[offset:offset + counts[index]]:
+                predecessors[fill[successor]] = index
+                fill[successor] += 1
+            offset += counts[index]
+    del successors, fill
+    # propagation, by increasing distance; buckets[d] holds positions which may be settled at distance d
+    values = array('H', bytes(2 * size))
+    worst_loss = array('H', capture_losses)
+    buckets = [[] for _ in range(2)]
+    for index in range(size):
+        if flags[index] == _MATED:
+            buckets[0].append(index)
+        elif flags[index] == _NORMAL:
+            if capture_wins[index]:
+                _add(buckets, capture_wins[index], index)
+            elif counts[index] == 0 and not capture_draws[index]:
+                _add(buckets, capture_losses[index], index)  # every move is a capture into a lost position
+    plies = 0
+    while plies < len(buckets):
+        for index in buckets[plies]:
+            if values[index]:
+                continue
+            values[index] = plies + 1
+            won = plies % 2 == 1
+            for predecessor in predecessors[starts[index]:starts[index + 1]]:
+                if values[predecessor]:
+                    continue
+                if not won:
+                    _add(buckets, plies + 1, predecessor)  # the predecessor can move into this lost position
+                    continue
+                counts[predecessor] -= 1
+                worst_loss[predecessor] = max(worst_loss[predecessor], plies + 1)
+                if counts[predecessor] == 0 and not capture_wins[predecessor] and not capture_draws[predecessor]:
+                    _add(buckets, worst_loss[predecessor], predecessor)  # every move leads to a won position
+        buckets[plies] = None
+        plies += 1
+    return Tablebase(material, values)
+
+
+def _add(buckets, plies, index):
+    """Private helper function; adds a position index to the bucket of the given distance, growing the buckets"""
+    while len(buckets) <= plies:
+        buckets.append([])
+    buckets[plies].append(index)
+
+
+def required_materials(name):
+    """
+    Given a material set, returns the names of it and every set reachable from it by captures, smallest first (the
+      order in which they can be solved)
+    """
+    found = {}
+    pending = [Material(name)]
+    while pending:
+        material = pending.pop()
+        if material.name() in found:
+            continue
+        found[material.name()] = material
+        for slot, code in enumerate(material.get_codes()):
+            if code & KIND_MASK != GENERAL:
+                pending.append(material.without(slot))
+    return sorted(found, key=lambda found_name: (len(found_name), found_name))
+
+
+def build_tablebases(name, directory=None, processes=1, progress=None):
+    """
+    Solves a material set and every set reachable from it by captures; returns a dict of their Tablebase objects by
+      name
+    :param directory: if given, each table is written there as <name>.jtb (an existing file is loaded instead of being
+        solved again)
+    :param progress: if given, a function called with (name, number of positions, seconds) after each set is solved
+    """
+    tables = {}
+    for required in required_materials(name):
+        path = None if directory is None else os.path.join(directory, required + TABLEBASE_SUFFIX)
+        if path is not None and os.path.exists(path):
+            tables[required] = Tablebase.load(path)
+            continue
+        start_time = time.perf_counter()
+        tables[required] = solve(required, tables, processes)
+        if path is not None:
+            tables[required].save(path)
+        if progress is not None:
+            progress(required, len(tables[required]), time.perf_counter() - start_time)
+    return tables
+
+
+class Tablebase:
+    """
+    Represents the solved positions of one material set: one value per position index (see decode_value())
+    The values are either an array in memory (as solved) or a memory mapped file (see load())
+    """
+
+    def __init__(self, material, values, width=2, data=None):
+        """
+        Initializes a tablebase of the given Material object
+        :param values: a sequence of values by position index, or bytes-like of width-byte little-endian values
+        """
+        self._material = material
+        self._values = values
+        self._width = width
+        self._data = data  # the mmap object holding the values, if loaded from a file
+
+    def __len__(self):
+        """Returns the number of position indices"""
+        return len(self._material)
+
+    def __getstate__(self):
+        """Used so that a loaded tablebase is sent to worker processes as its values, not its (unpicklable) mmap"""
+        if self._data is None:
+            return self.__dict__
+        return {'_material': self._material, '_values': self.get_values(), '_width': 2, '_data': None}
+
+    def get_material(self):
+        """Returns the Material object of this tablebase"""
+        return self._material
+
+    def get_value(self, index):
+        """Returns the stored value of the position index"""
+        if self._data is None:
+            return self._values[index]
+        if self._width == 1:
+            return self._data[HEADER.size + index]
+        offset = HEADER.size + index * 2
+        return self._data[offset] | self._data[offset + 1] << 8
+
+    def get_values(self):
+        """Returns an array of all the stored values"""
+        if self._data is None:
+            return array('H', self._values)
+        if self._width == 1:
+            return array('H', iter(self._data[HEADER.size:]))
+        values = array('H')
+        values.frombytes(self._data[HEADER.size:])
+        if sys.byteorder == 'big':
+            values.byteswap()  # the file is little-endian
+        return values
+
+    def probe(self, janggiBoard, color):
+        """
+        Given a JanggiBoard object holding this set's pieces and the color to move, returns (result, plies) for the
+          side to move (see decode_value()); None if the position is not covered (see Material.index_of())
+        """
+        index = self._material.index_of(janggiBoard.get_codes(), color == 'red')
+        return None if index is None else decode_value(self.get_value(index))
+
+    def save(self, path):
+        """
+        Writes the tablebase to a file: the header, then a value per position index, in one byte each if every value
+          fits (and two otherwise); the file is written under a temporary name and then renamed
+        """
+        values = self.get_values()
+        width = 1 if max(values, default=0) < 256 else 2
+        if width == 2 and sys.byteorder == 'big':
+            values.byteswap()  # the file is little-endian
+        with open(path + '.tmp', 'wb') as file:
+            file.write(HEADER.pack(TABLEBASE_MAGIC, self._material.name().encode(), width, len(values)))
+            file.write(array('B', values).tobytes() if width == 1 else values.tobytes())
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns the Tablebase object of a file written by save(); the file is memory mapped, not read into memory
+        Raises ValueError if the file is not a tablebase
+        """
+        with open(path, 'rb') as file:
+            size = os.fstat(file.fileno()).st_size
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size >= HEADER.size else b''
+        if len(data) < HEADER.size or data[:4] != TABLEBASE_MAGIC:
+            raise ValueError('Not a tablebase: {}'.format(path))
+        magic, name, width, count = HEADER.unpack_from(data)
+        material = Material(name.rstrip(b'\x00').decode())
+        if count != len(material) or len(data) != HEADER.size + count * width:
+            raise ValueError('Truncated tablebase: {}'.format(path))
+        return cls(material, None, width, data)
+
+
+class TablebaseSet:
+    """
+    Represents the tablebases available for probing, by material set; used by search (see JanggiSearch.Searcher) to
+      score any position whose material has a tablebase exactly, without searching it
+    """
+
+    def __init__(self, tables=None, directory=None):
+        """
+        Initializes the set from a dict of Tablebase objects by name (e.g. returned by build_tablebases()), and / or
+          every tablebase file in a directory (loaded through mmap)
+        """
+        self._tables = dict(tables or {})
+        if directory is not None:
+            for file_name in sorted(os.listdir(directory)):
+                if file_name.endswith(TABLEBASE_SUFFIX):
+                    table = Tablebase.load(os.path.join(directory, file_name))
+                    self._tables[table.get_material().name()] = table
+        self._max_pieces = max((len(name) for name in self._tables), default=0)
+
+    def __len__(self):
+        """Returns the number of tablebases in the set"""
+        return len(self._tables)
+
+    def get_max_pieces(self):
+        """Returns the number of pieces (generals included) of the largest material set in the set"""
+        return self._max_pieces
+
+    def probe(self, janggiBoard, color):
+        """
+        Given a JanggiBoard object and the color to move, returns (result, plies) for the side to move (see
+          decode_value()), or None if there is no tablebase for the material on the board or the tablebase does not
+          cover the position (see Material.index_of())
+        """
+        if len(janggiBoard.get_piece_indices('red')) + len(janggiBoard.get_piece_indices('blue')) > self._max_pieces:
+            return None
+        table = self._tables.get(material_of(janggiBoard))
+        return None if table is None else table.probe(janggiBoard, color)
+
+    def probe_game(self, game):
+        """Same as probe(), but given a JanggiGame object; returns None for a game that is already won"""
+        if game.get_game_state() != 'UNFINISHED':
+            return None
+        return self.probe(game._get_janggiBoard(), game.get_current_color())
+
+
+def main():
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Generate Janggi endgame tablebases by retrograde analysis')
+    parser.add_argument('material', help="material set, e.g. 'KRka' (upper case red, lower case blue)")
+    parser.add_argument('--directory', default='.', help='directory to write the .jtb files to')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    args = parser.parse_args()
+
+    def progress(name, positions, seconds):
+        print('{}: {} positions solved in {:.1f}s'.format(name, positions, seconds))
+    os.makedirs(args.directory, exist_ok=True)
+    tables = build_tablebases(args.material, args.directory, args.processes, progress)
+    values = tables[Material(args.material).name()].get_values()
+    results = [decode_value(value)[0] for value in values]
+    print('{}: {} won, {} lost, {} drawn or invalid; longest mate (plies): {}'.format(
+        Material(args.material).name(), results.count('WIN'), results.count('LOSS'), results.count('DRAW'),
+        max(values, default=0) - 1 if any(values) else 'none'))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
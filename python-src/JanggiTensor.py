@@ -0,0 +1,100 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: NumPy representation of Janggi positions; converts boards to dense int8 piece planes and evaluates
+#   large batches of positions at once with vectorized operations (requires numpy)
+
+import numpy as np
+from JanggiGame import EMPTY, SOLDIER, GENERAL, BLUE, KIND_MASK
+from JanggiSearch import PIECE_VALUES, PIECE_SQUARE_VALUES
+
+PLANES = 14  # one 10x9 plane per piece kind (soldier through general) and color; red's 7 planes first
+RANKS, FILES = 10, 9
+MOBILITY_WEIGHT = 2  # score per empty square orthogonally next to a piece, in evaluate_batch()
+CHUNK_SIZE = 1 << 16  # positions evaluated per step in evaluate_batch(), to bound the size of temporary arrays
+
+# the piece code held by each plane, in plane order
+PLANE_CODES = np.array([color_bit | kind for color_bit in (0, BLUE) for kind in range(SOLDIER, GENERAL + 1)],
+                       dtype=np.uint8)
+
+# signed lookup tables by piece code (red's pieces positive, blue's negative)
+_SIGNS = np.array([0 if code & KIND_MASK == EMPTY else (-1 if code & BLUE else 1) for code in range(16)],
+                  dtype=np.int32)
+MATERIAL_VALUES = np.array([PIECE_VALUES.get(code & KIND_MASK, 0) for code in range(16)], dtype=np.int32) * _SIGNS
+PIECE_SQUARE_TABLE = np.array(PIECE_SQUARE_VALUES, dtype=np.int32) * _SIGNS[:, None]
+_SQUARE_RANGE = np.arange(RANKS * FILES)
+
+
+def codes_batch(boards):
+    """
+    Given an iterable of JanggiBoard objects, or of 90-byte piece code sequences (e.g. the bytes returned by
+      get_codes()), returns an (N, 90) uint8 array of the piece codes, one row per position
+    """
+    data = b''.join(bytes(board.get_codes()) if hasattr(board, 'get_codes') else bytes(board) for board in boards)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, RANKS * FILES)
+
+
+def board_to_planes(janggiBoard):
+    """
+    Given a JanggiBoard object, returns a (14, 10, 9) int8 array; plane p is 1 on every square (row number - 1,
+      file) holding a piece with code PLANE_CODES[p], and 0 elsewhere
+    """
+    return planes_batch(codes_batch([janggiBoard]))[0]
+
+
+def planes_batch(codes):
+    """Given an (N, 90) array of piece codes, returns the (N, 14, 10, 9) int8 array of piece planes"""
+    boards = np.asarray(codes, dtype=np.uint8).reshape(-1, 1, RANKS, FILES)
+    return (boards == PLANE_CODES[None, :, None, None]).astype(np.int8)
+
+
+def planes_to_codes(planes):
+    """Given an (N, 14, 10, 9) array of piece planes, returns the (N, 90) uint8 array of piece codes"""
+    planes = np.asarray(planes).reshape(-1, PLANES, RANKS * FILES)
+    return np.einsum('npq,p->nq', planes.astype(np.uint8), PLANE_CODES).astype(np.uint8)
+
+
+def material_batch(codes):
+    """Given an (N, 90) array of piece codes, returns an (N,) int32 array of red's material minus blue's"""
+    return MATERIAL_VALUES[np.asarray(codes)].sum(axis=1, dtype=np.int32)
+
+
+def piece_square_batch(codes):
+    """
+    Given an (N, 90) array of piece codes, returns an (N,) int32 array of the material plus piece-square score from
+      red's point of view; the same score as JanggiSearch.evaluate(board, 'red')
+    """
+    return PIECE_SQUARE_TABLE[np.asarray(codes), _SQUARE_RANGE].sum(axis=1, dtype=np.int32)
+
+
+def mobility_batch(codes):
+    """
+    Given an (N, 90) array of piece codes, returns an (N,) int32 array of a mobility proxy: the number of empty
+      squares orthogonally next to red's pieces minus the number next to blue's (a square is counted once per
+      piece next to it)
+    """
+    boards = np.asarray(codes).reshape(-1, RANKS, FILES)
+    empty = np.zeros((boards.shape[0], RANKS + 2, FILES + 2), dtype=np.int8)
+    empty[:, 1:-1, 1:-1] = boards == EMPTY
+    free = (empty[:, :-2, 1:-1] + empty[:, 2:, 1:-1] + empty[:, 1:-1, :-2] + empty[:, 1:-1, 2:]).astype(np.int32)
+    sides = _SIGNS[boards]
+    return (free * sides).sum(axis=(1, 2), dtype=np.int32)
+
+
+def evaluate_batch(codes, red_to_move=None, mobility_weight=MOBILITY_WEIGHT):
+    """
+    Given an (N, 90) array of piece codes, returns an (N,) int32 array of scores: material plus piece-square score
+      plus mobility_weight times the mobility proxy
+    :param red_to_move: if None, scores are from red's point of view; otherwise an (N,) boolean array, and each score
+        is from the point of view of the side to move (negated where blue is to move), as in JanggiSearch.evaluate()
+    Positions are processed CHUNK_SIZE at a time, so memory use stays bounded for millions of positions
+    """
+    codes = np.asarray(codes, dtype=np.uint8).reshape(-1, RANKS * FILES)
+    scores = np.empty(codes.shape[0], dtype=np.int32)
+    for first in range(0, codes.shape[0], CHUNK_SIZE):
+        chunk = codes[first:first + CHUNK_SIZE]
+        scores[first:first + CHUNK_SIZE] = piece_square_batch(chunk)
+        if mobility_weight:
+            scores[first:first + CHUNK_SIZE] += mobility_weight * mobility_batch(chunk)
+    if red_to_move is not None:
+        scores = np.where(np.asarray(red_to_move, dtype=bool), scores, -scores)
+    return scores
@@ -0,0 +1,88 @@
+import json
+import os
+import tempfile
+import unittest
+from JanggiGame import SQUARE_INDEX
+from JanggiArchive import ArchiveWriter, ArchiveReader, import_records, encode_move, decode_move, INDEX_SUFFIX
+from JanggiPerft import POSITIONS, game_from_moves
+from JanggiSelfPlay import play_game
+
+
+class TestArchive(unittest.TestCase):
+    """
+    Test cases for the memory mapped game archive
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testEncodeMove(self):
+        self.assertEqual(decode_move(encode_move('e7', 'e6')), (SQUARE_INDEX['e7'], SQUARE_INDEX['e6']))
+        self.assertEqual(decode_move(encode_move(89, 0)), (89, 0))
+        self.assertLess(encode_move('i10', 'i10'), 1 << 16)
+
+    def testAppendAndRead(self):
+        moves = POSITIONS['middlegame'][0]
+        with ArchiveWriter(self.path) as writer:
+            self.assertEqual(writer.append(moves), 0)
+            self.assertEqual(writer.append([], 'RED_WON'), 1)
+            self.assertEqual(writer.append([(58, 49)], 'BLUE_WON'), 2)
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), 3)
+            expected = [(SQUARE_INDEX[start], SQUARE_INDEX[end]) for start, end in moves]
+            self.assertEqual(reader.get_moves(0), expected)
+            self.assertEqual(reader.get_moves(0, 3, 5), expected[3:5])
+            self.assertEqual(reader.get_move(0, 4), expected[4])
+            self.assertEqual(reader.get_length(0), len(moves))
+            self.assertEqual([reader.get_result(game_id) for game_id in range(3)],
+                             ['UNFINISHED', 'RED_WON', 'BLUE_WON'])
+            self.assertEqual(reader.get_moves(1), [])
+            self.assertRaises(IndexError, reader.get_moves, 3)
+            self.assertRaises(IndexError, reader.get_move, 2, 1)
+            game = reader.get_game(0, 6)
+            self.assertEqual(game.get_zobrist_key(), game_from_moves(moves[:6]).get_zobrist_key())
+            self.assertEqual(reader.get_game(0).get_zobrist_key(), game_from_moves(moves).get_zobrist_key())
+
+    def testAppendToExisting(self):
+        with ArchiveWriter(self.path) as writer:
+            writer.append([(58, 49)])
+        with ArchiveWriter(self.path) as writer:
+            self.assertEqual(len(writer), 1)
+            self.assertEqual(writer.append([(56, 47), (27, 36)]), 1)
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual([moves for game_id, moves, result in reader.iter_games()],
+                             [[(58, 49)], [(56, 47), (27, 36)]])
+
+    def testEmptyArchive(self):
+        ArchiveWriter(self.path).close()
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), 0)
+            self.assertEqual(list(reader.iter_games()), [])
+
+    def testIgnoresPartialIndexEntry(self):
+        with ArchiveWriter(self.path) as writer:
+            writer.append([(58, 49)])
+        with open(self.path + INDEX_SUFFIX, 'ab') as index:
+            index.write(b'\x00' * 5)  # as if a writer stopped part-way through an entry
+        with ArchiveReader(self.path) as reader:
+            self.assertEqual(len(reader), 1)
+
+    def testImportRecords(self):
+        records_path = os.path.join(self.directory.name, 'games.jsonl')
+        records = [play_game(game_id, game_id, 'random', 'random', max_plies=50) for game_id in range(4)]
+        with open(records_path, 'w') as records_file:
+            for record in records:
+                records_file.write(json.dumps(record) + '\n')
+        self.assertEqual(import_records(records_path, self.path), 4)
+        with ArchiveReader(self.path) as reader:
+            for game_id, record in enumerate(records):
+                self.assertEqual(reader.get_length(game_id), record['plies'])
+                self.assertEqual(reader.get_result(game_id), record['result'])
+                self.assertEqual(reader.get_game(game_id).get_game_state(), record['result'])
+
+
+if __name__ == '__main__':
+    unittest.main()
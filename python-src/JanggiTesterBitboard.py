@@ -0,0 +1,89 @@
+import random
+import unittest
+import JanggiTesterMovements
+from JanggiGame import JanggiGame, JanggiBoard, Chariot, Cannon, Soldier, BLUE, RED
+from JanggiBitboard import BitboardBoard, bit_indices
+from JanggiPerft import POSITIONS, game_from_moves, perft
+
+
+class TestBitboardPieceMovements(JanggiTesterMovements.TestPieceMovements):
+    """
+    Runs all of the piece movement test cases again on a BitboardBoard
+    """
+    def setUp(self):
+        self.janggiBoard = BitboardBoard()
+        self.board = self.janggiBoard.get_board()
+
+
+class TestBitboardBoard(unittest.TestCase):
+    """
+    Test cases for the bitboard backend
+    """
+    def assertBitboardsMatch(self, janggiBoard):
+        codes = janggiBoard.get_codes()
+        for code in range(16):
+            if code & 7:
+                self.assertEqual(bit_indices(janggiBoard.get_bitboard(code)),
+                                 [index for index in range(90) if codes[index] == code])
+        self.assertEqual(bit_indices(janggiBoard.get_occupied()), [index for index in range(90) if codes[index]])
+        self.assertEqual(bit_indices(janggiBoard.get_occupied('blue')),
+                         [index for index in range(90) if codes[index] & BLUE])
+
+    def testBitIndices(self):
+        self.assertEqual(bit_indices(0), [])
+        self.assertEqual(bit_indices(1 | 1 << 40 | 1 << 89), [0, 40, 89])
+
+    def testGame(self):
+        game = JanggiGame(board_class=BitboardBoard)
+        janggiBoard = game._get_janggiBoard()
+        self.assertIsInstance(janggiBoard, BitboardBoard)
+        self.assertBitboardsMatch(janggiBoard)
+        rng = random.Random(14)
+        for _ in range(80):
+            if game.get_game_state() != 'UNFINISHED':
+                break
+            self.assertTrue(game.make_move(*rng.choice(game.legal_moves())))
+            self.assertBitboardsMatch(janggiBoard)
+        copy_board = janggiBoard.copy()
+        self.assertIsInstance(copy_board, BitboardBoard)
+        self.assertBitboardsMatch(copy_board)
+        while janggiBoard.get_history():
+            janggiBoard.pop()
+            self.assertBitboardsMatch(janggiBoard)
+        self.assertEqual(janggiBoard.get_codes(), JanggiGame()._get_janggiBoard().get_codes())
+
+    def testPerft(self):
+        for name, (moves, counts) in POSITIONS.items():
+            game = game_from_moves(moves)
+            janggiBoard = BitboardBoard.from_codes(game._get_janggiBoard().get_codes())
+            self.assertEqual(perft(janggiBoard, game.get_current_color(), 2), counts[1], name)
+        self.assertEqual(perft(BitboardBoard.from_codes(JanggiGame()._get_janggiBoard().get_codes()), 'blue', 3),
+                         POSITIONS['start'][1][2])
+
+    def testMatchesJanggiBoard(self):
+        rng = random.Random(2021)
+        pieces = [Chariot, Cannon, Soldier]
+        for _ in range(200):
+            placement = JanggiBoard.empty()
+            for square in rng.sample(sorted(placement), 14):
+                placement[square] = rng.choice(pieces)(rng.choice(('red', 'blue')))
+            janggiBoard, bitboardBoard = JanggiBoard(placement), BitboardBoard(placement)
+            for index in range(90):
+                for color_bit in (RED, BLUE):
+                    self.assertEqual(sorted(janggiBoard.chariot_ends(index, color_bit)),
+                                     bitboardBoard.chariot_ends(index, color_bit))
+                    self.assertEqual(sorted(janggiBoard.cannon_ends(index, color_bit)),
+                                     bitboardBoard.cannon_ends(index, color_bit))
+                    self.assertEqual(sorted(janggiBoard.chariot_captures(index, color_bit)),
+                                     bitboardBoard.chariot_captures(index, color_bit))
+                    self.assertEqual(sorted(janggiBoard.cannon_captures(index, color_bit)),
+                                     bitboardBoard.cannon_captures(index, color_bit))
+                for color in ('red', 'blue'):
+                    if janggiBoard.get_codes()[index] == 0 or \
+                            (janggiBoard.get_codes()[index] & BLUE == BLUE) != (color == 'blue'):
+                        self.assertEqual(janggiBoard.is_attacked(index, color),
+                                         bitboardBoard.is_attacked(index, color), (index, color))
+
+
+if __name__ == '__main__':
+    unittest.main()
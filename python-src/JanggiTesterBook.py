@@ -0,0 +1,83 @@
+import os
+import random
+import tempfile
+import unittest
+from JanggiGame import JanggiGame, SQUARE_INDEX
+from JanggiArchive import ArchiveWriter
+from JanggiPerft import parse_move
+from JanggiReplay import read_archive
+from JanggiSelfPlay import play_game
+from JanggiBook import build_book, BookReader, HEADER, ENTRY
+
+
+class TestOpeningBook(unittest.TestCase):
+    """
+    Test cases for building and probing the opening book
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'book.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testWeights(self):
+        logs = [(1, ['e7e6', 'e4e5']), (2, ['e7e6', 'c4c5']), (3, ['e7e6', 'e4e5', 'e6e5']), (4, ['a7a6'])]
+        self.assertEqual(build_book(logs, self.path), 5)
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 5 * ENTRY.size)
+        game = JanggiGame()
+        with BookReader(self.path) as book:
+            self.assertEqual(len(book), 5)
+            self.assertEqual(book.get_moves(game), [(('e7', 'e6'), 3), (('a7', 'a6'), 1)])
+            self.assertEqual(book.probe(game.get_zobrist_key())[0], (SQUARE_INDEX['e7'], SQUARE_INDEX['e6'], 3))
+            game.make_move('e7', 'e6')
+            self.assertEqual(book.get_moves(game), [(('e4', 'e5'), 2), (('c4', 'c5'), 1)])
+            game.make_move('c4', 'c5')
+            self.assertEqual(book.get_moves(game), [])
+            self.assertIsNone(book.choose_move(game))
+
+    def testMaxPliesAndMinCount(self):
+        logs = [(1, ['e7e6', 'e4e5', 'e6e5']), (2, ['e7e6', 'e4e5', 'a7a6']), (3, ['c7c6', 'e6e7'])]
+        self.assertEqual(build_book(logs, self.path, max_plies=2, min_count=2), 2)
+        with BookReader(self.path) as book:
+            game = JanggiGame()
+            self.assertEqual(book.choose_move(game), ('e7', 'e6'))
+            game.make_move('e7', 'e6')
+            self.assertEqual(book.choose_move(game), ('e4', 'e5'))
+            game.make_move('e4', 'e5')
+            self.assertEqual(book.get_moves(game), [])  # the third moves are past max_plies
+
+    def testSelfPlayArchive(self):
+        archive = os.path.join(self.directory.name, 'games')
+        records = [play_game(seed, seed, 'random', 'random', max_plies=30) for seed in range(20)]
+        with ArchiveWriter(archive) as writer:
+            for record in records:
+                writer.append(parse_move(move) for move in record['moves'])
+        build_book(read_archive(archive), self.path, max_plies=8)
+        rng = random.Random(7)
+        with BookReader(self.path) as book:
+            # every book move from every position reached in the records' openings is legal, and each game's
+            #   moves are in the book
+            for record in records:
+                game = JanggiGame()
+                for move in map(parse_move, record['moves'][:8]):
+                    book_moves = book.get_moves(game)
+                    self.assertIn(move, [book_move for book_move, weight in book_moves])
+                    self.assertEqual(len(book_moves), len(book.probe(game.get_zobrist_key())))
+                    self.assertIn(book.choose_move(game, rng), [book_move for book_move, weight in book_moves])
+                    game.make_move(*move)
+
+    def testInvalidBook(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a book')
+        with self.assertRaises(ValueError):
+            BookReader(self.path)
+        build_book([(1, ['e7e6'])], self.path)
+        with open(self.path, 'ab') as file:
+            file.write(b'\x00')
+        with self.assertRaises(ValueError):
+            BookReader(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
+import random
 import unittest
 from JanggiGame import JanggiGame, JanggiBoard, Piece, Soldier, Cannon, Chariot, Horse, Elephant, Guard, General
+from JanggiGame import SQUARES, SQUARE_INDEX, EMPTY, CANNON, HORSE, GENERAL, RED, BLUE, ZOBRIST_RED_TO_MOVE
+from JanggiGame import SHARED_PIECES
 
 
 class TestPieceMethods(unittest.TestCase):
@@ -43,6 +46,206 @@ class TestBoardMethods(unittest.TestCase):
         self.board['f4'] = blueHorse
         self.assertTrue(self.janggiBoard.is_in_check('red'))
 
+    def testIsAttacked(self):
+        attacked = self.janggiBoard.is_attacked
+        self.assertTrue(attacked(SQUARE_INDEX['a3'], 'red'))    # chariot along the file
+        self.assertFalse(attacked(SQUARE_INDEX['a6'], 'red'))   # blocked by the red soldier on a4
+        self.assertTrue(attacked(SQUARE_INDEX['a8'], 'blue'))   # from the blue chariot on a10
+        self.assertTrue(attacked(SQUARE_INDEX['g3'], 'red'))    # horse from h1, over the empty leg on h2
+        self.board['h2'] = Soldier('blue')
+        self.assertFalse(attacked(SQUARE_INDEX['g3'], 'red'))   # leg is now blocked
+        self.assertTrue(attacked(SQUARE_INDEX['f3'], 'red'))    # guard / general inside the palace
+        self.assertFalse(attacked(SQUARE_INDEX['e6'], 'red'))
+        self.board['b4'] = Soldier('red')                       # gives the b3 cannon a screen up the b-file
+        self.assertTrue(attacked(SQUARE_INDEX['b6'], 'red'))
+        self.assertFalse(attacked(SQUARE_INDEX['b8'], 'red'))   # a cannon can not capture a cannon
+        self.board['e4'] = None
+        self.board['e3'] = Chariot('blue')                      # chariot on the palace edge, not the diagonal
+        self.assertTrue(attacked(SQUARE_INDEX['e2'], 'blue'))
+        self.board['e3'] = None
+        self.board['f3'] = Chariot('blue')                      # chariot along the palace diagonal
+        self.assertTrue(attacked(SQUARE_INDEX['e2'], 'blue'))
+        self.assertTrue(self.janggiBoard.is_in_check('red'))
+
+    def testIsAttackedMatchesValidIndices(self):
+        self.board['e4'] = Cannon('blue')
+        self.board['d3'] = Soldier('blue')
+        self.board['c4'] = None
+        for color in ('red', 'blue'):
+            reach = set()
+            for index in self.janggiBoard.get_piece_indices(color):
+                reach.update(self.janggiBoard.get_pieces()[index].valid_indices(index, self.janggiBoard))
+            for target, piece in enumerate(self.janggiBoard.get_pieces()):
+                if piece is None or piece.get_color() != color:
+                    self.assertEqual(self.janggiBoard.is_attacked(target, color), target in reach, SQUARES[target])
+
+
+class TestBoardRepresentation(unittest.TestCase):
+    """
+    Test cases for the array-backed board and its algebraic-notation view
+    """
+    def setUp(self):
+        self.janggiBoard = JanggiGame()._get_janggiBoard()
+        self.board = self.janggiBoard.get_board()
+
+    def testSquareIndex(self):
+        self.assertEqual(SQUARES[0], 'a1')
+        self.assertEqual(SQUARES[89], 'i10')
+        self.assertEqual(SQUARE_INDEX['e2'], 13)
+
+    def testCodes(self):
+        codes = self.janggiBoard.get_codes()
+        self.assertEqual(codes[SQUARE_INDEX['e2']], GENERAL | RED)
+        self.assertEqual(codes[SQUARE_INDEX['b8']], CANNON | BLUE)
+        self.assertEqual(codes[SQUARE_INDEX['e5']], EMPTY)
+
+    def testViewWritesThrough(self):
+        horse = self.board['c10']
+        self.board['c10'] = None
+        self.board['f4'] = horse
+        self.assertIs(self.janggiBoard.get_pieces()[SQUARE_INDEX['f4']], horse)
+        self.assertEqual(self.janggiBoard.get_codes()[SQUARE_INDEX['c10']], EMPTY)
+        self.assertEqual(self.janggiBoard.get_codes()[SQUARE_INDEX['f4']], HORSE | BLUE)
+        self.assertEqual(len(self.board), 90)
+        self.assertTrue('i10' in self.board)
+        self.assertFalse('j1' in self.board)
+
+    def testCopy(self):
+        copyJanggiBoard = self.janggiBoard.copy()
+        copyJanggiBoard.get_board()['e7'] = None
+        self.assertIsNone(copyJanggiBoard.get_board()['e7'])
+        self.assertIsNotNone(self.board['e7'])
+        self.assertEqual(JanggiBoard(self.board.copy()).get_codes(), self.janggiBoard.get_codes())
+
+    def testPushPop(self):
+        codes = self.janggiBoard.get_codes()[:]
+        redChariot = self.board['a1']
+        blueSoldier = self.board['a7']
+        self.assertIsNone(self.janggiBoard.push_move('a1', 'a3'))
+        self.assertIs(self.janggiBoard.push_move('a3', 'a7'), blueSoldier)
+        self.assertIs(self.board['a7'], redChariot)
+        self.assertIsNone(self.janggiBoard.push_move('e9', 'e9'))  # a pass is recorded but changes nothing
+        self.assertEqual(len(self.janggiBoard.get_history()), 3)
+        self.assertEqual(self.janggiBoard.pop_move(), ('e9', 'e9', self.board['e9'], None))
+        self.assertEqual(self.janggiBoard.pop_move(), ('a3', 'a7', redChariot, blueSoldier))
+        self.janggiBoard.pop()
+        self.assertIs(self.board['a7'], blueSoldier)
+        self.assertIs(self.board['a1'], redChariot)
+        self.assertEqual(self.janggiBoard.get_codes(), codes)
+        self.assertEqual(self.janggiBoard.get_history(), [])
+
+    def testPieceIndices(self):
+        self.assertEqual(len(self.janggiBoard.get_piece_indices('red')), 16)
+        self.assertEqual(self.janggiBoard.get_general_index('blue'), SQUARE_INDEX['e9'])
+        self.janggiBoard.push_move('e9', 'e8')
+        self.janggiBoard.push_move('a1', 'a7')
+        self.assertEqual(self.janggiBoard.get_general_square('blue'), 'e8')
+        self.assertEqual(len(self.janggiBoard.get_piece_indices('blue')), 15)
+        self.assertIn(SQUARE_INDEX['a7'], self.janggiBoard.get_piece_indices('red'))
+        self.janggiBoard.pop()
+        self.janggiBoard.pop()
+        self.assertEqual(self.janggiBoard.get_general_square('blue'), 'e9')
+        self.assertIn(SQUARE_INDEX['a7'], self.janggiBoard.get_piece_indices('blue'))
+        self.board['e2'] = None
+        self.board['f1'] = General('red')
+        self.assertEqual(self.janggiBoard.get_general_square('red'), 'f1')
+        for color in ('red', 'blue'):
+            self.assertEqual(self.janggiBoard.get_piece_indices(color),
+                             {SQUARE_INDEX[square] for square, piece in self.board.items()
+                              if piece is not None and piece.get_color() == color})
+
+    def testLostPieces(self):
+        game = JanggiGame()
+        redSoldier = game._get_janggiBoard().get_board()['e4']
+        for start, end in (('e7', 'e6'), ('e4', 'e5'), ('e6', 'e5')):
+            self.assertTrue(game.make_move(start, end))
+        self.assertEqual(game.get_lost_pieces('red'), [redSoldier])
+        self.assertEqual(game.get_lost_pieces('blue'), [])
+
+    def testInvalidMoveLeavesNoHistory(self):
+        game = JanggiGame()
+        self.assertFalse(game.make_move('e7', 'e5'))
+        self.assertTrue(game.make_move('e7', 'e6'))
+        self.assertEqual(game._get_janggiBoard().get_history(), [(SQUARE_INDEX['e7'], SQUARE_INDEX['e6'],
+                                                                 game._get_janggiBoard().get_board()['e6'], None)])
+
+
+class TestSharedPieces(unittest.TestCase):
+    """
+    Test cases for pieces with __slots__ and the shared (flyweight) pieces
+    """
+    def testSlots(self):
+        piece = Soldier('red')
+        self.assertFalse(hasattr(piece, '__dict__'))
+        with self.assertRaises(AttributeError):
+            piece.extra = True
+
+    def testSharedBoards(self):
+        game, other = JanggiGame(shared_pieces=True), JanggiGame(shared_pieces=True)
+        pieces = game._get_janggiBoard().get_pieces()
+        self.assertTrue(all(piece is None or piece.is_shared() for piece in pieces))
+        self.assertIs(pieces[SQUARE_INDEX['e2']], other._get_janggiBoard().get_pieces()[SQUARE_INDEX['e2']])
+        self.assertIs(pieces[SQUARE_INDEX['a1']], SHARED_PIECES[Chariot('red').get_code()])
+        self.assertFalse(JanggiGame()._get_janggiBoard().get_pieces()[SQUARE_INDEX['a1']].is_shared())
+
+    def testSharedPiecesPlayTheSame(self):
+        moves = (('e7', 'e6'), ('e4', 'e5'), ('e6', 'e5'), ('g1', 'e4'), ('e5', 'e4'), ('e2', 'f3'), ('e4', 'e3'))
+        game, shared = JanggiGame(), JanggiGame(shared_pieces=True)
+        for start, end in moves:
+            self.assertTrue(game.make_move(start, end))
+            self.assertTrue(shared.make_move(start, end))
+            self.assertEqual(shared.get_zobrist_key(), game.get_zobrist_key())
+        self.assertEqual(sorted(shared.legal_moves()), sorted(game.legal_moves()))
+        self.assertTrue(shared.is_in_check('red'))
+        # captures are tracked by the game's undo stack, not by the shared pieces
+        self.assertEqual([piece.get_code() for piece in shared.get_lost_pieces('red')],
+                         [piece.get_code() for piece in game.get_lost_pieces('red')])
+        self.assertFalse(any(piece.get_is_captured() for piece in shared.get_lost_pieces('red')))
+        with self.assertRaises(TypeError):
+            shared.get_lost_pieces('red')[0].set_is_captured(True)
+
+    def testFromCodes(self):
+        codes = JanggiGame()._get_janggiBoard().get_codes()
+        janggiBoard = JanggiBoard.from_codes(codes, shared_pieces=True)
+        self.assertEqual(janggiBoard.get_codes(), codes)
+        self.assertTrue(all(piece is None or piece.is_shared() for piece in janggiBoard.get_pieces()))
+
+
+class TestZobrist(unittest.TestCase):
+    """
+    Test cases for the incrementally updated Zobrist keys
+    """
+    def setUp(self):
+        self.game = JanggiGame()
+        self.janggiBoard = self.game._get_janggiBoard()
+
+    def testIncremental(self):
+        for start, end in (('e7', 'e6'), ('e4', 'e5'), ('e6', 'e5'), ('g1', 'e4'), ('e5', 'e4'), ('e2', 'e2')):
+            self.assertTrue(self.game.make_move(start, end))
+            self.assertEqual(self.game.get_zobrist_key(),
+                             self.janggiBoard.compute_zobrist_key(self.game.get_current_color()))
+        key = self.janggiBoard.get_zobrist_key('blue')
+        self.janggiBoard.push_move('e4', 'e2')
+        self.assertNotEqual(self.janggiBoard.get_zobrist_key('blue'), key)
+        self.janggiBoard.pop()
+        self.assertEqual(self.janggiBoard.get_zobrist_key('blue'), key)
+        self.janggiBoard.get_board()['a1'] = None
+        self.assertEqual(self.janggiBoard.get_zobrist_key('blue'), self.janggiBoard.compute_zobrist_key('blue'))
+
+    def testTranspositions(self):
+        other = JanggiGame()
+        for start, end in (('e7', 'e6'), ('c4', 'c5'), ('a7', 'a6')):
+            self.game.make_move(start, end)
+        for start, end in (('a7', 'a6'), ('c4', 'c5'), ('e7', 'e6')):
+            other.make_move(start, end)
+        self.assertEqual(self.game.get_zobrist_key(), other.get_zobrist_key())
+        self.assertNotEqual(self.janggiBoard.get_zobrist_key('red'), self.janggiBoard.get_zobrist_key('blue'))
+
+    def testPassChangesSideToMove(self):
+        key = self.game.get_zobrist_key()
+        self.game.make_move('e9', 'e9')
+        self.assertEqual(self.game.get_zobrist_key(), key ^ ZOBRIST_RED_TO_MOVE)
+
 
 class TestMakeMovesInCheck(unittest.TestCase):
     """
@@ -84,6 +287,67 @@ class TestMakeMovesInCheck(unittest.TestCase):
         # CAN capture the attacking piece if it would get out of check
         self.assertTrue(self.janggiGame.make_move('f10', 'f9'))
 
+    def testLegalMoves(self):
+        # no pass while in check; the general steps away or takes the chariot, or the guard takes it
+        self.assertEqual(sorted(self.janggiGame.legal_moves()), [('e9', 'e10'), ('e9', 'f9'), ('f10', 'f9')])
+        self.assertEqual(self.janggiGame.legal_moves_from('a7'), [])
+        self.assertEqual(self.janggiGame.legal_moves_from('f10'), ['f9'])
+
+
+class TestLegalMoves(unittest.TestCase):
+    """
+    Test cases for the legal move generation
+    """
+    def setUp(self):
+        self.game = JanggiGame()
+
+    def testStartPosition(self):
+        moves = self.game.legal_moves()
+        self.assertEqual(len(moves), 32)
+        self.assertEqual(moves[0], ('e9', 'e9'))  # the pass is listed once
+        self.assertEqual(len([move for move in moves if move[0] == move[1]]), 1)
+        self.assertEqual(self.game.legal_moves_from('c10'), ['c10', 'd8'])
+        self.assertEqual(self.game.legal_moves_from('e4'), [])   # not blue's piece
+        self.assertEqual(self.game.legal_moves_from('e5'), [])   # empty square
+        self.assertEqual(self.game.legal_moves_from('z1'), [])   # not on the board
+
+    def testMovesAreAccepted(self):
+        board = self.game._get_janggiBoard().get_board()
+        board['e4'] = None
+        board['e5'] = Chariot('red')  # pins the blue soldier on e7 to its general
+        moves = self.game.legal_moves()
+        self.assertIn(('e7', 'e6'), moves)
+        for start, end in moves:
+            game = JanggiGame()
+            game._get_janggiBoard().get_board().update(board.copy())
+            self.assertTrue(game.make_move(start, end), (start, end))
+        for start, end in (('e7', 'd7'), ('e7', 'f7')):
+            self.assertNotIn((start, end), moves)
+            self.assertFalse(self.game.make_move(start, end))
+
+    def testGameOver(self):
+        self.game._game_state = 'BLUE_WON'
+        self.assertEqual(self.game.legal_moves(), [])
+        self.assertEqual(self.game.legal_moves_from('e9'), [])
+
+    def testCaptures(self):
+        rng = random.Random(25)
+        for _ in range(3):
+            game = JanggiGame()
+            janggiBoard = game._get_janggiBoard()
+            while game.get_game_state() == 'UNFINISHED' and len(janggiBoard.get_history()) < 120:
+                color, codes = game.get_current_color(), janggiBoard.get_codes()
+                moves = list(janggiBoard.generate_legal_moves(color))
+                captures = [(start, end) for start, end in moves if start != end and codes[end]]
+                self.assertEqual(sorted(janggiBoard.generate_legal_captures(color)), sorted(captures))
+                for index in janggiBoard.get_piece_indices(color):
+                    piece = janggiBoard.get_pieces()[index]
+                    self.assertEqual(sorted(piece.capture_indices(index, janggiBoard)),
+                                     sorted(end for end in piece.valid_indices(index, janggiBoard)
+                                            if end != index and codes[end]))
+                start, end = rng.choice(captures if captures and rng.random() < 0.5 else moves)
+                self.assertTrue(game.make_move(SQUARES[start], SQUARES[end]))
+
 
 class TestTurnTaking(unittest.TestCase):
     """
@@ -1,5 +1,6 @@
 import unittest
 from JanggiGame import JanggiGame, JanggiBoard, Piece, Soldier, Cannon, Chariot, Horse, Elephant, Guard, General
+from JanggiGame import SQUARES, SQUARE_INDEX, LINES, HORSE_MOVES, ELEPHANT_MOVES, SOLDIER_MOVES, PALACE_MOVES, RED, BLUE
 
 
 class TestPieceMovements(unittest.TestCase):
@@ -337,5 +338,44 @@ class TestPieceMovements(unittest.TestCase):
         self.assertEqual(moves_1, moves_2)
 
 
+class TestMoveTables(unittest.TestCase):
+    """
+    Test cases for the precomputed per-square move tables that the valid_indices() methods walk
+    """
+    @staticmethod
+    def squares(indices):
+        return [SQUARES[index] for index in indices]
+
+    def testLines(self):
+        lines = [self.squares(line) for line in LINES[SQUARE_INDEX['d8']]]
+        self.assertEqual(lines[0], ['d7', 'd6', 'd5', 'd4', 'd3', 'd2', 'd1'])
+        self.assertEqual(lines[-1], ['e9', 'f10'])
+        self.assertEqual([self.squares(line) for line in LINES[SQUARE_INDEX['e2']]][-4:],
+                         [['d1'], ['f1'], ['d3'], ['f3']])
+        self.assertEqual(len(LINES[SQUARE_INDEX['a1']]), 2)
+
+    def testHorseElephant(self):
+        self.assertEqual([self.squares(move) for move in HORSE_MOVES[SQUARE_INDEX['a1']]],
+                         [['b1', 'c2'], ['a2', 'b3']])
+        self.assertEqual([self.squares(move) for move in ELEPHANT_MOVES[SQUARE_INDEX['a1']]],
+                         [['b1', 'c2', 'd3'], ['a2', 'b3', 'c4']])
+        self.assertEqual(len(HORSE_MOVES[SQUARE_INDEX['e5']]), 8)
+        self.assertEqual(len(ELEPHANT_MOVES[SQUARE_INDEX['e5']]), 8)
+
+    def testSoldierPalace(self):
+        self.assertEqual(self.squares(SOLDIER_MOVES[BLUE][SQUARE_INDEX['d3']]), ['e3', 'c3', 'd2', 'e2'])
+        self.assertEqual(self.squares(SOLDIER_MOVES[RED][SQUARE_INDEX['i10']]), ['h10'])
+        self.assertEqual(self.squares(PALACE_MOVES[RED][SQUARE_INDEX['d1']]), ['e1', 'd2', 'e2'])
+        self.assertEqual(self.squares(PALACE_MOVES[BLUE][SQUARE_INDEX['e9']]),
+                         ['e8', 'f9', 'e10', 'd9', 'd8', 'f8', 'd10', 'f10'])
+
+    def testValidIndicesMatchSquares(self):
+        janggiBoard = JanggiGame()._get_janggiBoard()
+        for square, piece in janggiBoard.get_board().items():
+            if piece is not None:
+                self.assertEqual(self.squares(piece.valid_indices(SQUARE_INDEX[square], janggiBoard)),
+                                 list(piece.valid_squares(square, janggiBoard)))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+import random
+import unittest
+from unittest import mock
+from JanggiGame import JanggiGame, JanggiBoard
+from JanggiBitboard import BitboardBoard
+from JanggiNotation import to_fen, from_fen, codes_from_fen, pack, unpack, unpack_codes, game_to_fen, game_from_fen
+from JanggiNotation import pack_game, unpack_game, START_FEN, PACKED_BYTES
+
+
+def random_games(count, plies=60):
+    """Generator; yields JanggiGame objects after random moves (including some finished games)"""
+    rng = random.Random(15)
+    for _ in range(count):
+        game = JanggiGame()
+        for _ in range(rng.randrange(plies)):
+            if game.get_game_state() != 'UNFINISHED':
+                break
+            game.make_move(*rng.choice(game.legal_moves()))
+        yield game
+
+
+class TestFen(unittest.TestCase):
+    """
+    Test cases for the FEN-style text notation
+    """
+    def testStartPosition(self):
+        game = JanggiGame()
+        self.assertEqual(game_to_fen(game), START_FEN)
+        self.assertEqual(game_from_fen(START_FEN)._get_janggiBoard().get_codes(), game._get_janggiBoard().get_codes())
+
+    def testAfterMove(self):
+        game = JanggiGame()
+        game.make_move('c7', 'c6')
+        self.assertEqual(game_to_fen(game), 'rbna1abnr/4k4/1c5c1/p3p1p1p/2p6/9/P1P1P1P1P/1C5C1/4K4/RBNA1ABNR r -')
+
+    def testRoundTrip(self):
+        for game in random_games(40):
+            text = game_to_fen(game)
+            copy_game = game_from_fen(text)
+            self.assertEqual(copy_game._get_janggiBoard().get_codes(), game._get_janggiBoard().get_codes())
+            self.assertEqual(copy_game.get_current_color(), game.get_current_color())
+            self.assertEqual(copy_game.get_game_state(), game.get_game_state())
+            self.assertEqual(copy_game.get_zobrist_key(), game.get_zobrist_key())
+            self.assertEqual(game_to_fen(copy_game), text)
+
+    def testDefaultsAndBoardClass(self):
+        janggiBoard, color, game_state = from_fen(START_FEN.split()[0], BitboardBoard)
+        self.assertIsInstance(janggiBoard, BitboardBoard)
+        self.assertEqual((color, game_state), ('blue', 'UNFINISHED'))
+        self.assertEqual(to_fen(janggiBoard, 'red', 'BLUE_WON'), START_FEN.split()[0] + ' r b')
+
+    def testInvalid(self):
+        for text in ('', '9/9/9', START_FEN.replace('4k4', '4k5'), START_FEN.replace('4k4', '4x4'),
+                     START_FEN.replace(' b -', ' w -'), START_FEN + ' 1', START_FEN.replace('4k4', '4kk4')):
+            self.assertRaises(ValueError, codes_from_fen, text)
+
+
+class TestPacked(unittest.TestCase):
+    """
+    Test cases for the packed binary format
+    """
+    def testSize(self):
+        self.assertEqual(len(pack_game(JanggiGame())), PACKED_BYTES)
+
+    def testRoundTrip(self):
+        for game in random_games(40):
+            data = pack_game(game)
+            self.assertEqual(len(data), PACKED_BYTES)
+            copy_game = unpack_game(data)
+            self.assertEqual(copy_game._get_janggiBoard().get_codes(), game._get_janggiBoard().get_codes())
+            self.assertEqual(copy_game.get_current_color(), game.get_current_color())
+            self.assertEqual(copy_game.get_game_state(), game.get_game_state())
+            self.assertEqual(pack_game(copy_game), data)
+
+    def testGameIsPlayable(self):
+        game = JanggiGame()
+        game.make_move('c7', 'c6')
+        copy_game = unpack_game(pack_game(game))
+        self.assertEqual(copy_game.get_current_color(), 'red')
+        self.assertTrue(copy_game.make_move('c4', 'c5'))
+        self.assertFalse(copy_game.make_move('c6', 'c7'))  # soldiers can not move backward
+        self.assertEqual(sorted(copy_game.legal_moves()), sorted(unpack_game(pack_game(copy_game)).legal_moves()))
+
+    def testNoStartBoard(self):
+        janggiBoard = unpack(pack(JanggiGame()._get_janggiBoard(), 'red'))[0]
+        with mock.patch.object(JanggiBoard, '__init__', side_effect=AssertionError('built a start board')):
+            game = JanggiGame.from_position(janggiBoard, 'red')
+        self.assertIs(game._get_janggiBoard(), janggiBoard)
+        self.assertEqual(game.get_current_color(), 'red')
+
+    def testInvalid(self):
+        data = pack(JanggiBoard())
+        self.assertEqual(unpack_codes(data), (bytearray(90), 'blue', 'UNFINISHED'))
+        self.assertRaises(ValueError, unpack, data[:-1])
+        self.assertRaises(ValueError, unpack, data[:-1] + bytes([6]))
+        self.assertRaises(ValueError, unpack, bytes([0x80]) + data[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from JanggiGame import JanggiGame, JanggiBoard, Chariot, General
+from JanggiPerft import POSITIONS, game_from_moves
+from JanggiParallel import ParallelSearcher, encode_position, decode_position, search_root_move, POSITION_BYTES
+from JanggiSearch import Searcher, MATE_SCORE
+
+
+class TestSerialization(unittest.TestCase):
+    """
+    Test cases for the compact position serialization sent to worker processes
+    """
+    def testRoundTrip(self):
+        game = game_from_moves(POSITIONS['middlegame'][0])
+        janggiBoard = game._get_janggiBoard()
+        data = encode_position(janggiBoard, 'blue')
+        self.assertEqual(len(data), POSITION_BYTES)
+        copy_board, color = decode_position(data)
+        self.assertEqual(color, 'blue')
+        self.assertEqual(copy_board.get_codes(), janggiBoard.get_codes())
+        self.assertEqual(copy_board.get_zobrist_key('blue'), janggiBoard.get_zobrist_key('blue'))
+        self.assertEqual(copy_board.get_piece_indices('red'), janggiBoard.get_piece_indices('red'))
+        self.assertEqual(copy_board.get_general_square('blue'), janggiBoard.get_general_square('blue'))
+        self.assertEqual(decode_position(encode_position(janggiBoard, 'red'))[1], 'red')
+        self.assertRaises(ValueError, decode_position, data[:-1])
+
+    def testFromCodes(self):
+        janggiBoard = JanggiBoard.from_codes(JanggiGame()._get_janggiBoard().get_codes())
+        self.assertEqual(repr(janggiBoard.get_board()['c10']), repr(JanggiGame()._get_janggiBoard().get_board()['c10']))
+        self.assertEqual(janggiBoard.get_history(), [])
+        self.assertEqual(len(list(janggiBoard.generate_legal_moves('blue'))), 32)
+
+
+class TestParallelSearch(unittest.TestCase):
+    """
+    Test cases for the root splitting parallel search
+    """
+    def testMatchesSearcher(self):
+        for name in ('start', 'middlegame', 'open', 'check'):  # captures are available in all but 'start'
+            game = game_from_moves(POSITIONS[name][0])
+            for depth in (1, 2, 3):
+                expected = Searcher(table_mb=1).search(game, depth=depth)
+                result = ParallelSearcher(processes=1, table_mb=1).search(game, depth=depth)
+                self.assertEqual(result.score, expected.score, (name, depth))
+                self.assertEqual(len(result.pv), depth)
+
+    def testProcessCountDoesNotChangeResult(self):
+        game = game_from_moves(POSITIONS['middlegame'][0])
+        serial = ParallelSearcher(processes=1, table_mb=1).search(game, depth=2)
+        with ParallelSearcher(processes=2, table_mb=1) as searcher:
+            parallel = searcher.search(game, depth=2)
+            again = searcher.search(game, depth=2)
+        for result in (parallel, again):
+            self.assertEqual((result.best_move, result.score, result.pv, result.nodes),
+                             (serial.best_move, serial.score, serial.pv, serial.nodes))
+
+    def testMate(self):
+        game = JanggiGame()
+        board = game._get_janggiBoard().get_board()
+        board.update(JanggiBoard.empty())
+        board['e10'], board['e1'] = General('blue'), General('red')
+        board['a9'], board['b1'] = Chariot('red'), Chariot('red')
+        game._current_color = 'red'
+        result = ParallelSearcher(processes=1, table_mb=1).search(game, depth=3)
+        self.assertEqual(result.best_move, ('b1', 'b10'))
+        self.assertEqual(result.score, MATE_SCORE - 1)
+        game._current_color = 'blue'
+        board['b10'], board['b1'] = board['b1'], None
+        result = ParallelSearcher(processes=1, table_mb=1).search(game, depth=3)
+        self.assertIsNone(result.best_move)
+        self.assertEqual(result.score, -MATE_SCORE)
+
+    def testSearchRootMove(self):
+        game = JanggiGame()
+        move, score, pv, nodes = search_root_move(encode_position(game._get_janggiBoard(), 'blue'), (58, 49), 2)
+        self.assertEqual(move, (58, 49))
+        self.assertEqual(len(pv), 1)
+        self.assertGreater(nodes, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
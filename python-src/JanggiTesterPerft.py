@@ -0,0 +1,62 @@
+import unittest
+import JanggiPerft
+from JanggiGame import JanggiGame
+from JanggiTransposition import TranspositionTable, BOUND_EXACT, MAX_SCORE
+from JanggiPerft import POSITIONS, perft, divide, perft_breakdown, check_corpus, game_from_moves, parse_move
+
+
+class TestPerft(unittest.TestCase):
+    """
+    Test cases for the perft node counts
+    """
+    def testStartPosition(self):
+        game = JanggiGame()
+        self.assertEqual([perft(game._get_janggiBoard(), 'blue', depth) for depth in range(4)], [1, 32, 1024, 33506])
+
+    def testCorpus(self):
+        self.assertEqual(check_corpus(depth=2), [])
+        self.assertEqual(check_corpus(depth=3, names=['check']), [])
+
+    def testDivide(self):
+        game = game_from_moves(POSITIONS['check'][0])
+        counts = divide(game._get_janggiBoard(), game.get_current_color(), 2)
+        self.assertEqual(sorted(counts), [('f3', 'e3'), ('f3', 'f2'), ('h3', 'e3')])
+        self.assertEqual(sum(counts.values()), POSITIONS['check'][1][1])
+
+    def testBreakdown(self):
+        game = game_from_moves(POSITIONS['start'][0])
+        counts = perft_breakdown(game._get_janggiBoard(), 'blue', 3)
+        self.assertEqual([level.nodes for level in counts], [32, 1024, 33506])
+        self.assertEqual([level.passes for level in counts], [1, 32, 1024])
+        self.assertEqual([level.captures for level in counts], [0, 0, 81])
+        self.assertEqual([level.checks for level in counts], [0, 0, 16])
+
+    def testLargeCountsNotCached(self):
+        game = JanggiGame()
+        table = TranspositionTable(1)
+        table.store(1, 0, MAX_SCORE, BOUND_EXACT)
+        self.assertEqual(table.probe(1)[1], MAX_SCORE)
+        limit = JanggiPerft.MAX_SCORE
+        JanggiPerft.MAX_SCORE = 40  # as if no count of depth 2 or more (each about 1000 or more) fit
+        try:
+            table = TranspositionTable(1)
+            self.assertEqual(perft(game._get_janggiBoard(), 'blue', 3, table), 33506)
+            self.assertEqual(table.get_stats()['stores'], 0)
+        finally:
+            JanggiPerft.MAX_SCORE = limit
+
+    def testBoardUnchanged(self):
+        game = game_from_moves(POSITIONS['middlegame'][0])
+        codes = game._get_janggiBoard().get_codes()[:]
+        perft(game._get_janggiBoard(), game.get_current_color(), 2)
+        self.assertEqual(game._get_janggiBoard().get_codes(), codes)
+
+    def testParseMove(self):
+        self.assertEqual(parse_move('e7e6'), ('e7', 'e6'))
+        self.assertEqual(parse_move('e10e9'), ('e10', 'e9'))
+        self.assertEqual(parse_move('a9a10'), ('a9', 'a10'))
+        self.assertRaises(ValueError, parse_move, 'j1j2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from JanggiArchive import ArchiveWriter
+from JanggiPerft import POSITIONS
+from JanggiReplay import replay, replay_stream, read_logs, read_archive
+from JanggiSelfPlay import play_game
+
+
+class TestReplay(unittest.TestCase):
+    """
+    Test cases for the move log replay pipeline
+    """
+    def testValidLog(self):
+        moves = [start + end for start, end in POSITIONS['check'][0]]
+        result = replay('check', moves)
+        self.assertTrue(result.is_valid())
+        self.assertEqual(result.plies, len(moves))
+        self.assertEqual(result.state, 'UNFINISHED')
+        self.assertEqual(result.checks, [len(moves) - 1])  # the last move puts red in check
+        self.assertIsNone(result.mate)
+
+    def testIllegalMoves(self):
+        self.assertEqual(replay(1, ['e7e6', 'e4e5', 'e6e7']).illegal, (2, 'e6e7'))
+        self.assertEqual(replay(2, ['e4e5']).illegal, (0, 'e4e5'))  # blue moves first
+        self.assertEqual(replay(3, ['e7e6', 'x1y2', 'e4e5']).illegal, (1, 'x1y2'))
+        result = replay(4, [('e7', 'e6'), ('e4', 'e5')])
+        self.assertTrue(result.is_valid())
+        self.assertEqual(result.plies, 2)
+
+    def testMatchesSelfPlay(self):
+        for seed in range(12):
+            record = play_game(seed, seed, 'random', 'random', max_plies=150)
+            result = replay(record['id'], record['moves'])
+            self.assertTrue(result.is_valid())
+            self.assertEqual(result.state, record['result'])
+            self.assertEqual(result.mate is not None, record['result'] != 'UNFINISHED')
+            if result.mate is not None:
+                self.assertEqual(result.mate, record['plies'] - 1)
+                self.assertEqual(result.checks[-1], result.mate)
+                self.assertEqual(replay(0, record['moves'] + ['e7e6']).illegal, (record['plies'], 'e7e6'))
+
+    def testReadLogs(self):
+        lines = io.StringIO('# comment\n\ne7e6 e4e5\n{"id": 9, "moves": ["e7e6"]}\n{"moves": []}\n')
+        self.assertEqual(list(read_logs(lines, 'logs.txt')),
+                         [('logs.txt:3', ['e7e6', 'e4e5']), (9, ['e7e6']), ('logs.txt:5', [])])
+
+    def testMalformedLogs(self):
+        lines = io.StringIO('{"id": 1, "moves": ["e7e6"]}\n{"id": 2, "moves": [\n{"id": 3}\n{"moves": 5}\n'
+                            '{"moves": [7]}\n{"id": 6, "moves": ["e7e6", "e4e5"]}\n')
+        logs = list(read_logs(lines, 'logs.txt'))
+        self.assertEqual([game_id for game_id, moves in logs], [1, 'logs.txt:2', 'logs.txt:3', 'logs.txt:4',
+                                                                'logs.txt:5', 6])
+        results = list(replay_stream(iter(logs)))
+        self.assertEqual([result.is_valid() for result in results], [True, False, False, False, False, True])
+        self.assertEqual(results[1].illegal, (0, '{"id": 2, "moves": ['))
+        self.assertEqual(results[5].plies, 2)
+
+    def testStreamOrder(self):
+        logs = [(game_id, play_game(game_id, game_id, 'random', 'random', max_plies=40)['moves'])
+                for game_id in range(9)]
+        logs[4] = (4, logs[4][1][:3] + ['i10i1'])
+        serial = [result.as_dict() for result in replay_stream(iter(logs))]
+        parallel = [result.as_dict() for result in replay_stream(iter(logs), processes=2, batch_size=2)]
+        self.assertEqual(serial, parallel)
+        self.assertEqual([result['id'] for result in serial], list(range(9)))
+        self.assertEqual(serial[4]['illegal'], [3, 'i10i1'])
+        json.dumps(serial)  # results can be written as JSON
+
+    def testReadArchive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games')
+            with ArchiveWriter(path) as writer:
+                writer.append(POSITIONS['middlegame'][0])
+            results = list(replay_stream(read_archive(path)))
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].is_valid())
+        self.assertEqual(results[0].plies, len(POSITIONS['middlegame'][0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+from JanggiGame import JanggiGame, JanggiBoard, Chariot, General, Horse, Soldier, SQUARES, SQUARE_INDEX
+from JanggiPerft import POSITIONS, game_from_moves
+from JanggiNotation import game_from_fen
+from JanggiSearch import Searcher, evaluate, opposing, MATE_SCORE, MATE_BOUND
+
+
+def minimax(janggiBoard, color, depth):
+    """Plain negamax without pruning or the transposition table; the reference the search must agree with"""
+    if depth == 0:
+        return evaluate(janggiBoard, color)
+    moves = list(janggiBoard.generate_legal_moves(color))
+    if not moves:
+        return -MATE_SCORE
+    best = -MATE_SCORE - 1
+    for start, end in moves:
+        janggiBoard.push(start, end)
+        best = max(best, -minimax(janggiBoard, opposing(color), depth - 1))
+        janggiBoard.pop()
+    return best
+
+
+class TestSearch(unittest.TestCase):
+    """
+    Test cases for the alpha-beta search
+    """
+    def setUp(self):
+        self.game = JanggiGame()
+        self.board = self.game._get_janggiBoard().get_board()
+        self.board.update(JanggiBoard.empty())
+        self.board['e10'] = General('blue')
+        self.board['e1'] = General('red')  # generals facing each other is allowed
+        self.game._current_color = 'red'
+
+    def testEvaluateStartPosition(self):
+        game = JanggiGame()
+        self.assertEqual(evaluate(game._get_janggiBoard(), 'blue'), 0)
+        self.assertEqual(evaluate(game._get_janggiBoard(), 'red'), 0)
+
+    def testMateInOne(self):
+        self.board['a9'] = Chariot('red')
+        self.board['b1'] = Chariot('red')
+        result = Searcher(table_mb=1).search(self.game, depth=3)
+        self.assertEqual(result.best_move, ('b1', 'b10'))
+        self.assertEqual(result.score, MATE_SCORE - 1)
+        self.assertEqual(result.pv, [('b1', 'b10')])
+        self.assertTrue(self.game.make_move(*result.best_move))
+        self.assertEqual(self.game.get_game_state(), 'RED_WON')
+
+    def testMatedSide(self):
+        self.board['a9'] = Chariot('red')
+        self.board['b10'] = Chariot('red')
+        self.game._current_color = 'blue'
+        result = Searcher(table_mb=1).search(self.game, depth=2)
+        self.assertIsNone(result.best_move)
+        self.assertEqual(result.score, -MATE_SCORE)
+
+    def testWinsHangingPiece(self):
+        self.board['a1'] = Chariot('red')
+        self.board['a5'] = Chariot('blue')
+        result = Searcher(table_mb=1).search(self.game, depth=2)
+        self.assertEqual(result.best_move, ('a1', 'a5'))
+        self.assertGreater(result.score, 0)
+        self.assertLess(result.score, MATE_BOUND)
+
+    def testMatchesMinimax(self):
+        for name in ('start', 'middlegame', 'check'):
+            game = game_from_moves(POSITIONS[name][0])
+            janggiBoard, color = game._get_janggiBoard(), game.get_current_color()
+            for depth in (1, 2):
+                result = Searcher(table_mb=1, quiescence=False).search(game, depth=depth)
+                self.assertEqual(result.score, minimax(janggiBoard, color, depth), (name, depth))
+                self.assertEqual(result.depth, depth)
+
+    def testResult(self):
+        game = game_from_moves(POSITIONS['middlegame'][0])
+        codes, history = game._get_janggiBoard().get_codes()[:], game._get_janggiBoard().get_history()[:]
+        result = Searcher(table_mb=1).search(game, depth=3)
+        self.assertEqual(game._get_janggiBoard().get_codes(), codes)
+        self.assertEqual(game._get_janggiBoard().get_history(), history)
+        self.assertEqual(result.best_move, result.pv[0])
+        self.assertEqual(len(result.pv), 3)
+        self.assertGreater(result.nodes, 0)
+        for start, end in result.pv:  # the principal variation is a line of legal moves
+            self.assertTrue(game.make_move(start, end))
+
+    def testTimeLimit(self):
+        game = JanggiGame()
+        result = Searcher(table_mb=1).search(game, depth=20, time_limit=0.2)
+        self.assertGreaterEqual(result.depth, 1)
+        self.assertLess(result.depth, 20)
+        self.assertEqual(game._get_janggiBoard().get_history(), [])
+        self.assertIn(result.best_move, game.legal_moves())
+
+    def testMoveOrdering(self):
+        for name in ('start', 'middlegame'):
+            game = game_from_moves(POSITIONS[name][0])
+            ordered = Searcher(table_mb=1, quiescence=False).search(game, depth=3)
+            unordered = Searcher(table_mb=1, move_ordering=False, quiescence=False).search(game, depth=3)
+            self.assertEqual(ordered.score, unordered.score)
+            self.assertLess(ordered.nodes, unordered.nodes // 2, name)
+
+    def testOrderedMoves(self):
+        self.board['a1'] = Chariot('red')
+        self.board['a5'] = Horse('blue')
+        self.board['c6'] = Soldier('red')
+        self.board['c7'] = Chariot('blue')
+        searcher = Searcher(table_mb=1)
+        searcher._janggiBoard = self.game._get_janggiBoard()
+        searcher._killers = [[(SQUARE_INDEX['e1'], SQUARE_INDEX['e2'])]]
+        moves = list(searcher._ordered_moves('red', 0, (SQUARE_INDEX['a1'], SQUARE_INDEX['a2'])))
+        self.assertEqual(sorted(moves), sorted(self.game._get_janggiBoard().generate_legal_moves('red')))
+        squares = [(SQUARES[start], SQUARES[end]) for start, end in moves[:4]]
+        # the table move, the chariot taken by the soldier, the horse taken by the chariot, then the killer
+        self.assertEqual(squares, [('a1', 'a2'), ('c6', 'c7'), ('a1', 'a5'), ('e1', 'e2')])
+        self.assertEqual(list(searcher._ordered_moves('red', 0, (SQUARE_INDEX['a2'], SQUARE_INDEX['a3'])))[0],
+                         (SQUARE_INDEX['c6'], SQUARE_INDEX['c7']))  # an illegal table move is skipped
+
+    def testQuiescence(self):
+        self.board['a1'] = Chariot('red')
+        self.board['a5'] = Horse('blue')
+        self.board['a10'] = Chariot('blue')  # defends the horse
+        result = Searcher(table_mb=1, quiescence=False).search(self.game, depth=1)
+        self.assertEqual(result.best_move, ('a1', 'a5'))  # the recapture is beyond the horizon
+        result = Searcher(table_mb=1).search(self.game, depth=1)
+        self.assertNotEqual(result.best_move, ('a1', 'a5'))
+        self.assertEqual(self.game._get_janggiBoard().get_history(), [])
+        self.assertEqual(Searcher(table_mb=1).search(self.game, depth=3).score,
+                         Searcher(table_mb=1, move_ordering=False).search(self.game, depth=3).score)
+
+    def testQuiescenceChecks(self):
+        # every evasion is answered by another check; evasions are only searched at the first quiescence ply
+        game = game_from_fen('1R2cC3/4a4/4k1r1R/1n7/9/9/9/9/2r1K3N/3A5 r -')
+        for depth in (1, 2):
+            result = Searcher(table_mb=1).search(game, depth=depth)
+            self.assertIn(result.best_move, game.legal_moves())
+            self.assertEqual(game._get_janggiBoard().get_history(), [])
+
+    def testErrorRestoresBoard(self):
+        class FailingSearcher(Searcher):
+            def _quiesce(self, ply, quiescence_ply, alpha, beta, color):
+                raise RuntimeError('failed at ply {}'.format(ply))
+        game = game_from_moves(POSITIONS['middlegame'][0])
+        history, codes = game._get_janggiBoard().get_history()[:], game._get_janggiBoard().get_codes()[:]
+        with self.assertRaises(RuntimeError):
+            FailingSearcher(table_mb=1).search(game, depth=3)
+        self.assertEqual(game._get_janggiBoard().get_history(), history)
+        self.assertEqual(game._get_janggiBoard().get_codes(), codes)
+
+    def testGameOver(self):
+        self.game._game_state = 'BLUE_WON'
+        result = Searcher(table_mb=1).search(self.game)
+        self.assertIsNone(result.best_move)
+        self.assertEqual(result.nodes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import json
+import unittest
+from JanggiGame import JanggiGame
+from JanggiPerft import parse_move
+from JanggiSelfPlay import play_game, run_self_play, make_policy, RandomPolicy, SearchPolicy
+
+
+class TestSelfPlay(unittest.TestCase):
+    """
+    Test cases for the batch self-play runner
+    """
+    def testMakePolicy(self):
+        self.assertIsInstance(make_policy('random'), RandomPolicy)
+        self.assertIsInstance(make_policy('search:2'), SearchPolicy)
+        self.assertRaises(ValueError, make_policy, 'perfect')
+
+    def testGameIsReplayable(self):
+        record = play_game(7, 7, 'random', 'search:1', max_plies=60)
+        self.assertEqual(record, play_game(7, 7, 'random', 'search:1', max_plies=60))
+        self.assertLessEqual(record['plies'], 60)
+        self.assertEqual(len(record['moves']), record['plies'])
+        game = JanggiGame()
+        for move in record['moves']:
+            self.assertTrue(game.make_move(*parse_move(move)))
+        self.assertEqual(game.get_game_state(), record['result'])
+
+    def testRunWritesRecords(self):
+        output = io.StringIO()
+        summary = run_self_play(6, output, max_plies=40, seed=3, processes=1)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(record['id'] for record in records), list(range(6)))
+        self.assertEqual(summary['games'], 6)
+        self.assertEqual(summary['blue_won'] + summary['red_won'] + summary['unfinished'], 6)
+        self.assertEqual(summary['plies'], sum(record['plies'] for record in records))
+
+    def testProcessPool(self):
+        serial, parallel = io.StringIO(), io.StringIO()
+        run_self_play(5, serial, max_plies=30, seed=11, processes=1)
+        summary = run_self_play(5, parallel, max_plies=30, seed=11, processes=2)
+        self.assertEqual(summary['games'], 5)
+        by_id = [sorted(output.getvalue().splitlines(), key=lambda line: json.loads(line)['id'])
+                 for output in (serial, parallel)]
+        self.assertEqual(by_id[0], by_id[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import unittest
+from JanggiServer import JanggiServer, apply_move, list_legal_moves
+from JanggiNotation import pack_game, START_FEN
+from JanggiGame import JanggiGame
+
+
+class TestWorkerFunctions(unittest.TestCase):
+    """
+    Test cases for the functions run in the worker processes
+    """
+    def testApplyMove(self):
+        position = pack_game(JanggiGame())
+        accepted, after, fen, check = apply_move(position, 'e7', 'e6')
+        self.assertTrue(accepted)
+        self.assertEqual(fen.split()[1], 'r')
+        self.assertFalse(check)
+        accepted, unchanged, fen, check = apply_move(position, 'e4', 'e5')  # red can not move first
+        self.assertFalse(accepted)
+        self.assertEqual(unchanged, position)
+
+    def testLegalMoves(self):
+        position = pack_game(JanggiGame())
+        self.assertEqual(len(list_legal_moves(position)), 32)
+        self.assertEqual(list_legal_moves(position, 'c10'), ['c10c10', 'c10d8'])
+
+
+class TestServer(unittest.TestCase):
+    """
+    Test cases for the request handling and the JSON lines protocol
+    """
+    def request(self, server, **request):
+        return asyncio.run(server.handle_request(request))
+
+    def testGame(self):
+        server = JanggiServer(processes=0)
+        reply = self.request(server, op='new', id=7)
+        self.assertEqual((reply['ok'], reply['id'], reply['fen'], reply['turn']), (True, 7, START_FEN, 'blue'))
+        game = reply['game']
+        reply = self.request(server, op='move', game=game, start='e7', end='e6')
+        self.assertTrue(reply['ok'])
+        self.assertEqual((reply['turn'], reply['plies'], reply['state']), ('red', 1, 'UNFINISHED'))
+        reply = self.request(server, op='move', game=game, start='e6', end='e5')
+        self.assertEqual(reply, {'ok': False, 'error': 'invalid move: e6 e5'})
+        reply = self.request(server, op='state', game=game)
+        self.assertEqual(reply['moves'], ['e7e6'])
+        self.assertIn('e4e5', self.request(server, op='legal', game=game)['moves'])
+        self.assertEqual(self.request(server, op='close', game=game), {'ok': True})
+        self.assertEqual(server.get_session_count(), 0)
+
+    def testInvalidRequests(self):
+        server = JanggiServer(processes=0)
+        self.assertEqual(self.request(server, op='fly')['error'], 'unknown op: fly')
+        self.assertEqual(self.request(server, op='state', game='99')['error'], 'unknown game: 99')
+        game = self.request(server, op='new')['game']
+        self.assertEqual(self.request(server, op='move', game=game, start='e7')['error'], 'missing field: end')
+        self.assertFalse(self.request(server, op='move', game=game, start=1, end=2)['ok'])
+
+    def testCheck(self):
+        server = JanggiServer(processes=0)
+        game = self.request(server, op='new')['game']
+        # the last move puts red's general in check from blue's soldier
+        moves = [('e7', 'e6'), ('e4', 'e5'), ('e6', 'e5'), ('g1', 'e4'), ('e5', 'e4'), ('e2', 'f3'), ('e4', 'e3')]
+        for start, end in moves:
+            reply = self.request(server, op='move', game=game, start=start, end=end)
+            self.assertTrue(reply['ok'])
+        self.assertTrue(reply['check'])
+        self.assertEqual(reply['state'], 'UNFINISHED')
+
+    def testConnection(self):
+        async def session():
+            server = JanggiServer(processes=1)
+            listener = await server.start('127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                replies = []
+                for line in (b'{"op": "new"}\n', b'not json\n', b'{"op": "move", "game": "1", "start": "c7", '
+                             b'"end": "c6"}\n', b'{"op": "state", "game": "1"}\n'):
+                    writer.write(line)
+                    await writer.drain()
+                    replies.append(json.loads(await reader.readline()))
+                writer.write_eof()
+                self.assertEqual(await reader.read(), b'')  # the server closes its end once the client is done
+                writer.close()
+                await writer.wait_closed()
+                return replies
+            finally:
+                listener.close()
+                await listener.wait_closed()
+                server.close()
+        replies = asyncio.run(session())
+        self.assertEqual([reply['ok'] for reply in replies], [True, False, True, True])
+        self.assertEqual(replies[3]['moves'], ['c7c6'])
+
+    def testConcurrentGames(self):
+        async def play(server):
+            games = [(await server.handle_request({'op': 'new'}))['game'] for _ in range(20)]
+            replies = await asyncio.gather(*[server.handle_request({'op': 'move', 'game': game, 'start': 'a7',
+                                                                    'end': 'a6'}) for game in games])
+            # a second request for the same move on a game must see the first one's result
+            again = await asyncio.gather(*[server.handle_request({'op': 'move', 'game': games[0], 'start': 'a4',
+                                                                  'end': 'a5'}) for _ in range(2)])
+            return replies, again
+        server = JanggiServer(processes=2)
+        try:
+            replies, again = asyncio.run(play(server))
+        finally:
+            server.close()
+        self.assertTrue(all(reply['ok'] and reply['turn'] == 'red' for reply in replies))
+        self.assertEqual(sorted(reply['ok'] for reply in again), [False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
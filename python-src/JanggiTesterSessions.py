@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+from JanggiGame import JanggiGame
+from JanggiBitboard import BitboardBoard
+from JanggiNotation import game_to_fen, game_from_fen, PACKED_BYTES
+from JanggiPerft import POSITIONS, game_from_moves
+from JanggiSessions import SessionStore, snapshot, restore, estimate_size, SNAPSHOT_SUFFIX
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Test cases for the compact game snapshots
+    """
+    def assertSameGame(self, game, restored):
+        self.assertEqual(game_to_fen(restored), game_to_fen(game))
+        self.assertEqual(restored.get_zobrist_key(), game.get_zobrist_key())
+        for color in ('red', 'blue'):
+            self.assertEqual([piece.get_code() for piece in restored.get_lost_pieces(color)],
+                             [piece.get_code() for piece in game.get_lost_pieces(color)])
+            self.assertTrue(all(piece.get_is_captured() for piece in restored.get_lost_pieces(color)))
+
+    def testRoundTrip(self):
+        for name, (moves, counts) in POSITIONS.items():
+            game = game_from_moves(moves)
+            data = snapshot(game)
+            self.assertEqual(len(data), PACKED_BYTES + 2 * len(moves))
+            self.assertSameGame(game, restore(data))
+
+    def testRestoredGameIsPlayable(self):
+        game = game_from_moves(POSITIONS['middlegame'][0])
+        restored = restore(snapshot(game), BitboardBoard)
+        self.assertIsInstance(restored._get_janggiBoard(), BitboardBoard)
+        self.assertEqual(sorted(restored.legal_moves()), sorted(game.legal_moves()))
+        restored._get_janggiBoard().pop()  # the undo stack came back with the game
+        game._get_janggiBoard().pop()
+        self.assertEqual(restored._get_janggiBoard().get_codes(), game._get_janggiBoard().get_codes())
+
+    def testGameFromPosition(self):
+        game = game_from_fen('4k4/9/9/9/9/9/9/9/4R4/4K4 r -')
+        self.assertTrue(game.make_move('e2', 'e9'))
+        self.assertSameGame(game, restore(snapshot(game)))
+
+    def testInvalidSnapshot(self):
+        data = snapshot(JanggiGame())
+        with self.assertRaises(ValueError):
+            restore(data[:-1])
+        with self.assertRaises(ValueError):
+            restore(data + b'\x00')
+        with self.assertRaises(ValueError):
+            restore(data + (300 * 90 + 1).to_bytes(2, 'little'))  # start square 300 is off the board
+
+
+class TestSessionStore(unittest.TestCase):
+    """
+    Test cases for the store evicting idle games to disk and restoring them
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testCapacity(self):
+        store = SessionStore(self.directory.name, capacity=2)
+        first, second, third = store.add(), store.add(), store.add()
+        self.assertEqual((first, second, third), ('1', '2', '3'))
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.get_resident_count(), 2)
+        self.assertEqual(os.listdir(self.directory.name), [first + SNAPSHOT_SUFFIX])
+        # using the evicted game restores it and evicts the least recently used one instead
+        self.assertTrue(store.make_move(first, 'e7', 'e6'))
+        self.assertEqual(os.listdir(self.directory.name), [second + SNAPSHOT_SUFFIX])
+        self.assertEqual(store.get_stats(), {'games': 3, 'resident': 2, 'evictions': 2, 'restores': 1})
+
+    def testTransparentRestore(self):
+        moves = POSITIONS['middlegame'][0]
+        store = SessionStore(self.directory.name, capacity=1)
+        games = [store.add() for _ in range(3)]
+        for start, end in moves:
+            for game_id in games:
+                self.assertTrue(store.make_move(game_id, start, end))
+        self.assertFalse(store.make_move(games[0], 'e7', 'e6'))
+        expected = game_to_fen(game_from_moves(moves))
+        for game_id in games:
+            self.assertEqual(game_to_fen(store.get_game(game_id)), expected)
+        self.assertEqual(store.get_resident_count(), 1)
+
+    def testMemoryBudget(self):
+        size = estimate_size(JanggiGame())
+        store = SessionStore(self.directory.name, max_bytes=size * 3)
+        for _ in range(10):
+            store.add()
+        self.assertEqual(store.get_resident_count(), 3)
+        self.assertLessEqual(store.get_resident_bytes(), size * 3)
+        store.evict_all()
+        self.assertEqual((store.get_resident_count(), store.get_resident_bytes(), len(store)), (0, 0, 10))
+
+    def testRunningSize(self):
+        for shared_pieces in (False, True):
+            store = SessionStore(self.directory.name, shared_pieces=shared_pieces)
+            game_id = store.add()
+            for start, end in POSITIONS['middlegame'][0]:
+                self.assertTrue(store.make_move(game_id, start, end))
+                # the running total kept per move matches walking the whole game
+                self.assertEqual(store.get_resident_bytes(), estimate_size(store.get_game(game_id)))
+            store.remove(game_id)
+            self.assertEqual(store.get_resident_bytes(), 0)
+
+    def testReopen(self):
+        store = SessionStore(self.directory.name)
+        game_id = store.add(game_id='correspondence-1')
+        store.make_move(game_id, 'c7', 'c6')
+        store.add()
+        store.evict_all()
+        reopened = SessionStore(self.directory.name)
+        self.assertEqual(len(reopened), 2)
+        self.assertEqual(reopened.get_game(game_id).get_current_color(), 'red')
+        self.assertEqual(reopened.add(), '2')
+
+    def testSharedPieces(self):
+        store = SessionStore(self.directory.name, capacity=1, shared_pieces=True)
+        game_id, other = store.add(), store.add()
+        for start, end in POSITIONS['check'][0]:
+            self.assertTrue(store.make_move(game_id, start, end))
+        game = store.get_game(game_id)
+        self.assertTrue(all(piece is None or piece.is_shared() for piece in game._get_janggiBoard().get_pieces()))
+        self.assertEqual(len(game.get_lost_pieces('red')), 2)
+        self.assertLess(estimate_size(game), estimate_size(game_from_moves(POSITIONS['check'][0])))
+
+    def testAddAndRemove(self):
+        store = SessionStore(self.directory.name, capacity=1)
+        game_id = store.add(game_from_moves(POSITIONS['check'][0]))
+        self.assertTrue(store.get_game(game_id).is_in_check('red'))
+        with self.assertRaises(ValueError):
+            store.add(game_id=game_id)
+        with self.assertRaises(ValueError):
+            store.add(game_id='../escape')
+        other = store.add()
+        store.remove(game_id)
+        store.remove(other)
+        self.assertEqual((len(store), os.listdir(self.directory.name)), (0, []))
+        with self.assertRaises(KeyError):
+            store.make_move(game_id, 'e7', 'e6')
+
+
+if __name__ == '__main__':
+    unittest.main()
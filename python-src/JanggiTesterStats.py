@@ -0,0 +1,94 @@
+import unittest
+from JanggiGame import JanggiGame, JanggiBoard
+from JanggiBitboard import BitboardBoard
+from JanggiPerft import POSITIONS
+from JanggiStats import MoveStats, instrument, uninstrument, get_stats, profile_moves, PHASES
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Test cases for the opt-in counters and timers
+    """
+    def testCounts(self):
+        moves = POSITIONS['check'][0]
+        stats = profile_moves(moves + (('f3', 'f3'),))  # red is in check, so the pass is not accepted
+        self.assertEqual((stats.make_moves, stats.moves_made), (len(moves) + 1, len(moves)))
+        self.assertEqual(stats.valid_squares['Soldier'], 5)
+        self.assertEqual(stats.valid_squares['General'], 2)
+        self.assertEqual(sum(stats.valid_squares.values()), len(moves) + 1)
+        # one for the mover and one for the opponent per move made, and one for the pass taken back
+        self.assertEqual(stats.in_check, 2 * len(moves) + 1)
+        self.assertEqual(stats.in_checkmate, 1)
+        self.assertTrue(all(stats.times[phase] > 0 for phase in PHASES))
+        self.assertGreaterEqual(stats.times['make_move'], stats.times['movement'] + stats.times['check'])
+        self.assertIn(stats.slowest[1:], moves + (('f3', 'f3'),))
+
+    def testSameGameAsUninstrumented(self):
+        for board_class in (JanggiBoard, BitboardBoard):
+            game, instrumented = JanggiGame(board_class), JanggiGame(board_class)
+            stats = instrument(instrumented)
+            self.assertIsInstance(instrumented, JanggiGame)
+            self.assertIsInstance(instrumented._get_janggiBoard(), board_class)
+            for start, end in POSITIONS['middlegame'][0]:
+                self.assertEqual(instrumented.make_move(start, end), game.make_move(start, end))
+            self.assertEqual(instrumented.get_zobrist_key(), game.get_zobrist_key())
+            self.assertEqual(sorted(instrumented.legal_moves()), sorted(game.legal_moves()))
+            self.assertEqual(stats.moves_made, len(POSITIONS['middlegame'][0]))
+
+    def testCopiesShareStats(self):
+        game = JanggiGame()
+        stats = instrument(game)
+        copy_board = game._get_janggiBoard().copy()
+        copy_board.is_in_check('red')
+        self.assertEqual((stats.copies, stats.in_check), (1, 1))
+
+    def testResetAndUninstrument(self):
+        game = JanggiGame()
+        self.assertIsNone(get_stats(game))
+        stats = instrument(game, MoveStats())
+        self.assertIs(get_stats(game), stats)
+        self.assertTrue(game.make_move('e7', 'e6'))
+        stats.reset()
+        self.assertEqual(stats.as_dict()['make_moves'], 0)
+        self.assertIsNone(stats.slowest)
+        uninstrument(game)
+        self.assertIs(type(game), JanggiGame)
+        self.assertIs(type(game._get_janggiBoard()), JanggiBoard)
+        self.assertTrue(game.make_move('e4', 'e5'))
+        self.assertEqual(stats.make_moves, 0)
+        self.assertIsNone(get_stats(game))
+
+    def testNewInstances(self):
+        game = JanggiGame()
+        stats = instrument(game)
+        janggiBoard = game._get_janggiBoard()
+        new_board = type(janggiBoard).from_codes(janggiBoard.get_codes())
+        self.assertFalse(new_board.is_in_check('red'))  # a board of an instrumented class has stats of its own
+        self.assertEqual((new_board._stats.in_check, stats.in_check), (1, 0))
+        new_game = type(game).from_position(new_board, 'blue')
+        self.assertTrue(new_game.make_move('e7', 'e6'))
+        self.assertEqual(new_game._stats.moves_made, 1)
+
+    def testMoveGeneration(self):
+        game = JanggiGame()
+        stats = instrument(game)
+        janggiBoard = game._get_janggiBoard()
+        self.assertFalse(janggiBoard.is_in_checkmate('blue'))  # stops at the general's pass
+        self.assertEqual(stats.valid_indices['General'], 0)
+        self.assertEqual(len(list(janggiBoard.generate_legal_moves('blue'))), 32)
+        self.assertEqual(stats.valid_indices, {'Soldier': 5, 'Cannon': 2, 'Chariot': 2, 'Elephant': 2, 'Horse': 2,
+                                               'Guard': 2, 'General': 1})
+        self.assertIn('valid_indices: Soldier 5', stats.report())
+
+    def testSharedStats(self):
+        stats = MoveStats()
+        games = [JanggiGame() for _ in range(3)]
+        for game in games:
+            instrument(game, stats)
+            game.make_move('a7', 'a6')
+        self.assertEqual(stats.moves_made, 3)
+        self.assertIn('make_move: 3 calls, 3 moves made', stats.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
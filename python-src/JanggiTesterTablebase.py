@@ -0,0 +1,153 @@
+import os
+import random
+import tempfile
+import unittest
+from JanggiGame import JanggiBoard, SQUARES, SQUARE_INDEX, SOLDIER, CHARIOT, GUARD, GENERAL, RED, BLUE
+from JanggiSearch import Searcher, MATE_SCORE
+from JanggiTablebase import Material, Tablebase, TablebaseSet, build_tablebases, required_materials, \
+    generate_chunk, solve, material_of, decode_value, HEADER
+
+
+def board_with(pieces):
+    """Returns a JanggiBoard object holding only the given pieces; pieces is a dict of square: piece code"""
+    codes = bytearray(90)
+    for square, code in pieces.items():
+        codes[SQUARE_INDEX[square]] = code
+    return JanggiBoard.from_codes(codes)
+
+
+class TestMaterial(unittest.TestCase):
+    """
+    Test cases for material sets and position indices
+    """
+    def testNames(self):
+        self.assertEqual(Material('kaRK').name(), 'KRka')
+        self.assertEqual(len(Material('Kk')), 2 * 9 * 9)
+        self.assertEqual(len(Material('KRka')), 2 * 9 * 90 * 9 * 9)
+        for name in ('KRx', 'KR', 'KKk', 'K' + 'R' * 15 + 'k'):
+            with self.assertRaises(ValueError):
+                Material(name)
+        self.assertEqual(required_materials('KRka'), ['Kk', 'KRk', 'Kka', 'KRka'])
+        board = board_with({'e2': GENERAL | RED, 'a1': CHARIOT | RED, 'e9': GENERAL | BLUE, 'd10': GUARD | BLUE})
+        self.assertEqual(material_of(board), 'KRka')
+
+    def testEncodeDecode(self):
+        material = Material('KRka')
+        for index in random.Random(3).sample(range(len(material)), 500):
+            squares, red_to_move = material.decode(index)
+            self.assertEqual(material.encode(squares, red_to_move), index)
+        board = board_with({'e2': GENERAL | RED, 'a1': CHARIOT | RED, 'e9': GENERAL | BLUE, 'd10': GUARD | BLUE})
+        index = material.index_of(board.get_codes(), False)
+        self.assertEqual(material.decode(index), ([SQUARE_INDEX[square] for square in ('e2', 'a1', 'e9', 'd10')],
+                                                  False))
+
+    def testOutsideDomain(self):
+        material = Material('KPk')
+        board = board_with({'e2': GENERAL | RED, 'a2': SOLDIER | RED, 'e9': GENERAL | BLUE})  # behind its start row
+        self.assertIsNone(material.index_of(board.get_codes(), True))
+        tables = build_tablebases('KPk')
+        self.assertIsNone(tables['KPk'].probe(board, 'red'))
+        self.assertIsNone(TablebaseSet(tables).probe(board, 'red'))
+        result = Searcher(table_mb=1, tablebases=TablebaseSet(tables)).search_board(board, 'red', depth=2)
+        self.assertIsNotNone(result.best_move)  # the search does not fail on such positions, it searches them
+
+    def testDecodeValue(self):
+        self.assertEqual(decode_value(0), ('DRAW', None))
+        self.assertEqual(decode_value(1), ('LOSS', 0))
+        self.assertEqual(decode_value(2), ('WIN', 1))
+        self.assertEqual(decode_value(5), ('LOSS', 4))
+
+
+class TestSmallTablebases(unittest.TestCase):
+    """
+    Test cases for solving material sets without any mate
+    """
+    def testDraws(self):
+        tables = build_tablebases('KRk')
+        self.assertEqual(sorted(tables), ['KRk', 'Kk'])
+        self.assertFalse(any(tables['KRk'].get_values()))  # a lone general can always pass or step out of check
+
+    def testProcessesAgree(self):
+        tables = build_tablebases('Kk')
+        serial = solve('Kka', tables)
+        parallel = solve('Kka', tables, processes=2, chunk_size=200)
+        self.assertEqual(serial.get_values(), parallel.get_values())
+
+    def testChunks(self):
+        tables = build_tablebases('Kk')
+        whole = generate_chunk('Kka', 0, len(Material('Kka')), tables)
+        parts = [generate_chunk('Kka', first, min(first + 100, len(Material('Kka'))), tables)
+                 for first in range(0, len(Material('Kka')), 100)]
+        for number, values in enumerate(whole):
+            joined = parts[0][number]
+            for part in parts[1:]:
+                joined += part[number]
+            self.assertEqual(values, joined)
+
+
+class TestTablebase(unittest.TestCase):
+    """
+    Test cases for the chariot and general against guard and general tablebase
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.tables = build_tablebases('KRka')
+        cls.table = cls.tables['KRka']
+        cls.material = cls.table.get_material()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testMate(self):
+        # the guard blocks e8 and the chariot covers d9 and (along the palace diagonal) e9
+        board = board_with({'d1': GENERAL | RED, 'd10': CHARIOT | RED, 'd8': GENERAL | BLUE, 'e8': GUARD | BLUE})
+        self.assertTrue(board.is_in_checkmate('blue'))
+        self.assertEqual(self.table.probe(board, 'blue'), ('LOSS', 0))
+        board = board_with({'d1': GENERAL | RED, 'a10': CHARIOT | RED, 'd8': GENERAL | BLUE, 'e8': GUARD | BLUE})
+        self.assertEqual(self.table.probe(board, 'red'), ('WIN', 1))
+        self.assertEqual(TablebaseSet(self.tables).probe(board, 'red'), ('WIN', 1))
+
+    def testConsistency(self):
+        # searching one ply with every position below the root probed gives exactly the root's stored value
+        tablebases = TablebaseSet(self.tables)
+        values = self.table.get_values()
+        decided = [index for index, value in enumerate(values) if value]
+        sample = decided + random.Random(5).sample(range(len(values)), 300)
+        searcher = Searcher(table_mb=1, tablebases=tablebases)
+        for index in sample:
+            squares, red_to_move = self.material.decode(index)
+            if len(set(squares)) != len(squares):
+                continue
+            board = board_with({SQUARES[square]: code
+                                for square, code in zip(squares, self.material.get_codes())})
+            color = 'red' if red_to_move else 'blue'
+            if board.is_in_check('blue' if red_to_move else 'red'):
+                continue
+            result, plies = decode_value(values[index])
+            expected = {'WIN': MATE_SCORE - (plies or 0), 'LOSS': -MATE_SCORE + (plies or 0), 'DRAW': 0}[result]
+            self.assertEqual(searcher.search_board(board, color, depth=1).score, expected)
+
+    def testSaveLoad(self):
+        path = os.path.join(self.directory.name, 'KRka.jtb')
+        self.table.save(path)
+        self.assertEqual(os.path.getsize(path), HEADER.size + len(self.table))  # one byte per position
+        loaded = Tablebase.load(path)
+        self.assertEqual(loaded.get_values(), self.table.get_values())
+        board = board_with({'d1': GENERAL | RED, 'd10': CHARIOT | RED, 'd8': GENERAL | BLUE, 'e8': GUARD | BLUE})
+        self.assertEqual(TablebaseSet(directory=self.directory.name).probe(board, 'blue'), ('LOSS', 0))
+        self.assertIsNone(TablebaseSet(directory=self.directory.name).probe(JanggiBoard(), 'red'))
+        with open(path, 'r+b') as file:
+            file.truncate(HEADER.size + 10)
+        with self.assertRaises(ValueError):
+            Tablebase.load(path)
+        with open(path, 'wb') as file:
+            file.write(b'not a tablebase')
+        with self.assertRaises(ValueError):
+            Tablebase.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
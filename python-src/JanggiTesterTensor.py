@@ -0,0 +1,78 @@
+import random
+import unittest
+from JanggiGame import JanggiGame, JanggiBoard, Chariot, SQUARE_INDEX
+from JanggiSearch import evaluate
+from JanggiSelfPlay import play_game
+from JanggiPerft import game_from_moves, parse_move
+try:
+    import numpy
+    import JanggiTensor
+except ImportError:
+    numpy = None
+
+
+def sample_boards(count):
+    """Returns (boards, colors to move) for the positions along a few random self-play games"""
+    boards, colors = [], []
+    for seed in range(count):
+        record = play_game(seed, seed, 'random', 'random', max_plies=random.Random(seed).randrange(10, 120))
+        game = game_from_moves(parse_move(move) for move in record['moves'])
+        boards.append(game._get_janggiBoard())
+        colors.append(game.get_current_color())
+    return boards, colors
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class TestTensor(unittest.TestCase):
+    """
+    Test cases for the NumPy piece planes and batch evaluation
+    """
+    def testPlanes(self):
+        janggiBoard = JanggiGame()._get_janggiBoard()
+        planes = JanggiTensor.board_to_planes(janggiBoard)
+        self.assertEqual(planes.shape, (14, 10, 9))
+        self.assertEqual(planes.dtype, numpy.int8)
+        self.assertEqual(int(planes.sum()), 32)
+        self.assertEqual(int(planes[:7].sum()), 16)
+        general = int(numpy.flatnonzero(JanggiTensor.PLANE_CODES == janggiBoard.get_codes()[SQUARE_INDEX['e9']])[0])
+        self.assertEqual(planes[general, 8, 4], 1)  # e9 is row 9, file e
+        codes = JanggiTensor.codes_batch([janggiBoard])
+        self.assertEqual(JanggiTensor.planes_to_codes(planes[None]).tolist(), codes.tolist())
+
+    def testMatchesEvaluate(self):
+        boards, colors = sample_boards(12)
+        codes = JanggiTensor.codes_batch(boards)
+        self.assertEqual(codes.shape, (12, 90))
+        red_scores = JanggiTensor.evaluate_batch(codes, mobility_weight=0)
+        self.assertEqual(red_scores.tolist(), [evaluate(board, 'red') for board in boards])
+        mover_scores = JanggiTensor.evaluate_batch(codes, [color == 'red' for color in colors], mobility_weight=0)
+        self.assertEqual(mover_scores.tolist(), [evaluate(board, color) for board, color in zip(boards, colors)])
+
+    def testMaterialAndMobility(self):
+        codes = JanggiTensor.codes_batch([JanggiGame()._get_janggiBoard()])
+        self.assertEqual(JanggiTensor.material_batch(codes).tolist(), [0])
+        self.assertEqual(JanggiTensor.mobility_batch(codes).tolist(), [0])  # the start position is symmetric
+        janggiBoard = JanggiBoard(JanggiBoard.empty())
+        janggiBoard.get_board()['a1'] = Chariot('red')  # 2 empty neighbors in the corner
+        janggiBoard.get_board()['e5'] = Chariot('blue')  # 4 in the middle
+        codes = JanggiTensor.codes_batch([janggiBoard])
+        self.assertEqual(JanggiTensor.mobility_batch(codes).tolist(), [-2])
+        self.assertEqual(JanggiTensor.material_batch(codes).tolist(), [0])
+        janggiBoard.get_board()['e5'] = None
+        codes = JanggiTensor.codes_batch([janggiBoard])
+        self.assertEqual(JanggiTensor.material_batch(codes).tolist(), [1300])
+
+    def testChunks(self):
+        boards, colors = sample_boards(5)
+        codes = numpy.repeat(JanggiTensor.codes_batch(boards), 3, axis=0)
+        expected = JanggiTensor.evaluate_batch(codes)
+        original = JanggiTensor.CHUNK_SIZE
+        JanggiTensor.CHUNK_SIZE = 4
+        try:
+            self.assertEqual(JanggiTensor.evaluate_batch(codes).tolist(), expected.tolist())
+        finally:
+            JanggiTensor.CHUNK_SIZE = original
+
+
+if __name__ == '__main__':
+    unittest.main()
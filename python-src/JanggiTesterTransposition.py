@@ -0,0 +1,66 @@
+import unittest
+from JanggiGame import JanggiGame
+from JanggiPerft import perft
+from JanggiTransposition import TranspositionTable, BOUND_EXACT, BOUND_LOWER, BOUND_UPPER
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """
+    Test cases for storing, probing and replacing transposition table entries
+    """
+    def setUp(self):
+        self.table = TranspositionTable(1)
+        self.buckets = self.table.get_size() // 2
+
+    def testSize(self):
+        self.assertEqual(self.table.get_size(), 65536)  # 1 MB of 16-byte entries
+        self.assertEqual(TranspositionTable(3).get_size(), 131072)  # rounded down to a power of two
+
+    def testStoreProbe(self):
+        self.assertIsNone(self.table.probe(12345))
+        self.table.store(12345, 4, -250, BOUND_UPPER, (13, 22))
+        self.assertEqual(self.table.probe(12345), (4, -250, BOUND_UPPER, (13, 22)))
+        self.table.store(2 ** 64 - 1, 0, 99999, BOUND_EXACT)
+        self.assertEqual(self.table.probe(2 ** 64 - 1), (0, 99999, BOUND_EXACT, None))
+        self.assertIsNone(self.table.probe(12345 + self.buckets))  # same bucket, different position
+
+    def testKeepsMoveWhenStoringWithout(self):
+        self.table.store(7, 2, 10, BOUND_EXACT, (1, 2))
+        self.table.store(7, 3, 20, BOUND_LOWER)
+        self.assertEqual(self.table.probe(7), (3, 20, BOUND_LOWER, (1, 2)))
+
+    def testReplacement(self):
+        deep, shallow, newer = 5, 5 + self.buckets, 5 + 2 * self.buckets
+        self.table.store(deep, 8, 1, BOUND_EXACT)
+        self.table.store(shallow, 2, 2, BOUND_EXACT)  # can not replace the deeper entry; goes to the second slot
+        self.assertEqual(self.table.probe(deep)[1], 1)
+        self.assertEqual(self.table.probe(shallow)[1], 2)
+        self.table.store(newer, 1, 3, BOUND_EXACT)    # always-replace slot is overwritten
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertEqual(self.table.probe(deep)[1], 1)
+        self.table.new_search()
+        self.table.store(shallow, 1, 4, BOUND_EXACT)  # the deep entry is from an older search now
+        self.assertIsNone(self.table.probe(deep))
+        self.assertEqual(self.table.probe(shallow)[1], 4)
+
+    def testStats(self):
+        self.table.store(1, 1, 0, BOUND_EXACT)
+        self.table.store(1, 2, 0, BOUND_EXACT)
+        self.table.probe(1)
+        self.table.probe(2)
+        stats = self.table.get_stats()
+        self.assertEqual((stats['probes'], stats['hits'], stats['stores'], stats['used']), (2, 1, 2, 1))
+        self.assertEqual(stats['hit_rate'], 0.5)
+        self.table.clear()
+        self.assertEqual(self.table.get_stats()['used'], 0)
+        self.assertIsNone(self.table.probe(1))
+
+    def testPerftWithTable(self):
+        game = JanggiGame()
+        self.assertEqual(perft(game._get_janggiBoard(), 'blue', 3, self.table), 33506)
+        self.assertEqual(perft(game._get_janggiBoard(), 'blue', 3, self.table), 33506)
+        self.assertGreater(self.table.get_stats()['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
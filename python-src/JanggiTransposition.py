@@ -0,0 +1,123 @@
+# Author: Jon Baird
+# Date: 10/18/2026
+# Description: A fixed-size transposition table for searching Janggi positions, keyed by JanggiBoard Zobrist keys
+
+from array import array
+
+# bound types stored with each score
+BOUND_NONE = 0
+BOUND_EXACT = 1
+BOUND_LOWER = 2  # the score is a lower bound (the search failed high)
+BOUND_UPPER = 3  # the score is an upper bound (the search failed low)
+
+ENTRY_BYTES = 16  # one 64-bit key and one 64-bit packed data word per entry
+_NO_SQUARE = 127
+_SCORE_OFFSET = 1 << 31
+MAX_SCORE = (1 << 31) - 1  # the range of scores an entry can hold (a signed 32-bit field)
+MIN_SCORE = -(1 << 31)
+
+
+class TranspositionTable:
+    """
+    Represents a transposition table: a fixed-size cache of search results keyed by position (Zobrist key)
+    The table is held in two flat arrays of 64-bit integers rather than a dictionary of objects, so its memory use is
+      fixed when it is created. Each entry is a key plus one packed data word:
+        bits 0-6 move start square index, bits 7-13 move end square index (127 if no move),
+        bits 14-15 bound type, bits 16-23 depth, bits 24-31 search generation, bits 32-63 score (offset)
+    Entries are grouped in buckets of two slots: the first slot is depth-preferred (only replaced by a search of at
+      least the same depth, or by any entry once the stored one is from an older search), the second slot is
+      always replaced
+    """
+
+    def __init__(self, size_mb=16):
+        """
+        Initializes an empty transposition table
+        :param size_mb: the memory to use, in megabytes; rounded down to a power-of-two number of buckets
+        """
+        buckets = 1
+        while buckets * 2 * 2 * ENTRY_BYTES <= size_mb * (1 << 20):
+            buckets *= 2
+        self._mask = buckets - 1
+        self._keys = array('Q', bytes(8 * 2 * buckets))
+        self._data = array('Q', bytes(8 * 2 * buckets))
+        self._generation = 0
+        self._used = 0
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0
+
+    def get_size(self):
+        """Returns the number of entries (slots) the table can hold"""
+        return len(self._keys)
+
+    def clear(self):
+        """Empties the table and resets the statistics"""
+        self._keys = array('Q', bytes(8 * len(self._keys)))
+        self._data = array('Q', bytes(8 * len(self._data)))
+        self._generation = 0
+        self._used = 0
+        self.reset_stats()
+
+    def new_search(self):
+        """Starts a new search generation; entries from older searches become replaceable regardless of depth"""
+        self._generation = (self._generation + 1) & 0xff
+
+    def probe(self, key):
+        """
+        Given a 64-bit Zobrist key, returns (depth, score, bound, move) for the stored entry of that position, where
+          move is a (start, end) square index pair or None; returns None if the position is not stored
+        """
+        self._probes += 1
+        slot = (key & self._mask) << 1
+        keys = self._keys
+        if keys[slot] != key or self._data[slot] == 0:
+            slot += 1
+            if keys[slot] != key or self._data[slot] == 0:
+                return None
+        self._hits += 1
+        data = self._data[slot]
+        start, end = data & 0x7f, (data >> 7) & 0x7f
+        move = None if start == _NO_SQUARE else (start, end)
+        return (data >> 16) & 0xff, (data >> 32) - _SCORE_OFFSET, (data >> 14) & 3, move
+
+    def store(self, key, depth, score, bound, move=None):
+        """
+        Stores a search result for the position with the given 64-bit Zobrist key
+        :param depth: the remaining depth the score was searched to (0-255)
+        :param score: the score, as a signed integer that fits in 32 bits (MIN_SCORE to MAX_SCORE)
+        :param bound: BOUND_EXACT, BOUND_LOWER or BOUND_UPPER
+        :param move: the best move found, as a (start, end) square index pair, or None
+        """
+        self._stores += 1
+        start, end = move if move is not None else (_NO_SQUARE, _NO_SQUARE)
+        data = (start | end << 7 | bound << 14 | depth << 16 | self._generation << 24 |
+                (score + _SCORE_OFFSET) << 32)
+        slot = (key & self._mask) << 1
+        keys, stored = self._keys, self._data
+        if keys[slot + 1] == key and stored[slot + 1] != 0:
+            slot += 1  # the position is already in the always-replace slot; update it there
+        elif not (keys[slot] == key or stored[slot] == 0 or depth >= (stored[slot] >> 16) & 0xff
+                  or (stored[slot] >> 24) & 0xff != self._generation):
+            slot += 1  # the depth-preferred slot holds a deeper result from this search; use the always-replace slot
+        if move is None and keys[slot] == key and stored[slot] != 0:
+            data = data & ~0x3fff | stored[slot] & 0x3fff  # keep the previously stored best move
+        if stored[slot] == 0:
+            self._used += 1
+        keys[slot] = key
+        stored[slot] = data
+
+    def get_stats(self):
+        """
+        Returns a dictionary of statistics: probes, hits, hit_rate (hits / probes), stores, used (number of filled
+          slots), size (number of slots) and occupancy (used / size)
+        """
+        size = len(self._keys)
+        return {'probes': self._probes, 'hits': self._hits,
+                'hit_rate': self._hits / self._probes if self._probes else 0.0,
+                'stores': self._stores, 'used': self._used, 'size': size, 'occupancy': self._used / size}
+
+    def reset_stats(self):
+        """Resets the probe, hit and store counters (the stored entries are kept)"""
+        self._probes = 0
+        self._hits = 0
+        self._stores = 0